@@ -0,0 +1,127 @@
+"""Corpora shared by the benchmark tools: repository sources, test snippets and generated modules."""
+
+from __future__ import annotations
+import ast
+import pathlib
+import random
+import typing
+
+
+REPOSITORY_ROOT: typing.Final = pathlib.Path(__file__).parent.parent
+SHORT_IDENTIFIERS: typing.Final = ("item", "data", "res", "obj", "idx", "tmp")
+LONG_IDENTIFIERS: typing.Final = ("customer_record", "invoice_total", "shipping_address", "payment_status")
+FUNCTION_PREFIXES: typing.Final = ("get", "build", "process", "customer", "total", "handle")
+SCALAR_TYPES: typing.Final = ("int", "str", "float", "bool")
+
+
+def collect_repository_sources(repository_root: pathlib.Path = REPOSITORY_ROOT) -> dict[str, str]:
+    return {
+        str(one_path.relative_to(repository_root)): one_path.read_text(encoding="utf-8")
+        for one_path in sorted(repository_root.glob("*/**/*.py"))
+        if not one_path.relative_to(repository_root).parts[0].startswith(".")
+    }
+
+
+def collect_test_snippets(test_path: pathlib.Path = REPOSITORY_ROOT / "tests" / "test_plugin.py") -> dict[str, str]:
+    """Extract every source snippet used in ``pytest.mark.parametrize`` tables."""
+    test_snippets: typing.Final = {}
+    for one_node in ast.walk(ast.parse(test_path.read_text(encoding="utf-8"))):
+        if not (
+            isinstance(one_node, ast.Call)
+            and isinstance(one_node.func, ast.Attribute)
+            and one_node.func.attr == "parametrize"
+            and len(one_node.args) > 1
+            and isinstance(one_node.args[1], ast.List)
+        ):
+            continue
+        for one_case in one_node.args[1].elts:
+            if isinstance(one_case, ast.Tuple) and one_case.elts:
+                snippet_source = ast.literal_eval(one_case.elts[0])
+                if isinstance(snippet_source, str):
+                    test_snippets[f"{test_path.name}:{one_case.lineno}"] = snippet_source
+    return test_snippets
+
+
+def choose_identifier(random_generator: random.Random, name_prefix: str = "") -> str:
+    return f"{name_prefix}{random_generator.choice(SHORT_IDENTIFIERS + LONG_IDENTIFIERS)}"
+
+
+def render_function(random_generator: random.Random, statement_index: int, indentation: str = "") -> str:
+    function_keyword: typing.Final = random_generator.choice(("def", "async def"))
+    function_name: typing.Final = f"{random_generator.choice(FUNCTION_PREFIXES)}_{statement_index}"
+    argument_name: typing.Final = choose_identifier(random_generator)
+    loop_target: typing.Final = choose_identifier(random_generator, random_generator.choice(("", "one_")))
+    temporary_name: typing.Final = f"{choose_identifier(random_generator)}_count"
+    self_argument: typing.Final = "self, " if indentation else ""
+    return "\n".join(
+        (
+            f"{indentation}{function_keyword} {function_name}({self_argument}{argument_name}: list[int]) -> int:",
+            f"{indentation}    {temporary_name} = len({argument_name})",
+            f"{indentation}    result_total: int = 0",
+            f"{indentation}    for {loop_target} in {argument_name}:",
+            f"{indentation}        result_total += {loop_target} * {temporary_name}",
+            f"{indentation}    squares_list = [one_value * one_value for one_value in {argument_name}]",
+            f"{indentation}    return result_total + len(squares_list)",
+        )
+    )
+
+
+def render_class(random_generator: random.Random, statement_index: int) -> str:
+    class_name: typing.Final = f"{random_generator.choice(('Model', 'CustomerAccount', 'Repo'))}{statement_index}"
+    decorator_line: typing.Final = random_generator.choice(
+        (
+            "",
+            "@typing.final\n",
+            "@dataclasses.dataclass\n",
+            "@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)\n",
+        )
+    )
+    scalar_type: typing.Final = random_generator.choice(SCALAR_TYPES)
+    return "\n".join(
+        (
+            f"{decorator_line}class {class_name}:",
+            f"    {choose_identifier(random_generator)}: {scalar_type} = 1",
+            render_function(random_generator, statement_index, indentation="    "),
+        )
+    )
+
+
+def render_mapping(random_generator: random.Random, statement_index: int) -> str:
+    mapping_name: typing.Final = f"{choose_identifier(random_generator).upper()}_{statement_index}"
+    mapping_items: typing.Final = ", ".join(
+        f"'{choose_identifier(random_generator)}': {one_value}" for one_value in range(random_generator.randint(1, 8))
+    )
+    if random_generator.random() < 0.5:  # noqa: PLR2004
+        return f"{mapping_name} = {{{mapping_items}}}"
+    return f"{mapping_name} = types.MappingProxyType({{{mapping_items}}})"
+
+
+def render_import(random_generator: random.Random, statement_index: int) -> str:  # noqa: ARG001
+    return random_generator.choice(
+        (
+            "from os import path",
+            "from collections.abc import Iterable",
+            "from third_party import widget",
+            "import typing",
+            "from json import dumps, loads",
+        )
+    )
+
+
+STATEMENT_RENDERERS: typing.Final = (render_function, render_class, render_mapping, render_import)
+
+
+def generate_module(random_generator: random.Random, statements_count: int) -> str:
+    """Generate a syntactically valid module that triggers a mix of COP violations."""
+    return "\n\n\n".join(
+        random_generator.choice(STATEMENT_RENDERERS)(random_generator, one_index)
+        for one_index in range(statements_count)
+    )
+
+
+def generate_modules(modules_count: int, statements_count: int, random_seed: int = 0) -> dict[str, str]:
+    random_generator: typing.Final = random.Random(random_seed)
+    return {
+        f"generated_{one_index}.py": generate_module(random_generator, statements_count)
+        for one_index in range(modules_count)
+    }
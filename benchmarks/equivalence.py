@@ -0,0 +1,249 @@
+"""Compare COP results and timings of a reference revision against the working tree.
+
+Usage::
+
+    python -m benchmarks.equivalence --reference main
+
+The reference revision is exported with ``git archive`` and each implementation runs in its own
+interpreter, so both can be imported under the same package name.
+"""
+
+from __future__ import annotations
+import argparse
+import ast
+import collections
+import functools
+import importlib
+import json
+import os
+import pathlib
+import pkgutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import typing
+
+from benchmarks import corpus
+
+
+PLUGIN_CHECK_NAME: typing.Final = "<plugin>"
+REPORTED_DIFFERENCES_LIMIT: typing.Final = 5
+
+ViolationKey = tuple[str, int, int, str]
+
+
+@typing.final
+class CheckResult(typing.TypedDict):
+    elapsed_seconds: float
+    violations: list[ViolationKey]
+
+
+def collect_check_classes() -> list[type[typing.Any]]:
+    checks_module: typing.Final = importlib.import_module("community_of_python_flake8_plugin.checks")
+    check_classes: typing.Final = []
+    for _, one_module_name, _ in pkgutil.iter_modules(checks_module.__path__):
+        imported_module = importlib.import_module(f"{checks_module.__name__}.{one_module_name}")
+        for one_attribute_name in dir(imported_module):
+            attribute = getattr(imported_module, one_attribute_name)
+            if (
+                isinstance(attribute, type)
+                and one_attribute_name.endswith("Check")
+                and (hasattr(attribute, "visit") or hasattr(attribute, "handled_node_types"))
+            ):
+                check_classes.append(attribute)
+    return check_classes
+
+
+def run_check_class(check_class: type[typing.Any], syntax_tree: ast.AST) -> list[tuple[int, int, str]]:
+    if hasattr(check_class, "visit"):
+        # Reference revisions from before the shared traversal, where every check was an ast.NodeVisitor
+        # and there was no engine module to import.
+        check_instance: typing.Final = check_class(syntax_tree)
+        check_instance.visit(syntax_tree)
+        found_violations = check_instance.violations
+    else:
+        engine_module: typing.Final = importlib.import_module("community_of_python_flake8_plugin.engine")
+        found_violations = (
+            engine_module.run_checks(syntax_tree, [check_class])
+            if hasattr(engine_module, "CheckContext")
+            # Reference revisions from before shared checks, where run_checks returned one instance per check.
+            else [
+                one_violation
+                for one_check_instance in engine_module.run_checks(syntax_tree, [check_class])
+                for one_violation in one_check_instance.violations
+            ]
+        )
+    return [
+        (one_violation.line_number, one_violation.column_number, one_violation.violation_code.code)
+        for one_violation in found_violations
+    ]
+
+
+def run_plugin(syntax_tree: ast.AST) -> list[tuple[int, int, str]]:
+    plugin_module: typing.Final = importlib.import_module("community_of_python_flake8_plugin.plugin")
+    return [
+        (one_line, one_column, one_message.split(" ", 1)[0])
+        for one_line, one_column, one_message, _ in plugin_module.CommunityOfPythonFlake8Plugin(syntax_tree).run()
+    ]
+
+
+def measure_worker_results(module_sources: dict[str, str], repeat_count: int) -> dict[str, CheckResult]:
+    """Run every check class and the whole plugin over the sources, keeping the fastest timing."""
+    syntax_trees: typing.Final = {one_name: ast.parse(one_source) for one_name, one_source in module_sources.items()}
+    check_runners: typing.Final[dict[str, typing.Callable[[ast.AST], list[tuple[int, int, str]]]]] = {
+        one_class.__name__: functools.partial(run_check_class, one_class) for one_class in collect_check_classes()
+    }
+    check_runners[PLUGIN_CHECK_NAME] = run_plugin
+
+    worker_results: typing.Final[dict[str, CheckResult]] = {}
+    for one_check_name, one_runner in check_runners.items():
+        best_seconds = float("inf")
+        check_violations: list[ViolationKey] = []
+        for _ in range(repeat_count):
+            started_at = time.perf_counter()
+            check_violations = [
+                (one_name, *one_violation)
+                for one_name, one_tree in syntax_trees.items()
+                for one_violation in one_runner(one_tree)
+            ]
+            best_seconds = min(best_seconds, time.perf_counter() - started_at)
+        worker_results[one_check_name] = {"elapsed_seconds": best_seconds, "violations": check_violations}
+    return worker_results
+
+
+def extract_reference_sources(reference_revision: str, target_directory: pathlib.Path) -> pathlib.Path:
+    archive_path: typing.Final = target_directory / "reference.tar"
+    subprocess.run(
+        ["git", "archive", "--format=tar", f"--output={archive_path}", reference_revision, "src"],
+        cwd=corpus.REPOSITORY_ROOT,
+        check=True,
+    )
+    with tarfile.open(archive_path) as archive_file:
+        archive_file.extractall(target_directory, filter="data")
+    return target_directory / "src"
+
+
+def run_worker(source_directory: pathlib.Path, sources_path: pathlib.Path, repeat_count: int) -> dict[str, CheckResult]:
+    worker_environment: typing.Final = {**os.environ, "PYTHONPATH": str(source_directory)}
+    completed_process: typing.Final = subprocess.run(
+        [sys.executable, "-m", "benchmarks.equivalence", "--worker", str(sources_path), "--repeat", str(repeat_count)],
+        cwd=corpus.REPOSITORY_ROOT,
+        env=worker_environment,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return typing.cast("dict[str, CheckResult]", json.loads(completed_process.stdout))
+
+
+def calculate_violation_differences(
+    reference_violations: typing.Iterable[typing.Sequence[str | int]],
+    optimized_violations: typing.Iterable[typing.Sequence[str | int]],
+) -> tuple[list[ViolationKey], list[ViolationKey]]:
+    """Return violations missing from and extra in the optimized multiset."""
+    # JSON turns the violation tuples into lists, so normalize both sides before counting.
+    reference_counter: typing.Final[collections.Counter[ViolationKey]] = collections.Counter(
+        typing.cast("ViolationKey", tuple(one_violation)) for one_violation in reference_violations
+    )
+    optimized_counter: typing.Final[collections.Counter[ViolationKey]] = collections.Counter(
+        typing.cast("ViolationKey", tuple(one_violation)) for one_violation in optimized_violations
+    )
+    return (
+        sorted((reference_counter - optimized_counter).elements()),
+        sorted((optimized_counter - reference_counter).elements()),
+    )
+
+
+def build_report(
+    reference_results: dict[str, CheckResult], optimized_results: dict[str, CheckResult]
+) -> tuple[list[str], bool]:
+    report_lines: typing.Final = [f"{'check':<32} {'reference':>11} {'optimized':>11} {'speedup':>8}  status"]
+    is_equivalent = True
+    for one_check_name in sorted(reference_results.keys() | optimized_results.keys()):
+        if one_check_name not in reference_results or one_check_name not in optimized_results:
+            report_lines.append(
+                f"{one_check_name:<32} only in {'reference' if one_check_name in reference_results else 'optimized'}"
+            )
+            continue
+        reference_entry = reference_results[one_check_name]
+        optimized_entry = optimized_results[one_check_name]
+        missing_violations, extra_violations = calculate_violation_differences(
+            reference_entry["violations"], optimized_entry["violations"]
+        )
+        speedup_ratio = reference_entry["elapsed_seconds"] / max(optimized_entry["elapsed_seconds"], 1e-9)
+        status_text = "identical" if not missing_violations and not extra_violations else "DIFFERENT"
+        report_lines.append(
+            f"{one_check_name:<32} {reference_entry['elapsed_seconds']:>10.4f}s "
+            f"{optimized_entry['elapsed_seconds']:>10.4f}s {speedup_ratio:>7.2f}x  {status_text}"
+        )
+        for one_label, one_differences in (("missing", missing_violations), ("extra", extra_violations)):
+            for one_difference in one_differences[:REPORTED_DIFFERENCES_LIMIT]:
+                report_lines.append(f"    {one_label}: {one_difference}")
+        is_equivalent = is_equivalent and status_text == "identical"
+    return report_lines, is_equivalent
+
+
+def generate_shaped_sources(profile_path: pathlib.Path, modules_count: int) -> dict[str, str]:
+    # Imported only when asked for: the shape profiler uses the package, while this module must stay importable
+    # by workers running a reference revision that may predate what it imports
+    shapes_module: typing.Final = importlib.import_module("benchmarks.shapes")
+    return typing.cast(
+        "dict[str, str]",
+        shapes_module.generate_shaped_modules(shapes_module.load_shape_profile(profile_path), modules_count),
+    )
+
+
+def parse_arguments(arguments: list[str] | None = None) -> argparse.Namespace:
+    argument_parser: typing.Final = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument("--reference", default="HEAD", help="git revision with the reference implementation")
+    argument_parser.add_argument("--repeat", type=int, default=3, help="timing repetitions, the fastest one is kept")
+    argument_parser.add_argument("--generated-modules", type=int, default=20, help="number of generated modules")
+    argument_parser.add_argument("--generated-statements", type=int, default=40, help="statements per module")
+    argument_parser.add_argument(
+        "--shape-profile",
+        type=pathlib.Path,
+        help="also check modules generated from this profile, written by 'python -m benchmarks.shapes profile'",
+    )
+    argument_parser.add_argument("--worker", type=pathlib.Path, help=argparse.SUPPRESS)
+    return argument_parser.parse_args(arguments)
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parsed_arguments: typing.Final = parse_arguments(arguments)
+    if parsed_arguments.worker is not None:
+        sys.stdout.write(
+            json.dumps(measure_worker_results(json.loads(parsed_arguments.worker.read_text()), parsed_arguments.repeat))
+        )
+        return 0
+
+    corpus_sources: typing.Final = {
+        **corpus.collect_repository_sources(),
+        **corpus.collect_test_snippets(),
+        **corpus.generate_modules(parsed_arguments.generated_modules, parsed_arguments.generated_statements),
+        **(
+            {}
+            if parsed_arguments.shape_profile is None
+            else generate_shaped_sources(parsed_arguments.shape_profile, parsed_arguments.generated_modules)
+        ),
+    }
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        sources_path: typing.Final = pathlib.Path(temporary_directory) / "sources.json"
+        sources_path.write_text(json.dumps(corpus_sources))
+        reference_directory: typing.Final = extract_reference_sources(
+            parsed_arguments.reference, pathlib.Path(temporary_directory)
+        )
+        reference_results: typing.Final = run_worker(reference_directory, sources_path, parsed_arguments.repeat)
+        optimized_results: typing.Final = run_worker(
+            corpus.REPOSITORY_ROOT / "src", sources_path, parsed_arguments.repeat
+        )
+
+    report_lines, is_equivalent = build_report(reference_results, optimized_results)
+    sys.stdout.write(f"corpus: {len(corpus_sources)} modules, reference: {parsed_arguments.reference}\n")
+    sys.stdout.write("\n".join(report_lines) + "\n")
+    return 0 if is_equivalent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,604 @@
+"""Record anonymized AST shapes of a codebase and generate synthetic modules with the same shapes.
+
+Usage::
+
+    python -m benchmarks.shapes profile ~/work/private-repo --output shapes.json
+    python -m benchmarks.shapes generate shapes.json --modules 200 --output-directory /tmp/shaped-corpus
+
+A profile holds histograms and nothing else: node types, node depth and fan-out, statement nesting, the
+statements found in module, class, function and block bodies and how long those bodies are, the kinds of
+values assigned and returned, identifier lengths per kind, class decorators and how often names follow
+the COP conventions. Names, literals, comments and paths are never recorded, so a profile can be shared
+where the source cannot. The generator draws every module from these histograms, so deep nesting, huge
+classes and dense comprehensions show up about as often as in the profiled code.
+"""
+
+from __future__ import annotations
+import argparse
+import ast
+import collections
+import dataclasses
+import json
+import keyword
+import pathlib
+import random
+import sys
+import typing
+
+from community_of_python_flake8_plugin.naming_policy import NameTrait, fetch_naming_matcher
+from community_of_python_flake8_plugin.runner import DEFAULT_EXCLUDE_PATTERNS, collect_python_files
+from community_of_python_flake8_plugin.symbols import IdentifierKind
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+
+SHAPE_PROFILE_VERSION: typing.Final = 1
+BODY_CONTEXTS: typing.Final = ("module", "class", "function", "block")
+IDENTIFIER_KINDS: typing.Final = ("class", "function", "argument", "variable", "attribute", "loop_target")
+COMPOUND_STATEMENT_TYPES: typing.Final = (
+    ast.If,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.With,
+    ast.AsyncWith,
+    ast.Try,
+)
+COMPREHENSION_NODE_TYPES: typing.Final = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+FUNCTION_NODE_TYPES: typing.Final = (ast.FunctionDef, ast.AsyncFunctionDef)
+NESTED_STATEMENT_NAMES: typing.Final = frozenset(
+    one_type.__name__ for one_type in (*COMPOUND_STATEMENT_TYPES, *FUNCTION_NODE_TYPES, ast.ClassDef, ast.Match)
+)
+# Profiles that lack a histogram, such as one taken from a codebase without classes, fall back to these
+DEFAULT_BODY_LENGTH: typing.Final = 3
+DEFAULT_IDENTIFIER_LENGTH: typing.Final = 10
+# Nested expressions deeper than this are rendered as plain names, so that generated lines stay readable
+MAX_EXPRESSION_DEPTH: typing.Final = 2
+# Words that generated identifiers are made of; none of them comes from a profiled codebase
+NEUTRAL_WORDS: typing.Final = (
+    "account",
+    "batch",
+    "entry",
+    "item",
+    "ledger",
+    "order",
+    "payload",
+    "record",
+    "result",
+    "status",
+    "total",
+    "value",
+    "widget",
+)
+NEUTRAL_VERBS: typing.Final = ("build", "check", "collect", "fetch", "parse", "render")
+ANNOTATION_TEXTS: typing.Final = ("int", "str", "list[int]", "dict[str, int]", "typing.Final", "typing.Final[int]")
+IMPORT_LINES: typing.Final = (
+    "import typing",
+    "import dataclasses",
+    "from os import path",
+    "from collections.abc import Iterable",
+    "from json import dumps, loads",
+    "from acme.models import Widget",
+)
+CLASS_DECORATOR_LINES: typing.Final = {
+    "none": (),
+    "final": ("@typing.final",),
+    "dataclass": ("@dataclasses.dataclass",),
+    "configured_dataclass": ("@typing.final", "@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)"),
+    "other": ("@functools.total_ordering",),
+}
+
+
+def choose_from_histogram(
+    random_generator: random.Random,
+    histogram: Mapping[typing.Any, int],
+    default_value: typing.Any,  # noqa: ANN401
+) -> typing.Any:  # noqa: ANN401
+    if not histogram:
+        return default_value
+    return random_generator.choices(list(histogram), weights=list(histogram.values()))[0]
+
+
+def extract_decorator_kind(class_node: ast.ClassDef) -> str:
+    decorator_names: typing.Final = {
+        ast.unparse(one_decorator.func if isinstance(one_decorator, ast.Call) else one_decorator).rpartition(".")[2]
+        for one_decorator in class_node.decorator_list
+    }
+    if "dataclass" in decorator_names:
+        return (
+            "configured_dataclass"
+            if any(isinstance(one_decorator, ast.Call) for one_decorator in class_node.decorator_list)
+            else "dataclass"
+        )
+    if "final" in decorator_names:
+        return "final"
+    return "other" if decorator_names else "none"
+
+
+@typing.final
+class ShapeProfile:
+    """Histograms of the shapes found in a set of modules."""
+
+    def __init__(self) -> None:
+        self.modules_count = 0
+        self.node_types: typing.Final[collections.Counter[str]] = collections.Counter()
+        self.node_depths: typing.Final[collections.Counter[int]] = collections.Counter()
+        self.fan_outs: typing.Final[collections.Counter[int]] = collections.Counter()
+        # Deepest statement nesting of every module, counting function and class bodies
+        self.nesting_depths: typing.Final[collections.Counter[int]] = collections.Counter()
+        self.body_statements: typing.Final[dict[str, collections.Counter[str]]] = {
+            one_context: collections.Counter() for one_context in BODY_CONTEXTS
+        }
+        self.body_lengths: typing.Final[dict[str, collections.Counter[int]]] = {
+            one_context: collections.Counter() for one_context in BODY_CONTEXTS
+        }
+        # Node types of the values assigned, returned and evaluated by statements
+        self.value_types: typing.Final[collections.Counter[str]] = collections.Counter()
+        self.identifier_lengths: typing.Final[dict[str, collections.Counter[int]]] = {
+            one_kind: collections.Counter() for one_kind in IDENTIFIER_KINDS
+        }
+        self.arguments_counts: typing.Final[collections.Counter[int]] = collections.Counter()
+        self.class_decorators: typing.Final[collections.Counter[str]] = collections.Counter()
+        # How many functions and loop targets there are, and how many of them follow the COP conventions
+        self.naming_conventions: typing.Final[collections.Counter[str]] = collections.Counter()
+
+    def record_module(self, syntax_tree: ast.Module) -> None:
+        self.modules_count += 1
+        pending_nodes: typing.Final[list[tuple[ast.AST, int]]] = [(syntax_tree, 0)]
+        while pending_nodes:
+            current_node, node_depth = pending_nodes.pop()
+            self.node_types[type(current_node).__name__] += 1
+            self.node_depths[node_depth] += 1
+            child_nodes = list(ast.iter_child_nodes(current_node))
+            if child_nodes:
+                self.fan_outs[len(child_nodes)] += 1
+            pending_nodes.extend((one_child_node, node_depth + 1) for one_child_node in child_nodes)
+            self.record_identifiers(current_node)
+        self.nesting_depths[self.record_body(syntax_tree.body, "module", 0)] += 1
+
+    def record_body(self, statements: list[ast.stmt], body_context: str, nesting_depth: int) -> int:
+        """Count the statements of one body and of the bodies below it; return the deepest nesting reached."""
+        self.body_lengths[body_context][len(statements)] += 1
+        deepest_nesting = nesting_depth
+        for one_statement in statements:
+            self.body_statements[body_context][type(one_statement).__name__] += 1
+            statement_value = getattr(one_statement, "value", None)
+            if isinstance(statement_value, ast.expr):
+                self.value_types[type(statement_value).__name__] += 1
+            for one_context, one_body in self.iter_nested_bodies(one_statement):
+                deepest_nesting = max(deepest_nesting, self.record_body(one_body, one_context, nesting_depth + 1))
+        return deepest_nesting
+
+    def iter_nested_bodies(self, statement_node: ast.stmt) -> Iterable[tuple[str, list[ast.stmt]]]:
+        if isinstance(statement_node, FUNCTION_NODE_TYPES):
+            self.arguments_counts[len(statement_node.args.args) + len(statement_node.args.kwonlyargs)] += 1
+            yield "function", statement_node.body
+        elif isinstance(statement_node, ast.ClassDef):
+            self.class_decorators[extract_decorator_kind(statement_node)] += 1
+            yield "class", statement_node.body
+        elif isinstance(statement_node, ast.Match):
+            yield from (("block", one_case.body) for one_case in statement_node.cases)
+        elif isinstance(statement_node, COMPOUND_STATEMENT_TYPES):
+            yield "block", statement_node.body
+            for one_field_name in ("orelse", "finalbody"):
+                if getattr(statement_node, one_field_name, None):
+                    yield "block", getattr(statement_node, one_field_name)
+            yield from (("block", one_handler.body) for one_handler in getattr(statement_node, "handlers", ()))
+
+    def record_identifiers(self, ast_node: ast.AST) -> None:
+        if isinstance(ast_node, FUNCTION_NODE_TYPES):
+            self.record_function_name(ast_node.name)
+        elif isinstance(ast_node, ast.ClassDef):
+            self.record_identifier("class", ast_node.name)
+        elif isinstance(ast_node, ast.arg) and ast_node.arg not in {"self", "cls"}:
+            self.record_identifier("argument", ast_node.arg)
+        elif isinstance(ast_node, (ast.For, ast.AsyncFor, ast.comprehension)):
+            self.record_loop_targets(ast_node.target)
+        elif isinstance(ast_node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            for one_target in ast_node.targets if isinstance(ast_node, ast.Assign) else [ast_node.target]:
+                if isinstance(one_target, ast.Name):
+                    self.record_identifier("variable", one_target.id)
+                elif isinstance(one_target, ast.Attribute):
+                    self.record_identifier("attribute", one_target.attr)
+
+    def record_function_name(self, function_name: str) -> None:
+        self.record_identifier("function", function_name)
+        self.naming_conventions["functions"] += 1
+        if NameTrait.VERB_NAME in fetch_naming_matcher().classify_identifier(function_name, IdentifierKind.FUNCTION):
+            self.naming_conventions["verb_functions"] += 1
+
+    def record_loop_targets(self, target_node: ast.expr) -> None:
+        for one_name_node in ast.walk(target_node):
+            if isinstance(one_name_node, ast.Name):
+                self.record_identifier("loop_target", one_name_node.id)
+                self.naming_conventions["loop_targets"] += 1
+                self.naming_conventions["prefixed_loop_targets"] += one_name_node.id.startswith("one_")
+
+    def record_identifier(self, identifier_kind: str, identifier: str) -> None:
+        self.identifier_lengths[identifier_kind][len(identifier)] += 1
+
+    def calculate_convention_rate(self, followed_key: str, total_key: str) -> float:
+        return self.naming_conventions[followed_key] / max(self.naming_conventions[total_key], 1)
+
+    def convert_to_dict(self) -> dict[str, typing.Any]:
+        return {
+            "version": SHAPE_PROFILE_VERSION,
+            "modules_count": self.modules_count,
+            **{
+                one_field_name: dict(getattr(self, one_field_name))
+                for one_field_name in (
+                    "node_types",
+                    "node_depths",
+                    "fan_outs",
+                    "nesting_depths",
+                    "value_types",
+                    "arguments_counts",
+                    "class_decorators",
+                    "naming_conventions",
+                )
+            },
+            **{
+                one_field_name: {
+                    one_histogram_key: dict(one_histogram)
+                    for one_histogram_key, one_histogram in getattr(self, one_field_name).items()
+                }
+                for one_field_name in ("body_statements", "body_lengths", "identifier_lengths")
+            },
+        }
+
+    @classmethod
+    def load_from_dict(cls, profile_data: Mapping[str, typing.Any]) -> ShapeProfile:
+        if profile_data.get("version") != SHAPE_PROFILE_VERSION:
+            raise ValueError(f"unsupported shape profile version {profile_data.get('version')!r}")
+        shape_profile: typing.Final = cls()
+        shape_profile.modules_count = profile_data["modules_count"]
+        for one_field_name in ("node_types", "value_types", "class_decorators", "naming_conventions"):
+            getattr(shape_profile, one_field_name).update(profile_data[one_field_name])
+        for one_field_name in ("node_depths", "fan_outs", "nesting_depths", "arguments_counts"):
+            getattr(shape_profile, one_field_name).update(
+                {int(one_value): one_frequency for one_value, one_frequency in profile_data[one_field_name].items()}
+            )
+        for one_context, one_histogram in profile_data["body_statements"].items():
+            shape_profile.body_statements[one_context].update(one_histogram)
+        for one_field_name in ("body_lengths", "identifier_lengths"):
+            for one_key, one_histogram in profile_data[one_field_name].items():
+                getattr(shape_profile, one_field_name)[one_key].update(
+                    {int(one_length): one_count for one_length, one_count in one_histogram.items()}
+                )
+        return shape_profile
+
+
+def collect_shape_profile(module_sources: Iterable[str]) -> ShapeProfile:
+    """Profile every source that parses; the others are skipped, as they have no tree to measure."""
+    shape_profile: typing.Final = ShapeProfile()
+    for one_source in module_sources:
+        try:
+            syntax_tree = ast.parse(one_source)
+        except (SyntaxError, ValueError):
+            continue
+        shape_profile.record_module(syntax_tree)
+    return shape_profile
+
+
+def read_sources(filenames: Iterable[str]) -> Iterable[str]:
+    for one_filename in filenames:
+        try:
+            yield pathlib.Path(one_filename).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):  # noqa: PERF203
+            continue
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class BodyScope:
+    """Where a generated body sits, which decides the statements it may hold."""
+
+    body_context: str
+    nesting_depth: int
+    is_in_function: bool = False
+    is_in_loop: bool = False
+    is_async: bool = False
+
+
+@typing.final
+class ShapedModuleGenerator:
+    """Generate modules whose statements, bodies, nesting and identifiers are drawn from a shape profile."""
+
+    def __init__(self, shape_profile: ShapeProfile, random_generator: random.Random) -> None:
+        self.shape_profile: typing.Final = shape_profile
+        self.random_generator: typing.Final = random_generator
+        self.verb_rate: typing.Final = shape_profile.calculate_convention_rate("verb_functions", "functions")
+        self.loop_prefix_rate: typing.Final = shape_profile.calculate_convention_rate(
+            "prefixed_loop_targets", "loop_targets"
+        )
+        self.statement_renderers: typing.Final[dict[str, Callable[[BodyScope], list[str]]]] = {
+            "FunctionDef": self.render_function,
+            "AsyncFunctionDef": self.render_function,
+            "ClassDef": self.render_class,
+            "If": self.render_if,
+            "Match": self.render_if,
+            "For": self.render_for,
+            "AsyncFor": self.render_for,
+            "While": self.render_while,
+            "With": self.render_with,
+            "AsyncWith": self.render_with,
+            "Try": self.render_try,
+            "Return": self.render_return,
+            "Expr": self.render_expression_statement,
+            "AnnAssign": self.render_annotated_assignment,
+            "AugAssign": self.render_augmented_assignment,
+            "Raise": self.render_raise,
+            "Assert": self.render_assert,
+            "Import": self.render_import,
+            "ImportFrom": self.render_import,
+            "Pass": self.render_simple_statement,
+            "Break": self.render_simple_statement,
+            "Continue": self.render_simple_statement,
+        }
+        self.expression_renderers: typing.Final[dict[str, Callable[[int], str]]] = {
+            "Call": self.render_call,
+            "Attribute": lambda _: f"{self.choose_name()}.{self.make_identifier('attribute')}",
+            "Constant": lambda _: self.random_generator.choice(("0", "1", "None", "True", "'text'", "2.5")),
+            "BinOp": lambda expression_depth: (
+                f"({self.render_expression(expression_depth + 1)} + {self.render_expression(expression_depth + 1)})"
+            ),
+            "Compare": lambda expression_depth: f"({self.render_expression(expression_depth + 1)} > 0)",
+            "BoolOp": lambda expression_depth: (
+                f"({self.render_expression(expression_depth + 1)} and {self.render_expression(expression_depth + 1)})"
+            ),
+            "UnaryOp": lambda expression_depth: f"(not {self.render_expression(expression_depth + 1)})",
+            "List": lambda expression_depth: f"[{self.render_expression(expression_depth + 1)}, 1]",
+            "Tuple": lambda expression_depth: f"({self.render_expression(expression_depth + 1)}, 1)",
+            "Set": lambda expression_depth: f"{{{self.render_expression(expression_depth + 1)}, 1}}",
+            "Dict": lambda expression_depth: f"{{'key': {self.render_expression(expression_depth + 1)}}}",
+            "Subscript": lambda _: f"{self.choose_name()}[0]",
+            "Lambda": lambda _: "(lambda argument_value: argument_value)",
+            "JoinedStr": lambda _: f"f'{{{self.choose_name()}}}'",
+            "IfExp": lambda expression_depth: f"(1 if {self.render_expression(expression_depth + 1)} else 0)",
+            "ListComp": lambda expression_depth: self.render_comprehension("[{0} for {0} in {1}]", expression_depth),
+            "SetComp": lambda expression_depth: self.render_comprehension("{{{0} for {0} in {1}}}", expression_depth),
+            "DictComp": lambda expression_depth: self.render_comprehension(
+                "{{{0}: 1 for {0} in {1}}}", expression_depth
+            ),
+            "GeneratorExp": lambda expression_depth: self.render_comprehension(
+                "list({0} for {0} in {1})", expression_depth
+            ),
+        }
+        self.assigned_names: list[str] = []
+        self.max_nesting = 0
+
+    def make_identifier(self, identifier_kind: str) -> str:
+        identifier_length: typing.Final = max(
+            1,
+            choose_from_histogram(
+                self.random_generator,
+                self.shape_profile.identifier_lengths[identifier_kind],
+                DEFAULT_IDENTIFIER_LENGTH,
+            ),
+        )
+        name_words: typing.Final = []
+        if identifier_kind == "function" and self.random_generator.random() < self.verb_rate:
+            name_words.append(self.random_generator.choice(NEUTRAL_VERBS))
+        if identifier_kind == "loop_target" and self.random_generator.random() < self.loop_prefix_rate:
+            name_words.append("one")
+        while len("_".join(name_words)) < identifier_length:
+            name_words.append(self.random_generator.choice(NEUTRAL_WORDS))
+        if identifier_kind == "class":
+            return "".join(one_word.capitalize() for one_word in name_words)[:identifier_length]
+        identifier: typing.Final = "_".join(name_words)[:identifier_length].rstrip("_") or "value"
+        return f"{identifier}_" if keyword.iskeyword(identifier) else identifier
+
+    def choose_name(self) -> str:
+        # Reading names assigned just before is what gives the temporary-variable check work to do
+        if self.assigned_names and self.random_generator.random() < 0.5:  # noqa: PLR2004
+            return self.random_generator.choice(self.assigned_names[-3:])
+        return self.make_identifier("variable")
+
+    def render_expression(self, expression_depth: int = 0) -> str:
+        if expression_depth > MAX_EXPRESSION_DEPTH:
+            return self.choose_name()
+        expression_renderer: typing.Final = self.expression_renderers.get(
+            choose_from_histogram(self.random_generator, self.shape_profile.value_types, "Name")
+        )
+        return self.choose_name() if expression_renderer is None else expression_renderer(expression_depth)
+
+    def render_call(self, expression_depth: int) -> str:
+        call_arguments: typing.Final = ", ".join(
+            self.render_expression(expression_depth + 1) for _ in range(self.random_generator.randint(0, 2))
+        )
+        return f"{self.make_identifier('function')}({call_arguments})"
+
+    def render_comprehension(self, comprehension_template: str, expression_depth: int) -> str:
+        return comprehension_template.format(
+            self.make_identifier("loop_target"), self.render_expression(expression_depth + 1)
+        )
+
+    def render_body(self, body_scope: BodyScope) -> list[str]:
+        body_length: typing.Final = max(
+            1,
+            choose_from_histogram(
+                self.random_generator, self.shape_profile.body_lengths[body_scope.body_context], DEFAULT_BODY_LENGTH
+            ),
+        )
+        body_lines: typing.Final = []
+        for _ in range(body_length):
+            statement_type = choose_from_histogram(
+                self.random_generator, self.shape_profile.body_statements[body_scope.body_context], "Assign"
+            )
+            # Bodies stop nesting at the depth drawn for the module, so that generation always ends
+            if body_scope.nesting_depth >= self.max_nesting and statement_type in NESTED_STATEMENT_NAMES:
+                statement_type = "Assign"
+            body_lines.extend(self.statement_renderers.get(statement_type, self.render_assignment)(body_scope))
+        return body_lines
+
+    def render_nested_body(self, header_line: str, body_scope: BodyScope, body_context: str = "block") -> list[str]:
+        return [
+            header_line,
+            *(
+                f"    {one_line}"
+                for one_line in self.render_body(
+                    dataclasses.replace(
+                        body_scope, body_context=body_context, nesting_depth=body_scope.nesting_depth + 1
+                    )
+                )
+            ),
+        ]
+
+    def render_function(self, body_scope: BodyScope) -> list[str]:
+        is_async: typing.Final = self.random_generator.random() < self.shape_profile.node_types[
+            "AsyncFunctionDef"
+        ] / max(self.shape_profile.node_types["FunctionDef"] + self.shape_profile.node_types["AsyncFunctionDef"], 1)
+        arguments_count: typing.Final = choose_from_histogram(
+            self.random_generator, self.shape_profile.arguments_counts, 1
+        )
+        argument_names: typing.Final = [
+            *(["self"] if body_scope.body_context == "class" else []),
+            *(self.make_identifier("argument") for _ in range(arguments_count)),
+        ]
+        previous_names: typing.Final = self.assigned_names
+        self.assigned_names = argument_names[-arguments_count:] if arguments_count else []
+        function_lines: typing.Final = self.render_nested_body(
+            f"{'async def' if is_async else 'def'} {self.make_identifier('function')}"
+            f"({', '.join(dict.fromkeys(argument_names))}):",
+            dataclasses.replace(body_scope, is_in_function=True, is_in_loop=False, is_async=is_async),
+            "function",
+        )
+        self.assigned_names = previous_names
+        return function_lines
+
+    def render_class(self, body_scope: BodyScope) -> list[str]:
+        decorator_kind: typing.Final = choose_from_histogram(
+            self.random_generator, self.shape_profile.class_decorators, "none"
+        )
+        return [
+            *CLASS_DECORATOR_LINES.get(decorator_kind, ()),
+            *self.render_nested_body(
+                f"class {self.make_identifier('class')}:",
+                dataclasses.replace(body_scope, is_in_function=False, is_in_loop=False),
+                "class",
+            ),
+        ]
+
+    def render_if(self, body_scope: BodyScope) -> list[str]:
+        if_lines: typing.Final = self.render_nested_body(f"if {self.render_expression()}:", body_scope)
+        if self.random_generator.random() < 0.3:  # noqa: PLR2004
+            if_lines.extend(self.render_nested_body("else:", body_scope))
+        return if_lines
+
+    def render_for(self, body_scope: BodyScope) -> list[str]:
+        loop_target: typing.Final = self.make_identifier("loop_target")
+        return self.render_nested_body(
+            f"for {loop_target} in {self.choose_name()}:", dataclasses.replace(body_scope, is_in_loop=True)
+        )
+
+    def render_while(self, body_scope: BodyScope) -> list[str]:
+        return self.render_nested_body(
+            f"while {self.render_expression()}:", dataclasses.replace(body_scope, is_in_loop=True)
+        )
+
+    def render_with(self, body_scope: BodyScope) -> list[str]:
+        context_name: typing.Final = self.make_identifier("variable")
+        self.assigned_names.append(context_name)
+        return self.render_nested_body(f"with {self.render_call(0)} as {context_name}:", body_scope)
+
+    def render_try(self, body_scope: BodyScope) -> list[str]:
+        return [
+            *self.render_nested_body("try:", body_scope),
+            *self.render_nested_body("except ValueError:", body_scope),
+        ]
+
+    def render_return(self, body_scope: BodyScope) -> list[str]:
+        if not body_scope.is_in_function:
+            return self.render_expression_statement(body_scope)
+        return [f"return {self.render_expression()}"]
+
+    def render_expression_statement(self, body_scope: BodyScope) -> list[str]:
+        if body_scope.is_async and self.random_generator.random() < 0.3:  # noqa: PLR2004
+            return [f"await {self.render_call(0)}"]
+        return [self.render_call(0)]
+
+    def render_assignment(self, body_scope: BodyScope) -> list[str]:  # noqa: ARG002
+        assigned_value: typing.Final = self.render_expression()
+        variable_name: typing.Final = self.make_identifier("variable")
+        self.assigned_names.append(variable_name)
+        return [f"{variable_name} = {assigned_value}"]
+
+    def render_annotated_assignment(self, body_scope: BodyScope) -> list[str]:  # noqa: ARG002
+        assigned_value: typing.Final = self.render_expression()
+        variable_name: typing.Final = self.make_identifier("variable")
+        self.assigned_names.append(variable_name)
+        return [f"{variable_name}: {self.random_generator.choice(ANNOTATION_TEXTS)} = {assigned_value}"]
+
+    def render_augmented_assignment(self, body_scope: BodyScope) -> list[str]:  # noqa: ARG002
+        return [f"{self.choose_name()} += {self.render_expression()}"]
+
+    def render_raise(self, body_scope: BodyScope) -> list[str]:  # noqa: ARG002
+        return [f"raise ValueError({self.render_expression()})"]
+
+    def render_assert(self, body_scope: BodyScope) -> list[str]:  # noqa: ARG002
+        return [f"assert {self.render_expression()}"]
+
+    def render_import(self, body_scope: BodyScope) -> list[str]:  # noqa: ARG002
+        return [self.random_generator.choice(IMPORT_LINES)]
+
+    def render_simple_statement(self, body_scope: BodyScope) -> list[str]:
+        # Break and continue are only valid in loops; elsewhere they become pass
+        return [self.random_generator.choice(("break", "continue")) if body_scope.is_in_loop else "pass"]
+
+    def generate_module(self) -> str:
+        self.max_nesting = choose_from_histogram(self.random_generator, self.shape_profile.nesting_depths, 2)
+        self.assigned_names = []
+        return "\n".join(self.render_body(BodyScope(body_context="module", nesting_depth=0))) + "\n"
+
+
+def generate_shaped_modules(shape_profile: ShapeProfile, modules_count: int, random_seed: int = 0) -> dict[str, str]:
+    module_generator: typing.Final = ShapedModuleGenerator(shape_profile, random.Random(random_seed))  # noqa: COP011
+    return {f"shaped_{one_index}.py": module_generator.generate_module() for one_index in range(modules_count)}
+
+
+def load_shape_profile(profile_path: pathlib.Path) -> ShapeProfile:
+    return ShapeProfile.load_from_dict(json.loads(profile_path.read_text(encoding="utf-8")))
+
+
+def parse_arguments(arguments: list[str] | None) -> argparse.Namespace:
+    argument_parser: typing.Final = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    command_parsers: typing.Final = argument_parser.add_subparsers(dest="command", required=True)
+    profile_parser: typing.Final = command_parsers.add_parser("profile", help="record the shapes of a codebase")
+    profile_parser.add_argument("paths", nargs="+", help="files and directories to profile")
+    profile_parser.add_argument("--output", type=pathlib.Path, help="profile file to write (default: stdout)")
+    generate_parser: typing.Final = command_parsers.add_parser("generate", help="generate modules from a profile")
+    generate_parser.add_argument("profile", type=pathlib.Path, help="profile written by the profile command")
+    generate_parser.add_argument("--modules", type=int, default=100, help="number of modules to generate")
+    generate_parser.add_argument("--seed", type=int, default=0, help="seed of the generator")
+    generate_parser.add_argument("--output-directory", type=pathlib.Path, required=True)
+    return argument_parser.parse_args(arguments)
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parsed_arguments: typing.Final = parse_arguments(arguments)
+    if parsed_arguments.command == "profile":
+        profile_text: typing.Final = json.dumps(
+            collect_shape_profile(
+                read_sources(collect_python_files(parsed_arguments.paths, DEFAULT_EXCLUDE_PATTERNS))
+            ).convert_to_dict(),
+            indent=2,
+            sort_keys=True,
+        )
+        if parsed_arguments.output is None:
+            sys.stdout.write(f"{profile_text}\n")
+        else:
+            parsed_arguments.output.write_text(f"{profile_text}\n", encoding="utf-8")
+        return 0
+
+    parsed_arguments.output_directory.mkdir(parents=True, exist_ok=True)
+    for one_name, one_source in generate_shaped_modules(
+        load_shape_profile(parsed_arguments.profile), parsed_arguments.modules, parsed_arguments.seed
+    ).items():
+        (parsed_arguments.output_directory / one_name).write_text(one_source, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
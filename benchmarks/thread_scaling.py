@@ -0,0 +1,73 @@
+"""Measure how checking scales with the number of threads.
+
+Usage::
+
+    python -m benchmarks.thread_scaling --generated-modules 64 --workers 1,2,4,8
+
+Threads only check files in parallel on free-threaded builds (``python3.13t`` and later); with the GIL
+the curve stays flat, which makes this a quick way to tell whether a build really runs without it.
+"""
+
+from __future__ import annotations
+import argparse
+import concurrent.futures
+import pathlib
+import sys
+import time
+import typing
+
+from benchmarks import corpus, shapes
+from community_of_python_flake8_plugin.engine import collect_check_classes
+from community_of_python_flake8_plugin.runner import check_source
+
+
+def parse_arguments(arguments: list[str] | None) -> argparse.Namespace:
+    argument_parser: typing.Final = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--generated-modules", type=int, default=64)
+    argument_parser.add_argument("--generated-statements", type=int, default=200)
+    argument_parser.add_argument(
+        "--shape-profile", type=pathlib.Path, help="generate the modules from this shape profile instead"
+    )
+    argument_parser.add_argument("--workers", default="1,2,4,8", help="comma-separated thread counts")
+    argument_parser.add_argument("--repeat", type=int, default=3, help="best of this many runs per thread count")
+    return argument_parser.parse_args(arguments)
+
+
+def measure_threads(corpus_sources: dict[str, str], workers_count: int) -> float:
+    started_at: typing.Final = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers_count) as thread_pool:
+        for _ in thread_pool.map(check_source, corpus_sources.values(), corpus_sources):
+            pass
+    return time.perf_counter() - started_at
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parsed_arguments: typing.Final = parse_arguments(arguments)
+    corpus_sources: typing.Final = (
+        corpus.generate_modules(parsed_arguments.generated_modules, parsed_arguments.generated_statements)
+        if parsed_arguments.shape_profile is None
+        else shapes.generate_shaped_modules(
+            shapes.load_shape_profile(parsed_arguments.shape_profile), parsed_arguments.generated_modules
+        )
+    )
+    collect_check_classes()
+    sys.stdout.write(
+        f"python {sys.version.split()[0]}, "
+        f"GIL {'enabled' if getattr(sys, '_is_gil_enabled', lambda: True)() else 'disabled'}\n"
+    )
+    sys.stdout.write(f"{'threads':>7}  {'seconds':>9}  {'speedup':>7}\n")
+    single_thread_seconds: float | None = None
+    for one_workers_count in (int(one_count) for one_count in parsed_arguments.workers.split(",")):
+        elapsed_seconds = min(
+            measure_threads(corpus_sources, one_workers_count) for _ in range(parsed_arguments.repeat)
+        )
+        if single_thread_seconds is None:
+            single_thread_seconds = elapsed_seconds
+        sys.stdout.write(
+            f"{one_workers_count:>7}  {elapsed_seconds:>8.3f}s  {single_thread_seconds / elapsed_seconds:>6.2f}x\n"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
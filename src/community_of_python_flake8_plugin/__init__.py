@@ -1,4 +1,14 @@
+from community_of_python_flake8_plugin.engine import CheckContext, PerFileCheckProtocol, PluginCheckProtocol
 from community_of_python_flake8_plugin.plugin import CommunityOfPythonFlake8Plugin
+from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+from community_of_python_flake8_plugin.violations import Violation
 
 
-__all__ = ["CommunityOfPythonFlake8Plugin"]
+__all__ = [
+    "CheckContext",
+    "CommunityOfPythonFlake8Plugin",
+    "PerFileCheckProtocol",
+    "PluginCheckProtocol",
+    "Violation",
+    "ViolationCodeItem",
+]
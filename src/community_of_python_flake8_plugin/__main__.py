@@ -0,0 +1,4 @@
+from community_of_python_flake8_plugin.cli import main
+
+
+raise SystemExit(main())
@@ -0,0 +1,184 @@
+"""Aggregated violation counts per code, directory and CODEOWNERS owner, written as one JSON summary.
+
+Counters are updated as violations are reported and nothing else about a violation is kept, so memory
+depends on the number of distinct codes, directories and owners, not on the number of violations.
+"""
+
+from __future__ import annotations
+import collections
+import dataclasses
+import json
+import pathlib
+import re
+import typing
+
+from flake8.formatting.base import BaseFormatter  # type: ignore[import-untyped]
+
+from community_of_python_flake8_plugin.utils import convert_to_repository_path
+
+
+if typing.TYPE_CHECKING:
+    import argparse
+    from collections.abc import Iterable, Sequence
+
+    from flake8.violation import Violation  # type: ignore[import-untyped]
+
+    from community_of_python_flake8_plugin.plugin import OptionManagerProtocol
+    from community_of_python_flake8_plugin.runner import FileReport
+
+
+UNOWNED_LABEL: typing.Final = "(unowned)"
+ROOT_DIRECTORY_LABEL: typing.Final = "."
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class CodeOwnersRule:
+    path_pattern: re.Pattern[str]
+    owner_handles: tuple[str, ...]
+
+
+def convert_owner_pattern(owner_pattern: str) -> re.Pattern[str]:
+    """Translate a CODEOWNERS path pattern, which follows gitignore rules, into a regex for repository paths."""
+    # A slash at the start or in the middle anchors the pattern to the root; otherwise it matches at any depth
+    is_anchored: typing.Final = "/" in owner_pattern.rstrip("/")
+    stripped_pattern: typing.Final = owner_pattern.strip("/")
+    regex_parts: typing.Final = ["^" if is_anchored else "^(?:.*/)?"]
+    pattern_position = 0
+    while pattern_position < len(stripped_pattern):
+        if stripped_pattern.startswith("**/", pattern_position):
+            regex_parts.append("(?:.*/)?")
+            pattern_position += 3
+        elif stripped_pattern.startswith("**", pattern_position):
+            regex_parts.append(".*")
+            pattern_position += 2
+        elif stripped_pattern[pattern_position] == "*":
+            regex_parts.append("[^/]*")
+            pattern_position += 1
+        elif stripped_pattern[pattern_position] == "?":
+            regex_parts.append("[^/]")
+            pattern_position += 1
+        else:
+            regex_parts.append(re.escape(stripped_pattern[pattern_position]))
+            pattern_position += 1
+    # A matched directory owns everything below it, except that "docs/*" stops at the files directly in docs
+    regex_parts.append("$" if owner_pattern.endswith("/*") else "(?:/.*)?$")
+    return re.compile("".join(regex_parts))
+
+
+def parse_code_owners(code_owners_lines: Iterable[str]) -> list[CodeOwnersRule]:
+    code_owners_rules: typing.Final = []
+    for one_line in code_owners_lines:
+        line_fields = one_line.split("#", 1)[0].split()
+        if line_fields:
+            # A pattern without owners is valid: it leaves the matched files unowned
+            code_owners_rules.append(
+                CodeOwnersRule(path_pattern=convert_owner_pattern(line_fields[0]), owner_handles=tuple(line_fields[1:]))
+            )
+    return code_owners_rules
+
+
+def load_code_owners(code_owners_path: pathlib.Path) -> list[CodeOwnersRule]:
+    return parse_code_owners(code_owners_path.read_text(encoding="utf-8").splitlines())
+
+
+def find_code_owners(repository_path: str, code_owners_rules: Sequence[CodeOwnersRule]) -> tuple[str, ...]:
+    # The last matching rule wins
+    for one_rule in reversed(code_owners_rules):
+        if one_rule.path_pattern.match(repository_path):
+            return one_rule.owner_handles or (UNOWNED_LABEL,)
+    return (UNOWNED_LABEL,)
+
+
+@typing.final
+class ViolationStatistics:
+    def __init__(self, code_owners_rules: Sequence[CodeOwnersRule] | None = None) -> None:
+        self.code_owners_rules: typing.Final = code_owners_rules
+        self.checked_files_count = 0
+        self.violations_count = 0
+        self.code_counts: typing.Final[collections.Counter[str]] = collections.Counter()
+        self.directory_counts: typing.Final[collections.defaultdict[str, collections.Counter[str]]] = (
+            collections.defaultdict(collections.Counter)
+        )
+        self.owner_counts: typing.Final[collections.defaultdict[str, collections.Counter[str]]] = (
+            collections.defaultdict(collections.Counter)
+        )
+        # Violations of a file arrive together, so only the location of the latest file is remembered
+        self.current_filename: str | None = None
+        self.current_directory = ROOT_DIRECTORY_LABEL
+        self.current_owners: tuple[str, ...] = ()
+
+    def record_file(self) -> None:
+        self.checked_files_count += 1
+
+    def record_violation(self, filename: str, violation_code: str) -> None:
+        if filename != self.current_filename:
+            repository_path: typing.Final = convert_to_repository_path(filename)
+            self.current_filename = filename
+            self.current_directory = pathlib.PurePosixPath(repository_path).parent.as_posix()
+            if self.code_owners_rules is not None:
+                self.current_owners = find_code_owners(repository_path, self.code_owners_rules)
+        self.violations_count += 1
+        self.code_counts[violation_code] += 1
+        self.directory_counts[self.current_directory][violation_code] += 1
+        for one_owner in self.current_owners:
+            self.owner_counts[one_owner][violation_code] += 1
+
+    def record_report(self, file_report: FileReport) -> None:
+        self.record_file()
+        for one_violation in file_report.violations:
+            self.record_violation(file_report.filename, one_violation.violation_code.code)
+
+    def build_summary(self) -> dict[str, typing.Any]:
+        summary_document: typing.Final[dict[str, typing.Any]] = {
+            "files": self.checked_files_count,
+            "violations": self.violations_count,
+            "codes": dict(self.code_counts),
+            "directories": {
+                one_directory: dict(one_counts) for one_directory, one_counts in self.directory_counts.items()
+            },
+        }
+        if self.code_owners_rules is not None:
+            summary_document["owners"] = {
+                one_owner: dict(one_counts) for one_owner, one_counts in self.owner_counts.items()
+            }
+        return summary_document
+
+    def render_summary(self) -> str:
+        return json.dumps(self.build_summary(), separators=(",", ":"), sort_keys=True)
+
+
+@typing.final
+class StatisticsFormatter(BaseFormatter):  # type: ignore[misc]
+    """Flake8 formatter, selected with ``--format=cop-statistics``, that prints only the JSON summary."""
+
+    @classmethod
+    def add_options(cls, option_manager: OptionManagerProtocol) -> None:
+        option_manager.add_option(
+            "--cop-code-owners",
+            metavar="PATH",
+            default=None,
+            parse_from_config=True,
+            help="CODEOWNERS file used to count violations per owner with --format=cop-statistics.",
+        )
+
+    def after_init(self) -> None:  # noqa: COP009
+        parsed_options: typing.Final[argparse.Namespace] = self.options
+        self.violation_statistics = ViolationStatistics(
+            None
+            if getattr(parsed_options, "cop_code_owners", None) is None
+            else load_code_owners(pathlib.Path(parsed_options.cop_code_owners))
+        )
+
+    def finished(self, filename: str) -> None:  # noqa: ARG002, COP009
+        self.violation_statistics.record_file()
+
+    def handle(self, flake8_violation: Violation) -> None:  # noqa: COP007
+        self.violation_statistics.record_violation(flake8_violation.filename, flake8_violation.code)
+
+    def format(self, flake8_violation: Violation) -> str | None:  # noqa: ARG002, COP007
+        return None
+
+    def stop(self) -> None:  # noqa: COP007
+        self._write(self.violation_statistics.render_summary())
+        super().stop()
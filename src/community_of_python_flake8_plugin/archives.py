@@ -0,0 +1,129 @@
+"""Archive mode: lint the Python members of wheels, zip files and tarballs without extracting them.
+
+Members are read one at a time from the open archive and checked from memory, so nothing is written
+to disk and at most one member is held at once. Tarballs are read as a stream, in archive order.
+Reports name members as ``archive!member``; path profiles and exclusions apply to that form. Whole
+archives are the unit of work handed to pool workers, as each one is opened once.
+"""
+
+from __future__ import annotations
+import functools
+import pathlib
+import tarfile
+import typing
+import zipfile
+
+from community_of_python_flake8_plugin.profiles import DEFAULT_RULE_PROFILES
+from community_of_python_flake8_plugin.runner import (
+    DEFAULT_EXCLUDE_PATTERNS,
+    LINTED_SUFFIXES,
+    READ_ERROR_CODE,
+    FileReport,
+    ReportedViolation,
+    build_worker_pool,
+    check_buffer,
+    check_is_excluded,
+)
+from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from community_of_python_flake8_plugin.profiles import RuleProfiles
+
+
+ZIP_ARCHIVE_SUFFIXES: typing.Final = (".whl", ".zip")
+TAR_ARCHIVE_SUFFIXES: typing.Final = (".tar.gz", ".tgz")
+ARCHIVE_SUFFIXES: typing.Final = (*ZIP_ARCHIVE_SUFFIXES, *TAR_ARCHIVE_SUFFIXES)
+ARCHIVE_MEMBER_SEPARATOR: typing.Final = "!"
+
+
+def check_is_linted_member(member_name: str, exclude_patterns: Sequence[str]) -> bool:
+    return member_name.endswith(LINTED_SUFFIXES) and not check_is_excluded(
+        pathlib.PurePosixPath(member_name), exclude_patterns
+    )
+
+
+def read_zip_members(archive_path: pathlib.Path, exclude_patterns: Sequence[str]) -> Iterator[tuple[str, bytes]]:
+    with zipfile.ZipFile(archive_path) as zip_archive:
+        for one_member in zip_archive.infolist():
+            if not one_member.is_dir() and check_is_linted_member(one_member.filename, exclude_patterns):
+                yield one_member.filename, zip_archive.read(one_member)
+
+
+def read_tar_members(archive_path: pathlib.Path, exclude_patterns: Sequence[str]) -> Iterator[tuple[str, bytes]]:
+    # Stream mode decompresses as it goes and never seeks back, so the archive is read once
+    with tarfile.open(archive_path, mode="r|*") as tar_archive:
+        for one_member in tar_archive:
+            if not one_member.isfile() or not check_is_linted_member(one_member.name, exclude_patterns):
+                continue
+            member_file = tar_archive.extractfile(one_member)
+            if member_file is not None:
+                yield one_member.name, member_file.read()
+
+
+def read_archive_members(
+    archive_filename: str, exclude_patterns: Sequence[str] = DEFAULT_EXCLUDE_PATTERNS
+) -> Iterator[tuple[str, bytes]]:
+    """Yield the name and contents of every linted member, in archive order."""
+    archive_path: typing.Final = pathlib.Path(archive_filename)
+    if archive_filename.endswith(TAR_ARCHIVE_SUFFIXES):
+        return read_tar_members(archive_path, exclude_patterns)
+    return read_zip_members(archive_path, exclude_patterns)
+
+
+def check_archive(
+    archive_filename: str,
+    exclude_patterns: Sequence[str] = DEFAULT_EXCLUDE_PATTERNS,
+    rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES,
+) -> list[FileReport]:
+    file_reports: typing.Final[list[FileReport]] = []
+    try:
+        for one_member_name, one_member_bytes in read_archive_members(archive_filename, exclude_patterns):
+            file_reports.append(
+                check_buffer(
+                    one_member_bytes,
+                    f"{archive_filename}{ARCHIVE_MEMBER_SEPARATOR}{one_member_name}",
+                    rule_profiles,
+                )
+            )
+    except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError) as archive_error:
+        # Members checked before the archive turned out to be damaged are still reported
+        file_reports.append(
+            FileReport(
+                filename=archive_filename,
+                violations=(
+                    ReportedViolation(
+                        filename=archive_filename,
+                        line_number=1,
+                        column_number=0,
+                        violation_code=ViolationCodeItem(
+                            code=READ_ERROR_CODE, description=f"Cannot read archive: {archive_error}"
+                        ),
+                    ),
+                ),
+                elapsed_seconds=0.0,
+            )
+        )
+    return file_reports
+
+
+def run_archives(
+    archive_filenames: Sequence[str],
+    jobs_count: int = 1,
+    pool_kind: str = "process",
+    rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES,
+    exclude_patterns: Sequence[str] = DEFAULT_EXCLUDE_PATTERNS,
+) -> Iterator[FileReport]:
+    """Check the members of every archive, one archive per task when more than one job is requested, in order."""
+    check_profiled_archive: typing.Final = functools.partial(
+        check_archive, exclude_patterns=tuple(exclude_patterns), rule_profiles=rule_profiles
+    )
+    if jobs_count <= 1 or len(archive_filenames) <= 1:
+        for one_reports in map(check_profiled_archive, archive_filenames):
+            yield from one_reports
+        return
+    with build_worker_pool(pool_kind, jobs_count) as worker_pool:
+        for one_reports in worker_pool.map(check_profiled_archive, archive_filenames):
+            yield from one_reports
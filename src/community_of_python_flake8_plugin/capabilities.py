@@ -0,0 +1,35 @@
+from __future__ import annotations
+import ast
+import collections
+import dataclasses
+import typing
+
+from community_of_python_flake8_plugin.traversal import build_descent_plan
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class FileCapabilities:
+    """Node-type histogram of a file, collected once and used to skip checks that cannot fire."""
+
+    node_type_counts: collections.Counter[type[ast.AST]]
+
+    @classmethod
+    def collect_from_tree(
+        cls, syntax_tree: ast.AST, counted_node_types: frozenset[type[ast.AST]] | None = None
+    ) -> FileCapabilities:
+        """Count every node type, or only ``counted_node_types``, skipping subtrees that cannot hold them."""
+        if counted_node_types is None:
+            return cls(node_type_counts=collections.Counter(map(type, ast.walk(syntax_tree))))
+        return cls(
+            node_type_counts=collections.Counter(
+                map(type, build_descent_plan(counted_node_types).iter_tree_nodes(syntax_tree))
+            )
+        )
+
+    def has_any_node_type(self, node_types: Iterable[type[ast.AST]]) -> bool:
+        return any(self.node_type_counts[one_node_type] for one_node_type in node_types)
@@ -2,23 +2,37 @@ from __future__ import annotations
 import ast
 import typing
 
+from community_of_python_flake8_plugin.naming_policy import NameTrait, fetch_naming_matcher
+from community_of_python_flake8_plugin.symbols import IdentifierKind, fetch_symbol_table
 from community_of_python_flake8_plugin.violation_codes import ViolationCodes
 from community_of_python_flake8_plugin.violations import Violation
 
 
+if typing.TYPE_CHECKING:
+    from community_of_python_flake8_plugin.engine import CheckContext
+    from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+
+
 @typing.final
-class AsyncGetPrefixCheck(ast.NodeVisitor):
-    def __init__(self, syntax_tree: ast.AST) -> None:  # noqa: ARG002
-        self.violations: list[Violation] = []
+class AsyncGetPrefixCheck:
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.AsyncFunctionDef})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.Module})
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset({ViolationCodes.ASYNC_GET_PREFIX})
 
-    def visit_AsyncFunctionDef(self, ast_node: ast.AsyncFunctionDef) -> None:
-        # Always flag async functions with get_ prefix
-        if ast_node.name.startswith("get_"):
-            self.violations.append(
+    def visit_Module(self, ast_node: ast.Module, check_context: CheckContext) -> None:
+        # Always flag async functions with the forbidden prefix, get_ by default
+        naming_matcher: typing.Final = fetch_naming_matcher()
+        for one_identifier, one_symbols in fetch_symbol_table(ast_node).symbols_by_identifier.items():
+            if NameTrait.FORBIDDEN_ASYNC_PREFIX not in naming_matcher.classify_identifier(
+                one_identifier, IdentifierKind.FUNCTION
+            ):
+                continue
+            check_context.violations.extend(
                 Violation(
-                    line_number=ast_node.lineno,
-                    column_number=ast_node.col_offset,
+                    line_number=one_symbol.line_number,
+                    column_number=one_symbol.column_number,
                     violation_code=ViolationCodes.ASYNC_GET_PREFIX,
                 )
+                for one_symbol in one_symbols
+                if one_symbol.identifier_kind is IdentifierKind.FUNCTION and one_symbol.is_async
             )
-        self.generic_visit(ast_node)
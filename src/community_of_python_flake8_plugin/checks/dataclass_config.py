@@ -8,6 +8,11 @@ from community_of_python_flake8_plugin.violation_codes import ViolationCodes
 from community_of_python_flake8_plugin.violations import Violation
 
 
+if typing.TYPE_CHECKING:
+    from community_of_python_flake8_plugin.engine import CheckContext
+    from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+
+
 def is_dataclass_decorator(decorator: ast.expr) -> bool:
     """Check if the decorator is a dataclass decorator."""
     if isinstance(decorator, ast.Call):
@@ -66,11 +71,12 @@ def is_model_factory(class_node: ast.ClassDef) -> bool:
 
 
 @typing.final
-class DataclassConfigCheck(ast.NodeVisitor):
-    def __init__(self, syntax_tree: ast.AST) -> None:  # noqa: ARG002
-        self.violations: list[Violation] = []
+class DataclassConfigCheck:
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.ClassDef})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = required_node_types
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset({ViolationCodes.DATACLASS_CONFIG})
 
-    def visit_ClassDef(self, ast_node: ast.ClassDef) -> None:
+    def visit_ClassDef(self, ast_node: ast.ClassDef, check_context: CheckContext) -> None:
         # Skip whitelisted classes and classes that inherit from Exception or other special classes
         if (
             check_inherits_from_bases(ast_node, FINAL_CLASS_EXCLUDED_BASES)
@@ -78,14 +84,13 @@ class DataclassConfigCheck(ast.NodeVisitor):
             or is_model_factory(ast_node)
             or self._check_inherits_from_exception(ast_node)
         ):
-            self.generic_visit(ast_node)
             return
 
         # Check for dataclass decorator
         for one_decorator in ast_node.decorator_list:
             if is_dataclass_decorator(one_decorator):
                 if not has_required_dataclass_params(one_decorator):
-                    self.violations.append(
+                    check_context.violations.append(
                         Violation(
                             line_number=ast_node.lineno,
                             column_number=ast_node.col_offset,
@@ -94,8 +99,6 @@ class DataclassConfigCheck(ast.NodeVisitor):
                     )
                 break
 
-        self.generic_visit(ast_node)
-
     def _check_inherits_from_exception(self, ast_node: ast.ClassDef) -> bool:
         """Check if class inherits from Exception or its subclasses."""
         for one_base in ast_node.bases:
@@ -12,24 +12,14 @@ import typing
 from importlib import util as importlib_util
 
 from community_of_python_flake8_plugin import constants
+from community_of_python_flake8_plugin.module_facts import fetch_module_facts
 from community_of_python_flake8_plugin.violation_codes import ViolationCodes
 from community_of_python_flake8_plugin.violations import Violation
 
 
-def check_module_has_all_declaration(module_node: ast.Module) -> bool:
-    for one_statement in module_node.body:
-        if isinstance(one_statement, ast.Assign) and any(
-            isinstance(one_target_element, ast.Name) and one_target_element.id == "__all__"
-            for one_target_element in one_statement.targets
-        ):
-            return True
-        if (
-            isinstance(one_statement, ast.AnnAssign)
-            and isinstance(one_statement.target, ast.Name)
-            and one_statement.target.id == "__all__"
-        ):
-            return True
-    return False
+if typing.TYPE_CHECKING:
+    from community_of_python_flake8_plugin.engine import CheckContext
+    from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
 
 
 def check_module_path_exists(module_name: str) -> bool:
@@ -54,22 +44,21 @@ def check_module_path_exists(module_name: str) -> bool:
 
 
 @typing.final
-class ModuleImportManyNamesCheck(ast.NodeVisitor):
-    def __init__(self, syntax_tree: ast.AST) -> None:
-        self.violations: list[Violation] = []
-        self.contains_all_declaration: typing.Final[bool] = (
-            check_module_has_all_declaration(syntax_tree) if isinstance(syntax_tree, ast.Module) else False
-        )
-
-    def visit_ImportFrom(self, ast_node: ast.ImportFrom) -> None:
+class ModuleImportManyNamesCheck:
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.ImportFrom})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = required_node_types
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset(
+        {ViolationCodes.MODULE_IMPORT_MANY_NAMES}
+    )
+
+    def visit_ImportFrom(self, ast_node: ast.ImportFrom, check_context: CheckContext) -> None:
         if ast_node.module and ast_node.level == 0:
-            self.validate_import_size(ast_node)
-        self.generic_visit(ast_node)
+            self.validate_import_size(ast_node, check_context)
 
-    def validate_import_size(self, ast_node: ast.ImportFrom) -> None:
+    def validate_import_size(self, ast_node: ast.ImportFrom, check_context: CheckContext) -> None:
         if len(ast_node.names) <= constants.MAX_IMPORT_NAMES:
             return
-        if self.contains_all_declaration:
+        if fetch_module_facts(check_context.syntax_tree).has_all_declaration:
             return
 
         module_name: typing.Final = ast_node.module
@@ -81,7 +70,7 @@ class ModuleImportManyNamesCheck(ast.NodeVisitor):
             for one_alias_element in ast_node.names
             if isinstance(one_alias_element, ast.alias) and module_name is not None
         ):
-            self.violations.append(
+            check_context.violations.append(
                 Violation(
                     line_number=ast_node.lineno,
                     column_number=ast_node.col_offset,
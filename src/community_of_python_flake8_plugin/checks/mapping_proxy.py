@@ -7,6 +7,11 @@ from community_of_python_flake8_plugin.violation_codes import ViolationCodes
 from community_of_python_flake8_plugin.violations import Violation
 
 
+if typing.TYPE_CHECKING:
+    from community_of_python_flake8_plugin.engine import CheckContext
+    from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+
+
 def is_mapping_proxy_type(annotation: ast.expr | None) -> bool:
     if annotation is None:
         return False
@@ -66,17 +71,17 @@ def is_dict_type_annotation(annotation: ast.expr | None) -> bool:
 
 
 @typing.final
-class MappingProxyCheck(ast.NodeVisitor):
-    def __init__(self, syntax_tree: ast.AST) -> None:  # noqa: ARG002
-        self.violations: list[Violation] = []
+class MappingProxyCheck:
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.Dict})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.Module})
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset({ViolationCodes.MAPPING_PROXY})
 
-    def visit_Module(self, ast_node: ast.Module) -> None:
+    def visit_Module(self, ast_node: ast.Module, check_context: CheckContext) -> None:
         for one_statement in ast_node.body:
             if isinstance(one_statement, (ast.Assign, ast.AnnAssign)):
-                self._check_mapping_assignment(one_statement)
-        self.generic_visit(ast_node)
+                self._check_mapping_assignment(one_statement, check_context)
 
-    def _check_mapping_assignment(self, ast_node: ast.Assign | ast.AnnAssign) -> None:
+    def _check_mapping_assignment(self, ast_node: ast.Assign | ast.AnnAssign, check_context: CheckContext) -> None:
         # Skip annotated assignments with MappingProxyType annotation
         if isinstance(ast_node, ast.AnnAssign) and is_mapping_proxy_type(ast_node.annotation):
             return
@@ -101,7 +106,7 @@ class MappingProxyCheck(ast.NodeVisitor):
             # Check if this is a module-level assignment
             for one_target in assignment_targets:  # noqa: COP011
                 if isinstance(one_target, ast.Name):
-                    self.violations.append(
+                    check_context.violations.append(
                         Violation(
                             line_number=ast_node.lineno,
                             column_number=ast_node.col_offset,
@@ -9,6 +9,11 @@ from community_of_python_flake8_plugin.violation_codes import ViolationCodes
 from community_of_python_flake8_plugin.violations import Violation
 
 
+if typing.TYPE_CHECKING:
+    from community_of_python_flake8_plugin.engine import CheckContext
+    from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+
+
 def check_is_stdlib_module(module_name: str) -> bool:
     return module_name in sys.stdlib_module_names
 
@@ -21,16 +26,16 @@ def check_is_stdlib_package(module_name: str) -> bool:
 
 
 @typing.final
-class COP002StdlibImportCheck(ast.NodeVisitor):
-    def __init__(self, syntax_tree: ast.AST) -> None:  # noqa: ARG002
-        self.violations: list[Violation] = []
+class COP002StdlibImportCheck:
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.ImportFrom})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = required_node_types
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset({ViolationCodes.MODULE_IMPORT_STDLIB})
 
-    def visit_ImportFrom(self, ast_node: ast.ImportFrom) -> None:
+    def visit_ImportFrom(self, ast_node: ast.ImportFrom, check_context: CheckContext) -> None:
         if ast_node.module and ast_node.level == 0 and ast_node.module not in ALLOWED_STDLIB_FROM_IMPORTS:
-            self.validate_stdlib_import(ast_node)
-        self.generic_visit(ast_node)
+            self.validate_stdlib_import(ast_node, check_context)
 
-    def validate_stdlib_import(self, ast_node: ast.ImportFrom) -> None:
+    def validate_stdlib_import(self, ast_node: ast.ImportFrom, check_context: CheckContext) -> None:
         module_name: typing.Final = ast_node.module
         if module_name is None:
             return
@@ -40,7 +45,7 @@ class COP002StdlibImportCheck(ast.NodeVisitor):
         if (check_is_stdlib_module(module_name) and not check_is_stdlib_package(module_name)) or (
             "." in module_name and check_is_stdlib_package(module_name.split(".")[0])
         ):
-            self.violations.append(
+            check_context.violations.append(
                 Violation(
                     line_number=ast_node.lineno,
                     column_number=ast_node.col_offset,
@@ -3,11 +3,16 @@ import ast
 import typing
 
 from community_of_python_flake8_plugin.constants import SCALAR_ANNOTATIONS
-from community_of_python_flake8_plugin.utils import find_parent_class_definition, find_parent_node
+from community_of_python_flake8_plugin.traversal import build_descent_plan
 from community_of_python_flake8_plugin.violation_codes import ViolationCodes
 from community_of_python_flake8_plugin.violations import Violation
 
 
+if typing.TYPE_CHECKING:
+    from community_of_python_flake8_plugin.engine import CheckContext
+    from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+
+
 def check_is_literal_value(node_value: ast.AST) -> bool:
     if isinstance(node_value, ast.Constant):
         return True
@@ -37,26 +42,38 @@ def check_is_scalar_annotation(annotation_node: ast.AST) -> bool:
 
 
 @typing.final
-class ScalarAnnotationCheck(ast.NodeVisitor):
-    def __init__(self, syntax_tree: ast.AST) -> None:  # noqa: COP006
-        self.violations: list[Violation] = []
-        self.syntax_tree: typing.Final[ast.AST] = syntax_tree
+class ScalarAnnotationCheck:
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.AnnAssign})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.Module})
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset({ViolationCodes.SCALAR_ANNOTATION})
 
-    def visit_AnnAssign(self, ast_node: ast.AnnAssign) -> None:
-        if isinstance(ast_node.target, ast.Name) and (
-            find_parent_class_definition(self.syntax_tree, ast_node) is None
-            or find_parent_node(self.syntax_tree, ast_node, (ast.FunctionDef, ast.AsyncFunctionDef)) is not None
-        ):
-            self.validate_scalar_annotation(ast_node)
-        self.generic_visit(ast_node)
+    def visit_Module(self, ast_node: ast.Module, check_context: CheckContext) -> None:
+        # Scopes are tracked in one walk instead of searching the tree for the parents of every annotation
+        descent_plan: typing.Final = build_descent_plan(frozenset({ast.AnnAssign}))
+        pending_nodes: typing.Final[list[tuple[ast.AST, bool, bool]]] = [(ast_node, False, False)]
+        while pending_nodes:
+            current_node, is_in_class, is_in_function = pending_nodes.pop()
+            # Annotations of class attributes declare fields rather than values, unless a method assigns them
+            if (
+                isinstance(current_node, ast.AnnAssign)
+                and isinstance(current_node.target, ast.Name)
+                and (not is_in_class or is_in_function)
+            ):
+                self.validate_scalar_annotation(current_node, check_context)
+            is_in_class = is_in_class or isinstance(current_node, ast.ClassDef)
+            is_in_function = is_in_function or isinstance(current_node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            pending_nodes.extend(
+                (one_child_node, is_in_class, is_in_function)
+                for one_child_node in descent_plan.iter_child_nodes(current_node)
+            )
 
-    def validate_scalar_annotation(self, ast_node: ast.AnnAssign) -> None:
+    def validate_scalar_annotation(self, ast_node: ast.AnnAssign, check_context: CheckContext) -> None:
         if ast_node.value is None:
             return
         if not check_is_literal_value(ast_node.value):
             return
         if check_is_scalar_annotation(ast_node.annotation):
-            self.violations.append(
+            check_context.violations.append(
                 Violation(
                     line_number=ast_node.lineno,
                     column_number=ast_node.col_offset,
@@ -3,10 +3,16 @@ import ast
 import typing
 from collections import defaultdict
 
+from community_of_python_flake8_plugin.traversal import PrunedNodeVisitor
 from community_of_python_flake8_plugin.violation_codes import ViolationCodes
 from community_of_python_flake8_plugin.violations import Violation
 
 
+if typing.TYPE_CHECKING:
+    from community_of_python_flake8_plugin.engine import CheckContext
+    from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+
+
 def is_tuple_unpacking(assign_node: ast.Assign) -> bool:
     return bool(assign_node.targets and isinstance(assign_node.targets[0], ast.Tuple))
 
@@ -33,47 +39,57 @@ def is_single_line_assignment(assign_node: ast.Assign | ast.AnnAssign) -> bool:
     return True
 
 
-def collect_variable_usage_and_stores_with_nodes(
-    function_node: ast.AST,
-) -> tuple[dict[str, list[ast.Name]], set[str], dict[str, ast.Assign | ast.AnnAssign]]:
-    variable_usage: typing.Final[defaultdict[str, list[ast.Name]]] = defaultdict(list)
-    assigned_variable_names: typing.Final[set[str]] = set()
-    variable_assignments: typing.Final[dict[str, ast.Assign | ast.AnnAssign]] = {}
-
-    @typing.final
-    class UsageCollector(ast.NodeVisitor):
-        def visit_Name(self, name_node: ast.Name) -> None:
-            variable_usage[name_node.id].append(name_node)
-            self.generic_visit(name_node)
-
-        def visit_Assign(self, assign_node: ast.Assign) -> None:
-            # Skip collecting variables from tuple unpacking assignments
-            if is_tuple_unpacking(assign_node):
-                self.generic_visit(assign_node)
-                return
-
-            for one_target in assign_node.targets:
-                one_names = list(extract_names(one_target))
-                assigned_variable_names.update(one_names)
-                # Store the assignment node for each variable
-                for one_name in one_names:
-                    variable_assignments[one_name] = assign_node
+@typing.final
+class UsageCollector(PrunedNodeVisitor):
+    """Collect the names read and written in one function."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.variable_usage: typing.Final[defaultdict[str, list[ast.Name]]] = defaultdict(list)
+        self.assigned_variable_names: typing.Final[set[str]] = set()
+        self.variable_assignments: typing.Final[dict[str, ast.Assign | ast.AnnAssign]] = {}
+
+    def visit_Name(self, name_node: ast.Name) -> None:
+        self.variable_usage[name_node.id].append(name_node)
+        self.generic_visit(name_node)
+
+    def visit_Assign(self, assign_node: ast.Assign) -> None:
+        # Skip collecting variables from tuple unpacking assignments
+        if is_tuple_unpacking(assign_node):
             self.generic_visit(assign_node)
+            return
 
-        def visit_AugAssign(self, aug_assign_node: ast.AugAssign) -> None:
-            assigned_variable_names.update(list(extract_names(aug_assign_node.target)))
-            self.generic_visit(aug_assign_node)
-
-        def visit_AnnAssign(self, ann_assign_node: ast.AnnAssign) -> None:
-            extracted_names: typing.Final = list(extract_names(ann_assign_node.target))  # noqa: COP011
-            assigned_variable_names.update(extracted_names)
+        for one_target in assign_node.targets:
+            one_names = list(extract_names(one_target))
+            self.assigned_variable_names.update(one_names)
             # Store the assignment node for each variable
-            for one_name in extracted_names:
-                variable_assignments[one_name] = ann_assign_node
-            self.generic_visit(ann_assign_node)
+            for one_name in one_names:
+                self.variable_assignments[one_name] = assign_node
+        self.generic_visit(assign_node)
 
-    UsageCollector().visit(function_node)
-    return dict(variable_usage), assigned_variable_names, variable_assignments
+    def visit_AugAssign(self, aug_assign_node: ast.AugAssign) -> None:
+        self.assigned_variable_names.update(list(extract_names(aug_assign_node.target)))
+        self.generic_visit(aug_assign_node)
+
+    def visit_AnnAssign(self, ann_assign_node: ast.AnnAssign) -> None:
+        extracted_names: typing.Final = list(extract_names(ann_assign_node.target))  # noqa: COP011
+        self.assigned_variable_names.update(extracted_names)
+        # Store the assignment node for each variable
+        for one_name in extracted_names:
+            self.variable_assignments[one_name] = ann_assign_node
+        self.generic_visit(ann_assign_node)
+
+
+def collect_variable_usage_and_stores_with_nodes(
+    function_node: ast.AST,
+) -> tuple[dict[str, list[ast.Name]], set[str], dict[str, ast.Assign | ast.AnnAssign]]:
+    usage_collector: typing.Final = UsageCollector()
+    usage_collector.visit(function_node)
+    return (
+        dict(usage_collector.variable_usage),
+        usage_collector.assigned_variable_names,
+        usage_collector.variable_assignments,
+    )
 
 
 def is_used_in_next_line(assign_node: ast.Assign | ast.AnnAssign, usage_nodes: list[ast.Name]) -> bool:
@@ -93,19 +109,20 @@ def is_used_in_next_line(assign_node: ast.Assign | ast.AnnAssign, usage_nodes: l
 
 
 @typing.final
-class TempVarCheck(ast.NodeVisitor):
-    def __init__(self, syntax_tree: ast.AST) -> None:  # noqa: ARG002
-        self.violations: list[Violation] = []
+class TempVarCheck:
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.FunctionDef, ast.AsyncFunctionDef})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = required_node_types
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset({ViolationCodes.TEMP_VAR})
 
-    def visit_FunctionDef(self, ast_node: ast.FunctionDef) -> None:
-        self._check_temporary_variables(ast_node)
-        self.generic_visit(ast_node)
+    def visit_FunctionDef(self, ast_node: ast.FunctionDef, check_context: CheckContext) -> None:
+        self._check_temporary_variables(ast_node, check_context)
 
-    def visit_AsyncFunctionDef(self, ast_node: ast.AsyncFunctionDef) -> None:
-        self._check_temporary_variables(ast_node)
-        self.generic_visit(ast_node)
+    def visit_AsyncFunctionDef(self, ast_node: ast.AsyncFunctionDef, check_context: CheckContext) -> None:
+        self._check_temporary_variables(ast_node, check_context)
 
-    def _check_temporary_variables(self, ast_node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+    def _check_temporary_variables(
+        self, ast_node: ast.FunctionDef | ast.AsyncFunctionDef, check_context: CheckContext
+    ) -> None:
         usage_and_stores: typing.Final = collect_variable_usage_and_stores_with_nodes(ast_node)
         variable_usages: typing.Final = usage_and_stores[0]
         assigned_variable_names: typing.Final = usage_and_stores[1]
@@ -140,7 +157,7 @@ class TempVarCheck(ast.NodeVisitor):
                     store_usages = [one_node for one_node in usages if isinstance(one_node.ctx, ast.Store)]
                     if store_usages:
                         first_store = store_usages[0]
-                        self.violations.append(
+                        check_context.violations.append(
                             Violation(
                                 line_number=first_store.lineno,
                                 column_number=first_store.col_offset,
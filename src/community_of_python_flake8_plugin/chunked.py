@@ -0,0 +1,119 @@
+"""Reading huge modules one top-level statement at a time.
+
+The source stream is tokenized once, lazily, and its lines are grouped into the top-level statements
+they belong to, so that each group can be parsed and checked on its own and then released. Comments
+and blank lines between two statements stay with the first one.
+"""
+
+from __future__ import annotations
+import ast
+import dataclasses
+import itertools
+import tokenize
+import typing
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+# Clauses continuing the compound statement whose body was just dedented
+CONTINUATION_KEYWORDS: typing.Final = frozenset({"elif", "else", "except", "finally"})
+# Tokens that neither start a statement nor change the indentation depth
+IGNORED_TOKEN_TYPES: typing.Final = frozenset({tokenize.NL, tokenize.COMMENT, tokenize.ENDMARKER})
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class StatementChunk:
+    first_line_number: int
+    source_lines: tuple[str, ...]
+
+    def parse_statements(self, filename: str) -> ast.Module:
+        """Parse the chunk with line numbers counted from its first line; syntax errors carry module lines."""
+        chunk_source: typing.Final = "".join(self.source_lines)
+        try:
+            return ast.parse(chunk_source, filename=filename)
+        except SyntaxError:
+            # Messages mention line numbers too, so the error is reproduced at the chunk's place in the module
+            ast.parse("\n" * (self.first_line_number - 1) + chunk_source, filename=filename)
+            raise
+
+
+@typing.final
+class StatementChunkReader:
+    def __init__(self, source_stream: typing.TextIO) -> None:
+        self.source_stream: typing.Final = source_stream
+        self.buffered_lines: typing.Final[list[str]] = []
+        self.chunk_first_line = 1
+
+    def read_line(self) -> str:
+        source_line: typing.Final = self.source_stream.readline()
+        if source_line:
+            self.buffered_lines.append(source_line)
+        return source_line
+
+    def take_lines_before(self, line_number: int) -> StatementChunk:
+        split_index: typing.Final = line_number - self.chunk_first_line
+        statement_chunk: typing.Final = StatementChunk(
+            first_line_number=self.chunk_first_line, source_lines=tuple(self.buffered_lines[:split_index])
+        )
+        del self.buffered_lines[:split_index]
+        self.chunk_first_line = line_number
+        return statement_chunk
+
+    def generate_chunks(self) -> Iterator[StatementChunk]:
+        """Yield one chunk per top-level statement; statements sharing a line with ``;`` share a chunk."""
+        indentation_depth = 0
+        is_logical_line_start = True
+        is_decorating = False
+        has_statement = False
+        try:
+            for one_token in tokenize.generate_tokens(self.read_line):
+                if one_token.type == tokenize.INDENT:
+                    indentation_depth += 1
+                elif one_token.type == tokenize.DEDENT:
+                    indentation_depth -= 1
+                elif one_token.type == tokenize.NEWLINE:
+                    is_logical_line_start = True
+                elif one_token.type not in IGNORED_TOKEN_TYPES:
+                    if is_logical_line_start and indentation_depth == 0:
+                        # Decorators and clauses such as "else:" belong to the statement before them
+                        if has_statement and not is_decorating and one_token.string not in CONTINUATION_KEYWORDS:
+                            yield self.take_lines_before(one_token.start[0])
+                        is_decorating = one_token.string == "@"
+                        has_statement = True
+                    is_logical_line_start = False
+        except (tokenize.TokenError, SyntaxError):
+            # The rest of the source cannot be split; parsing it as one chunk reports the syntax error
+            self.buffered_lines.extend(self.source_stream.readlines())
+        if self.buffered_lines:
+            yield self.take_lines_before(self.chunk_first_line + len(self.buffered_lines))
+
+
+def merge_statement_chunks(statement_chunks: Iterable[StatementChunk], batch_bytes: int) -> Iterator[StatementChunk]:
+    """Join consecutive chunks into batches of about ``batch_bytes`` characters to amortize per-tree overhead."""
+    pending_lines: typing.Final[list[str]] = []
+    pending_size = 0
+    first_line_number = 1
+    for one_chunk in statement_chunks:
+        if not pending_lines:
+            first_line_number = one_chunk.first_line_number
+        pending_lines.extend(one_chunk.source_lines)
+        pending_size += sum(map(len, one_chunk.source_lines))
+        if pending_size >= batch_bytes:
+            yield StatementChunk(first_line_number=first_line_number, source_lines=tuple(pending_lines))
+            pending_lines.clear()
+            pending_size = 0
+    if pending_lines:
+        yield StatementChunk(first_line_number=first_line_number, source_lines=tuple(pending_lines))
+
+
+def read_line_batches(source_stream: typing.TextIO, batch_line_counts: Iterable[int]) -> Iterator[StatementChunk]:
+    """Cut a stream into chunks of known line counts, such as the batches of an earlier pass, without tokenizing."""
+    first_line_number = 1
+    for one_line_count in batch_line_counts:
+        yield StatementChunk(
+            first_line_number=first_line_number, source_lines=tuple(itertools.islice(source_stream, one_line_count))
+        )
+        first_line_number += one_line_count
@@ -0,0 +1,311 @@
+from __future__ import annotations
+import argparse
+import os
+import pathlib
+import subprocess
+import sys
+import typing
+
+from community_of_python_flake8_plugin.aggregation import ViolationStatistics, load_code_owners
+from community_of_python_flake8_plugin.archives import ARCHIVE_SUFFIXES, run_archives
+from community_of_python_flake8_plugin.distributed import parse_server_address, run_coordinator, run_worker
+from community_of_python_flake8_plugin.fixes import run_fixes
+from community_of_python_flake8_plugin.lsp import LanguageServer
+from community_of_python_flake8_plugin.naming_policy import DEFAULT_NAMING_POLICY, NamingPolicy
+from community_of_python_flake8_plugin.profiles import RuleProfiles, parse_rule_profiles
+from community_of_python_flake8_plugin.runner import (
+    DEFAULT_EXCLUDE_PATTERNS,
+    LINTED_SUFFIXES,
+    POOL_KINDS,
+    collect_python_files,
+    run_files,
+)
+from community_of_python_flake8_plugin.sharding import (
+    ShardSelection,
+    extract_shard_files,
+    load_file_costs,
+    write_file_costs,
+)
+from community_of_python_flake8_plugin.staged import collect_staged_files, run_staged_files
+from community_of_python_flake8_plugin.watch import run_watch_loop
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from community_of_python_flake8_plugin.fixes import FixOutcome
+    from community_of_python_flake8_plugin.profiles import PathProfile
+    from community_of_python_flake8_plugin.runner import FileReport
+
+
+def parse_shard_selection(shard_text: str) -> ShardSelection:
+    try:
+        return ShardSelection.parse_from_text(shard_text)
+    except ValueError as parse_error:
+        raise argparse.ArgumentTypeError(str(parse_error)) from parse_error
+
+
+def parse_path_profiles(profiles_text: str) -> tuple[PathProfile, ...]:
+    try:
+        return parse_rule_profiles(profiles_text)
+    except ValueError as parse_error:
+        raise argparse.ArgumentTypeError(str(parse_error)) from parse_error
+
+
+def parse_address_argument(address_text: str) -> tuple[str, int]:
+    try:
+        return parse_server_address(address_text)
+    except ValueError as parse_error:
+        raise argparse.ArgumentTypeError(str(parse_error)) from parse_error
+
+
+def parse_comma_separated(option_value: str) -> list[str]:
+    return [one_item.strip() for one_item in option_value.split(",") if one_item.strip()]
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    argument_parser: typing.Final = argparse.ArgumentParser(
+        prog="cop", description="Lint Python files with the Community of Python checks."
+    )
+    argument_parser.add_argument("paths", nargs="*", default=["."], help="files and directories to lint")
+    argument_parser.add_argument(
+        "--exclude",
+        type=parse_comma_separated,
+        default=list(DEFAULT_EXCLUDE_PATTERNS),
+        help="comma-separated glob patterns of file and directory names to skip",
+    )
+    argument_parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1, help="number of workers (default: CPU count)"
+    )
+    argument_parser.add_argument(
+        "--pool",
+        choices=POOL_KINDS,
+        default="process",
+        help=(
+            "run the workers as processes, as threads, which scale on free-threaded builds, or as subinterpreters"
+            " on Python 3.14+, falling back to processes elsewhere (default: process)"
+        ),
+    )
+    argument_parser.add_argument(
+        "--profiles",
+        type=parse_path_profiles,
+        default=(),
+        metavar="GLOB:CODES",
+        help=(
+            "space-separated path globs with the COP codes they turn off, as in flake8's per-file-ignores,"
+            " e.g. 'tests/*:COP001,COP010 migrations/*.py:COP'"
+        ),
+    )
+    argument_parser.add_argument(
+        "--check-generated",
+        action="store_true",
+        help="also lint files marked as generated ('@generated' or '# Code generated ... DO NOT EDIT.' near the top)",
+    )
+    argument_parser.add_argument(
+        "--min-name-length",
+        type=int,
+        default=DEFAULT_NAMING_POLICY.min_name_length,
+        metavar="LENGTH",
+        help="minimum length of names checked by COP004 to COP008 (default: %(default)s)",
+    )
+    argument_parser.add_argument(
+        "--short-names",
+        type=parse_comma_separated,
+        default=[],
+        metavar="NAMES",
+        help="comma-separated names allowed to be shorter than the minimum length, in addition to the defaults",
+    )
+    argument_parser.add_argument(
+        "--extra-verbs",
+        type=parse_comma_separated,
+        default=[],
+        metavar="VERBS",
+        help="comma-separated verbs accepted by COP009 as function name prefixes, in addition to the defaults",
+    )
+    argument_parser.add_argument(
+        "--shard",
+        type=parse_shard_selection,
+        metavar="I/N",
+        help="lint only the I-th of N cost-balanced shards of the files (one-based)",
+    )
+    argument_parser.add_argument(
+        "--cost-file",
+        type=pathlib.Path,
+        metavar="PATH",
+        help=(
+            "JSON object mapping files to seconds, used to balance shards and to start the slowest files first;"
+            " files missing from it are sized"
+        ),
+    )
+    argument_parser.add_argument(
+        "--update-cost-file",
+        action="store_true",
+        help="merge the timings measured in this run into --cost-file",
+    )
+    argument_parser.add_argument(
+        "--statistics",
+        action="store_true",
+        help="print a JSON summary of violation counts per code and directory instead of the violations",
+    )
+    argument_parser.add_argument(
+        "--code-owners",
+        type=pathlib.Path,
+        metavar="PATH",
+        help="with --statistics, also count violations per owner listed in this CODEOWNERS file",
+    )
+    argument_parser.add_argument(
+        "--watch", action="store_true", help="keep running and re-check files as they change (inotify on Linux)"
+    )
+    argument_parser.add_argument(
+        "--watch-polling", action="store_true", help="watch by polling modification times instead of inotify"
+    )
+    argument_parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="lint the staged content of the files, read from the git index, instead of the working tree",
+    )
+    argument_parser.add_argument(
+        "--archives",
+        action="store_true",
+        help="lint the Python files inside the wheels, zip files and tarballs under the paths, without extracting them",
+    )
+    argument_parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="rewrite files to fix COP012, COP013, COP014 and COP015 violations, then report what is left",
+    )
+    argument_parser.add_argument(
+        "--coordinator",
+        type=parse_address_argument,
+        metavar="HOST:PORT",
+        help="listen on HOST:PORT and hand the files to 'cop --worker' processes in batches, retrying failed ones",
+    )
+    argument_parser.add_argument(
+        "--local-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="with --coordinator, also start N workers on this machine",
+    )
+    argument_parser.add_argument(
+        "--worker",
+        type=parse_address_argument,
+        metavar="HOST:PORT",
+        help="check batches of files from the coordinator at HOST:PORT until it has none left",
+    )
+    argument_parser.add_argument(
+        "--lsp", action="store_true", help="run a language server speaking JSON-RPC over stdin and stdout"
+    )
+    return argument_parser
+
+
+def run_service_mode(parsed_arguments: argparse.Namespace, rule_profiles: RuleProfiles) -> int | None:
+    """Run the modes that do not report files once, returning their exit status, or None for a regular run."""
+    if parsed_arguments.worker is not None:
+        run_worker(parsed_arguments.worker, rule_profiles)
+        return 0
+    if parsed_arguments.lsp:
+        return LanguageServer(sys.stdin.buffer, sys.stdout.buffer).run_forever()
+    if parsed_arguments.watch or parsed_arguments.watch_polling:
+        run_watch_loop(
+            parsed_arguments.paths,
+            parsed_arguments.exclude,
+            rule_profiles,
+            force_polling=parsed_arguments.watch_polling,
+        )
+        return 0
+    return None
+
+
+def generate_fixed_reports(fix_outcomes: Iterable[FixOutcome]) -> Iterator[FileReport]:
+    fixed_count = 0
+    for one_outcome in fix_outcomes:
+        fixed_count += one_outcome.fixed_count
+        yield one_outcome.file_report
+    sys.stderr.write(f"Fixed {fixed_count} violations\n")
+
+
+def build_report_stream(
+    argument_parser: argparse.ArgumentParser, parsed_arguments: argparse.Namespace, rule_profiles: RuleProfiles
+) -> Iterator[FileReport]:
+    if parsed_arguments.coordinator is not None and (parsed_arguments.staged or parsed_arguments.archives):
+        argument_parser.error("--coordinator cannot be combined with --staged or --archives")
+    # Fixes are written to the working tree, which neither the index nor archives nor remote workers are
+    if parsed_arguments.fix and (
+        parsed_arguments.staged or parsed_arguments.archives or parsed_arguments.coordinator is not None
+    ):
+        argument_parser.error("--fix cannot be combined with --staged, --archives or --coordinator")
+    if parsed_arguments.staged:
+        try:
+            staged_files: typing.Final = collect_staged_files(parsed_arguments.paths, parsed_arguments.exclude)
+        except subprocess.CalledProcessError as git_error:
+            argument_parser.error(f"--staged: {git_error.stderr.decode(errors='replace').strip()}")
+        return run_staged_files(staged_files, parsed_arguments.jobs, parsed_arguments.pool, rule_profiles)
+
+    filenames: list[str] = collect_python_files(
+        parsed_arguments.paths,
+        parsed_arguments.exclude,
+        ARCHIVE_SUFFIXES if parsed_arguments.archives else LINTED_SUFFIXES,
+    )
+    recorded_costs: typing.Final = (
+        {} if parsed_arguments.cost_file is None else load_file_costs(parsed_arguments.cost_file)
+    )
+    if parsed_arguments.shard is not None:
+        filenames = extract_shard_files(filenames, parsed_arguments.shard, recorded_costs)
+    if parsed_arguments.fix:
+        return generate_fixed_reports(run_fixes(filenames, parsed_arguments.jobs, parsed_arguments.pool, rule_profiles))
+    if parsed_arguments.coordinator is not None:
+        return run_coordinator(filenames, parsed_arguments.coordinator, parsed_arguments.local_workers, rule_profiles)
+    if parsed_arguments.archives:
+        return run_archives(
+            filenames, parsed_arguments.jobs, parsed_arguments.pool, rule_profiles, parsed_arguments.exclude
+        )
+    return run_files(filenames, parsed_arguments.jobs, parsed_arguments.pool, rule_profiles, recorded_costs)
+
+
+def main(arguments: Sequence[str] | None = None) -> int:
+    argument_parser: typing.Final = build_argument_parser()
+    parsed_arguments: typing.Final = argument_parser.parse_args(arguments)
+    if parsed_arguments.update_cost_file and parsed_arguments.cost_file is None:
+        argument_parser.error("--update-cost-file requires --cost-file")
+
+    rule_profiles: typing.Final = RuleProfiles(
+        path_profiles=parsed_arguments.profiles,
+        is_generated_code_checked=parsed_arguments.check_generated,
+        naming_policy=NamingPolicy(
+            min_name_length=parsed_arguments.min_name_length,
+            short_name_exemptions=DEFAULT_NAMING_POLICY.short_name_exemptions.union(parsed_arguments.short_names),
+            verb_prefixes=DEFAULT_NAMING_POLICY.verb_prefixes.union(parsed_arguments.extra_verbs),
+        ),
+    )
+
+    service_status: typing.Final = run_service_mode(parsed_arguments, rule_profiles)
+    if service_status is not None:
+        return service_status
+
+    report_stream: typing.Final = build_report_stream(argument_parser, parsed_arguments, rule_profiles)
+    violation_statistics: typing.Final = (
+        ViolationStatistics(
+            None if parsed_arguments.code_owners is None else load_code_owners(parsed_arguments.code_owners)
+        )
+        if parsed_arguments.statistics
+        else None
+    )
+    file_reports: typing.Final = []
+    violations_count = 0
+    for one_report in report_stream:
+        # Reports are kept only for their timings; the other outputs are written as reports arrive
+        if parsed_arguments.update_cost_file:
+            file_reports.append(one_report)
+        violations_count += len(one_report.violations)
+        if violation_statistics is not None:
+            violation_statistics.record_report(one_report)
+            continue
+        for one_violation in one_report.violations:
+            sys.stdout.write(f"{one_violation.render_line()}\n")
+    if violation_statistics is not None:
+        sys.stdout.write(f"{violation_statistics.render_summary()}\n")
+
+    if parsed_arguments.update_cost_file:
+        write_file_costs(parsed_arguments.cost_file, file_reports)
+    return 1 if violations_count else 0
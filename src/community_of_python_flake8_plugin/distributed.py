@@ -0,0 +1,373 @@
+"""Distributed mode: a coordinator hands batches of files to workers connected over TCP.
+
+The coordinator splits the file list into batches and serves them to workers, one batch per worker at a
+time, as lines of JSON. Workers check their batch with the registry they loaded at start-up and answer
+with one compact line of results. A batch whose worker disconnects, sends a malformed answer or takes
+longer than the batch timeout goes back to the front of the queue for another worker; after
+``MAX_BATCH_ATTEMPTS`` failures its files are reported as E902 rather than retried forever. A file that
+cannot be checked is reported on its own by the worker, so it never costs the rest of its batch. When no
+worker is connected any more, because the local workers have all exited or none has been seen for
+``WORKER_WAIT_SECONDS``, the batches left are reported as E902 as well. Workers read the files from their
+own disk, so every machine needs the same checkout at the same path. Reports are yielded in input order as
+batches complete.
+
+A local cluster starts the coordinator on a free localhost port together with worker processes on this
+machine, which is also how the protocol is tested.
+"""
+
+from __future__ import annotations
+import collections
+import contextlib
+import json
+import multiprocessing
+import socket
+import socketserver
+import threading
+import time
+import typing
+
+from community_of_python_flake8_plugin.profiles import DEFAULT_RULE_PROFILES
+from community_of_python_flake8_plugin.runner import (
+    READ_ERROR_CODE,
+    FileReport,
+    ReportedViolation,
+    check_file,
+)
+from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+    from community_of_python_flake8_plugin.profiles import RuleProfiles
+
+
+FILES_PER_BATCH: typing.Final = 16
+MAX_BATCH_ATTEMPTS: typing.Final = 3
+BATCH_TIMEOUT_SECONDS: typing.Final = 300.0
+CONNECT_TIMEOUT_SECONDS: typing.Final = 30.0
+CONNECT_RETRY_SECONDS: typing.Final = 0.1
+WORKER_JOIN_SECONDS: typing.Final = 5.0
+# How long the coordinator waits with no worker connected before giving up on the batches left
+WORKER_WAIT_SECONDS: typing.Final = 120.0
+WORKER_POLL_SECONDS: typing.Final = 0.5
+LOCAL_HOST: typing.Final = "127.0.0.1"
+WILDCARD_HOSTS: typing.Final = frozenset({"", "0.0.0.0", "::"})  # noqa: S104
+
+
+def parse_server_address(address_text: str) -> tuple[str, int]:
+    """Read ``HOST:PORT``; an empty host listens on, or connects to, every interface."""
+    host_name, separator, port_text = address_text.rpartition(":")
+    if not separator or not port_text.isdigit():
+        raise ValueError(f"address must look like HOST:PORT, got {address_text!r}")
+    return host_name.strip("[]"), int(port_text)
+
+
+def convert_report_to_record(file_report: FileReport) -> list[typing.Any]:
+    return [
+        file_report.filename,
+        file_report.elapsed_seconds,
+        [
+            [
+                one_violation.line_number,
+                one_violation.column_number,
+                one_violation.violation_code.code,
+                one_violation.violation_code.description,
+                one_violation.cell_number,
+            ]
+            for one_violation in file_report.violations
+        ],
+    ]
+
+
+def parse_report_record(report_record: list[typing.Any]) -> FileReport:
+    filename, elapsed_seconds, violation_records = report_record
+    return FileReport(
+        filename=filename,
+        violations=tuple(
+            ReportedViolation(
+                filename=filename,
+                line_number=one_line_number,
+                column_number=one_column_number,
+                violation_code=ViolationCodeItem(code=one_code, description=one_description),
+                cell_number=one_cell_number,
+            )
+            for one_line_number, one_column_number, one_code, one_description, one_cell_number in violation_records
+        ),
+        elapsed_seconds=float(elapsed_seconds),
+    )
+
+
+def build_failed_report(filename: str, failure_reason: str) -> FileReport:
+    return FileReport(
+        filename=filename,
+        violations=(
+            ReportedViolation(
+                filename=filename,
+                line_number=1,
+                column_number=0,
+                violation_code=ViolationCodeItem(
+                    code=READ_ERROR_CODE, description=f"Cannot check file: {failure_reason}"
+                ),
+            ),
+        ),
+        elapsed_seconds=0.0,
+    )
+
+
+@typing.final
+class BatchQueue:
+    """Batches waiting for a worker, and the reports of completed ones, shared by the connection threads."""
+
+    def __init__(
+        self, filenames: Sequence[str], files_per_batch: int, max_attempts: int, worker_wait_seconds: float
+    ) -> None:
+        self.batches: typing.Final = [
+            tuple(filenames[one_start : one_start + files_per_batch])
+            for one_start in range(0, len(filenames), files_per_batch)
+        ]
+        self.max_attempts: typing.Final = max_attempts
+        self.batch_condition: typing.Final = threading.Condition()
+        self.pending_batch_ids: typing.Final = collections.deque(range(len(self.batches)))
+        self.attempt_counts: typing.Final = [0] * len(self.batches)
+        self.batch_reports: typing.Final[dict[int, list[FileReport]]] = {}
+        self.completed_batch_ids: typing.Final[set[int]] = set()
+        self.worker_wait_seconds: typing.Final = worker_wait_seconds
+        self.connected_count = 0
+        self.deserted_since = time.monotonic()
+
+    def take_batch(self) -> int | None:
+        """Wait for a batch to check; None once every batch is complete."""
+        with self.batch_condition:
+            # Batches held by other workers may still come back, so an empty queue is not the end
+            while not self.pending_batch_ids and len(self.completed_batch_ids) < len(self.batches):
+                self.batch_condition.wait()
+            return self.pending_batch_ids.popleft() if self.pending_batch_ids else None
+
+    def record_batch_reports(self, batch_id: int, file_reports: list[FileReport]) -> None:
+        with self.batch_condition:
+            # A late answer for a batch already given up on is dropped
+            if batch_id in self.completed_batch_ids:
+                return
+            self.batch_reports[batch_id] = file_reports
+            self.completed_batch_ids.add(batch_id)
+            self.batch_condition.notify_all()
+
+    def register_worker(self) -> None:
+        with self.batch_condition:
+            self.connected_count += 1
+
+    def remove_worker(self) -> None:
+        with self.batch_condition:
+            self.connected_count -= 1
+            if not self.connected_count:
+                self.deserted_since = time.monotonic()
+            self.batch_condition.notify_all()
+
+    def check_is_deserted(self, are_local_workers_gone: bool) -> bool:
+        """Tell whether no worker is left to check the remaining batches."""
+        with self.batch_condition:
+            return not self.connected_count and (
+                are_local_workers_gone or time.monotonic() - self.deserted_since >= self.worker_wait_seconds
+            )
+
+    def record_remaining_failures(self, failure_reason: str) -> None:
+        with self.batch_condition:
+            self.pending_batch_ids.clear()
+            for one_batch_id, one_batch in enumerate(self.batches):
+                self.record_batch_reports(
+                    one_batch_id, [build_failed_report(one_filename, failure_reason) for one_filename in one_batch]
+                )
+
+    def record_batch_failure(self, batch_id: int) -> None:
+        """Requeue the batch of a failed worker, or report its files once it has failed too often."""
+        with self.batch_condition:
+            self.attempt_counts[batch_id] += 1
+            if self.attempt_counts[batch_id] < self.max_attempts:
+                self.pending_batch_ids.appendleft(batch_id)
+                self.batch_condition.notify_all()
+                return
+        self.record_batch_reports(
+            batch_id,
+            [
+                build_failed_report(one_filename, f"its batch failed {self.max_attempts} times")
+                for one_filename in self.batches[batch_id]
+            ],
+        )
+
+    def wait_batch_reports(self, batch_id: int, check_local_workers_gone: Callable[[], bool]) -> list[FileReport]:
+        with self.batch_condition:
+            while batch_id not in self.batch_reports:
+                if self.check_is_deserted(check_local_workers_gone()):
+                    self.record_remaining_failures("no worker was left to check its batch")
+                    break
+                self.batch_condition.wait(timeout=WORKER_POLL_SECONDS)
+            return self.batch_reports.pop(batch_id)
+
+    def iter_reports(self, check_local_workers_gone: Callable[[], bool]) -> Iterator[FileReport]:
+        for one_batch_id in range(len(self.batches)):
+            yield from self.wait_batch_reports(one_batch_id, check_local_workers_gone)
+
+
+@typing.final
+class BatchRequestHandler(socketserver.StreamRequestHandler):
+    """Serve batches to one connected worker until the queue is done or the worker fails."""
+
+    def handle(self) -> None:  # noqa: COP007, COP009
+        coordinator_server: typing.Final = typing.cast("CoordinatorServer", self.server)
+        self.connection.settimeout(coordinator_server.batch_timeout_seconds)
+        batch_queue: typing.Final = coordinator_server.batch_queue
+        batch_queue.register_worker()
+        try:
+            self.run_batch_exchange(batch_queue)
+        finally:
+            batch_queue.remove_worker()
+
+    def run_batch_exchange(self, batch_queue: BatchQueue) -> None:
+        while (batch_id := batch_queue.take_batch()) is not None:
+            try:
+                self.wfile.write(
+                    f"{json.dumps({'batch_id': batch_id, 'filenames': batch_queue.batches[batch_id]})}\n".encode()
+                )
+                answer_line = self.rfile.readline()
+                if not answer_line:
+                    raise ConnectionResetError
+                file_reports = [parse_report_record(one_record) for one_record in json.loads(answer_line)]
+            except (OSError, ValueError, TypeError):
+                batch_queue.record_batch_failure(batch_id)
+                return
+            batch_queue.record_batch_reports(batch_id, file_reports)
+        # Every batch is complete, so a worker that is already gone has missed nothing
+        with contextlib.suppress(OSError):
+            self.wfile.write(b'{"batch_id": null}\n')
+
+
+@typing.final
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, listen_address: tuple[str, int], batch_queue: BatchQueue, batch_timeout_seconds: float) -> None:
+        self.batch_queue: typing.Final = batch_queue
+        self.batch_timeout_seconds: typing.Final = batch_timeout_seconds
+        super().__init__(listen_address, BatchRequestHandler)
+
+
+@typing.final
+class BatchCoordinator:
+    """Listen as soon as it is created, so that workers can connect before reports are requested."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        filenames: Sequence[str],
+        listen_address: tuple[str, int],
+        *,
+        files_per_batch: int = FILES_PER_BATCH,
+        max_attempts: int = MAX_BATCH_ATTEMPTS,
+        batch_timeout_seconds: float = BATCH_TIMEOUT_SECONDS,
+        worker_wait_seconds: float = WORKER_WAIT_SECONDS,
+    ) -> None:
+        self.batch_queue: typing.Final = BatchQueue(filenames, files_per_batch, max_attempts, worker_wait_seconds)
+        self.tcp_server: typing.Final = CoordinatorServer(listen_address, self.batch_queue, batch_timeout_seconds)
+
+    def fetch_server_address(self) -> tuple[str, int]:
+        host_name, port_number = self.tcp_server.server_address[:2]
+        return str(host_name), int(port_number)
+
+    def iter_reports(self, check_local_workers_gone: Callable[[], bool] = lambda: False) -> Iterator[FileReport]:
+        """Yield the reports in input order; ``check_local_workers_gone`` tells when waiting is pointless."""
+        serving_thread: typing.Final = threading.Thread(
+            target=self.tcp_server.serve_forever, name="cop-coordinator", daemon=True
+        )
+        serving_thread.start()
+        try:
+            yield from self.batch_queue.iter_reports(check_local_workers_gone)
+        finally:
+            self.tcp_server.shutdown()
+            self.tcp_server.server_close()
+
+
+def connect_to_coordinator(
+    coordinator_address: tuple[str, int], connect_timeout_seconds: float = CONNECT_TIMEOUT_SECONDS
+) -> socket.socket:
+    """Connect, retrying while the coordinator is still starting."""
+    deadline: typing.Final = time.monotonic() + connect_timeout_seconds
+    while True:
+        try:
+            return socket.create_connection(coordinator_address)
+        except OSError:  # noqa: PERF203
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(CONNECT_RETRY_SECONDS)
+
+
+def check_batch_file(filename: str, rule_profiles: RuleProfiles) -> FileReport:
+    """Check one file of a batch, reporting any failure for that file so that the rest of the batch survives."""
+    try:
+        return check_file(filename, rule_profiles)
+    except Exception as check_error:  # noqa: BLE001
+        return build_failed_report(filename, f"{type(check_error).__name__}: {check_error}")
+
+
+def run_worker(
+    coordinator_address: tuple[str, int],
+    rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES,
+    connect_timeout_seconds: float = CONNECT_TIMEOUT_SECONDS,
+) -> int:
+    """Check batches until the coordinator has none left or goes away; return the number of batches checked."""
+    checked_count = 0
+    with (
+        connect_to_coordinator(coordinator_address, connect_timeout_seconds) as coordinator_socket,
+        coordinator_socket.makefile("rb") as coordinator_reader,
+        coordinator_socket.makefile("wb") as coordinator_writer,
+    ):
+        for one_line in coordinator_reader:
+            batch_message = json.loads(one_line)
+            if batch_message["batch_id"] is None:
+                break
+            report_records = [
+                convert_report_to_record(check_batch_file(one_filename, rule_profiles))
+                for one_filename in batch_message["filenames"]
+            ]
+            coordinator_writer.write(f"{json.dumps(report_records, separators=(',', ':'))}\n".encode())
+            coordinator_writer.flush()
+            checked_count += 1
+    return checked_count
+
+
+def run_coordinator(
+    filenames: Sequence[str],
+    listen_address: tuple[str, int],
+    local_workers_count: int = 0,
+    rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES,
+    files_per_batch: int = FILES_PER_BATCH,
+) -> Iterator[FileReport]:
+    """Serve the files to remote workers and to ``local_workers_count`` worker processes started here."""
+    batch_coordinator: typing.Final = BatchCoordinator(filenames, listen_address, files_per_batch=files_per_batch)
+    host_name, port_number = batch_coordinator.fetch_server_address()
+    worker_address: typing.Final = (LOCAL_HOST if host_name in WILDCARD_HOSTS else host_name, port_number)
+    local_workers: typing.Final = [
+        multiprocessing.Process(target=run_worker, args=(worker_address, rule_profiles), daemon=True)
+        for _ in range(local_workers_count)
+    ]
+    for one_worker in local_workers:
+        one_worker.start()
+    try:
+        yield from batch_coordinator.iter_reports(
+            lambda: bool(local_workers) and not any(one_worker.is_alive() for one_worker in local_workers)
+        )
+    finally:
+        for one_worker in local_workers:
+            # Workers leave on their own once told there is nothing left; after an early stop they are ended
+            one_worker.join(timeout=WORKER_JOIN_SECONDS)
+            one_worker.terminate()
+
+
+def run_local_cluster(
+    filenames: Sequence[str],
+    workers_count: int,
+    rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES,
+    files_per_batch: int = FILES_PER_BATCH,
+) -> Iterator[FileReport]:
+    """Run the coordinator on a free localhost port with ``workers_count`` local worker processes."""
+    return run_coordinator(filenames, (LOCAL_HOST, 0), workers_count, rule_profiles, files_per_batch)
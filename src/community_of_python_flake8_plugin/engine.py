@@ -0,0 +1,241 @@
+from __future__ import annotations
+import dataclasses
+import functools
+import importlib
+import importlib.metadata
+import inspect
+import pkgutil
+import typing
+
+import community_of_python_flake8_plugin.checks as checks_module
+from community_of_python_flake8_plugin.capabilities import FileCapabilities
+from community_of_python_flake8_plugin.traversal import build_descent_plan
+
+
+if typing.TYPE_CHECKING:
+    import ast
+    from collections.abc import Callable, Iterable, Mapping, Sequence
+
+    from community_of_python_flake8_plugin.memory_profile import MemoryProfiler
+    from community_of_python_flake8_plugin.traversal import DescentPlan
+    from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+    from community_of_python_flake8_plugin.violations import Violation
+
+
+CHECKS_ENTRY_POINT_GROUP: typing.Final = "community_of_python_flake8_plugin.checks"
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class CheckContext:
+    """The file being checked, as the shared checks see it; ``violations`` collects the results of every check."""
+
+    syntax_tree: ast.AST
+    violations: list[Violation] = dataclasses.field(default_factory=list)
+
+
+class PluginCheckProtocol(typing.Protocol):
+    """Contract shared by built-in checks and checks registered by rule packs.
+
+    A check is instantiated once per process and shared by every file and thread, so it keeps no state
+    between calls. The engine walks every tree once and calls ``visit_<NodeType>(node, check_context)`` on
+    each check for the node types listed in ``handled_node_types``; the context holds the tree being checked
+    and the violations found in it. Handlers must not descend into children themselves.
+    Subtrees that cannot contain a handled node type, such as expressions under statement handlers, are skipped.
+    A check is not run for files that contain none of its ``required_node_types``.
+    """
+
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]]
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]]
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]]
+
+    def __init__(self) -> None: ...
+
+
+class PerFileCheckProtocol(typing.Protocol):
+    """Earlier contract, still accepted from rule packs: a check instantiated for every file with its tree.
+
+    Its ``visit_<NodeType>(node)`` handlers collect violations in its own ``violations`` list.
+    """
+
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]]
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]]
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]]
+    violations: list[Violation]
+
+    def __init__(self, tree: ast.AST) -> None: ...  # noqa: COP006
+
+
+CheckClass: typing.TypeAlias = "type[PluginCheckProtocol | PerFileCheckProtocol]"
+NodeHandler: typing.TypeAlias = "Callable[[ast.AST, CheckContext], None]"
+
+
+def validate_check_class(check_class: object) -> CheckClass:
+    if not isinstance(check_class, type):
+        raise TypeError(f"COP check {check_class!r} must be a class")
+    for one_attribute_name in ("required_node_types", "handled_node_types", "violation_codes"):
+        if not isinstance(getattr(check_class, one_attribute_name, None), frozenset):
+            raise TypeError(f"COP check {check_class.__name__} must declare {one_attribute_name} as a frozenset")
+    for one_node_type in typing.cast("CheckClass", check_class).handled_node_types:
+        if not callable(getattr(check_class, f"visit_{one_node_type.__name__}", None)):
+            raise TypeError(f"COP check {check_class.__name__} handles {one_node_type.__name__} without a handler")
+    return typing.cast("CheckClass", check_class)
+
+
+def collect_builtin_check_classes() -> list[CheckClass]:
+    check_classes: typing.Final[list[CheckClass]] = []
+    for _, one_module_name, _ in pkgutil.iter_modules(checks_module.__path__):
+        imported_module = importlib.import_module(f"{checks_module.__name__}.{one_module_name}")
+
+        for one_attribute_name in dir(imported_module):
+            attribute = getattr(imported_module, one_attribute_name)
+            if (
+                isinstance(attribute, type)
+                and one_attribute_name.endswith("Check")
+                and hasattr(attribute, "handled_node_types")
+            ):
+                check_classes.append(validate_check_class(attribute))
+    return check_classes
+
+
+def collect_entry_point_check_classes() -> list[type[PluginCheckProtocol]]:
+    """Load checks from rule packs; an entry point may name a check class or an iterable of them."""
+    check_classes: typing.Final[list[type[PluginCheckProtocol]]] = []
+    for one_entry_point in importlib.metadata.entry_points(group=CHECKS_ENTRY_POINT_GROUP):
+        loaded_object = one_entry_point.load()
+        if isinstance(loaded_object, type):
+            check_classes.append(validate_check_class(loaded_object))
+        else:
+            check_classes.extend(validate_check_class(one_check_class) for one_check_class in loaded_object)
+    return check_classes
+
+
+@functools.cache
+def collect_check_classes() -> tuple[CheckClass, ...]:
+    return (*collect_builtin_check_classes(), *collect_entry_point_check_classes())
+
+
+def check_is_per_file_check(check_class: CheckClass) -> typing.TypeGuard[type[PerFileCheckProtocol]]:
+    # Checks written for the earlier contract take the tree in their constructor
+    return bool(inspect.signature(check_class).parameters)
+
+
+@functools.cache
+def fetch_shared_check(check_class: type[PluginCheckProtocol]) -> PluginCheckProtocol:
+    return check_class()
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class CheckDispatch:
+    """Handlers of a set of checks, resolved once and reused by every file that runs the same set."""
+
+    shared_handlers: dict[type[ast.AST], tuple[NodeHandler, ...]]
+    per_file_check_classes: tuple[type[PerFileCheckProtocol], ...]
+    descent_plan: DescentPlan
+
+
+@functools.cache
+def fetch_check_dispatch(check_classes: tuple[CheckClass, ...]) -> CheckDispatch:
+    shared_handlers: typing.Final[dict[type[ast.AST], list[NodeHandler]]] = {}
+    per_file_check_classes: typing.Final[list[type[PerFileCheckProtocol]]] = []
+    for one_check_class in check_classes:
+        if check_is_per_file_check(one_check_class):
+            per_file_check_classes.append(one_check_class)
+            continue
+        shared_check = fetch_shared_check(one_check_class)
+        for one_node_type in one_check_class.handled_node_types:
+            shared_handlers.setdefault(one_node_type, []).append(
+                getattr(shared_check, f"visit_{one_node_type.__name__}")
+            )
+    return CheckDispatch(
+        shared_handlers={one_node_type: tuple(one_handlers) for one_node_type, one_handlers in shared_handlers.items()},
+        per_file_check_classes=tuple(per_file_check_classes),
+        descent_plan=build_descent_plan(
+            frozenset().union(*(one_check_class.handled_node_types for one_check_class in check_classes))
+        ),
+    )
+
+
+def wrap_per_file_handler(node_handler: Callable[[ast.AST], None]) -> NodeHandler:
+    def handle_node(ast_node: ast.AST, check_context: CheckContext) -> None:  # noqa: ARG001
+        node_handler(ast_node)
+
+    return handle_node
+
+
+def build_dispatch_table(
+    check_dispatch: CheckDispatch, per_file_checks: Sequence[PerFileCheckProtocol]
+) -> Mapping[type[ast.AST], Sequence[NodeHandler]]:
+    """Add the handlers of this file's per-file checks to the shared ones, which are used as they are otherwise."""
+    if not per_file_checks:
+        return check_dispatch.shared_handlers
+    dispatch_table: typing.Final = {
+        one_node_type: list(one_handlers) for one_node_type, one_handlers in check_dispatch.shared_handlers.items()
+    }
+    for one_check in per_file_checks:
+        for one_node_type in one_check.handled_node_types:
+            dispatch_table.setdefault(one_node_type, []).append(
+                wrap_per_file_handler(getattr(one_check, f"visit_{one_node_type.__name__}"))
+            )
+    return dispatch_table
+
+
+def visit_tree(
+    syntax_tree: ast.AST,
+    dispatch_table: Mapping[type[ast.AST], Sequence[NodeHandler]],
+    descent_plan: DescentPlan,
+    check_context: CheckContext,
+) -> None:
+    # Subtrees that cannot contain a handled node type, such as the expressions below statement handlers, are skipped
+    pending_nodes: typing.Final = [syntax_tree]
+    while pending_nodes:
+        current_node = pending_nodes.pop()
+        for one_handler in dispatch_table.get(type(current_node), ()):
+            one_handler(current_node, check_context)
+        pending_nodes.extend(descent_plan.iter_child_nodes(current_node))
+
+
+def run_traversal(syntax_tree: ast.AST, check_classes: tuple[CheckClass, ...], check_context: CheckContext) -> None:
+    check_dispatch: typing.Final = fetch_check_dispatch(check_classes)
+    per_file_checks: typing.Final = [
+        one_check_class(syntax_tree) for one_check_class in check_dispatch.per_file_check_classes
+    ]
+    visit_tree(
+        syntax_tree,
+        build_dispatch_table(check_dispatch, per_file_checks),
+        check_dispatch.descent_plan,
+        check_context,
+    )
+    for one_check in per_file_checks:
+        check_context.violations.extend(one_check.violations)
+
+
+def run_checks(
+    syntax_tree: ast.AST,
+    check_classes: Iterable[CheckClass],
+    memory_profiler: MemoryProfiler | None = None,
+) -> list[Violation]:
+    """Run the checks that can fire on this tree, sharing a single traversal between them, and return their violations.
+
+    With a memory profiler every check gets its own traversal, so that allocations are attributed to it.
+    """
+    all_check_classes: typing.Final = tuple(check_classes)
+    file_capabilities: typing.Final = FileCapabilities.collect_from_tree(
+        syntax_tree,
+        frozenset().union(*(one_check_class.required_node_types for one_check_class in all_check_classes)),
+    )
+    active_check_classes: typing.Final = tuple(
+        one_check_class
+        for one_check_class in all_check_classes
+        if file_capabilities.has_any_node_type(one_check_class.required_node_types)
+    )
+    check_context: typing.Final = CheckContext(syntax_tree=syntax_tree)
+    if memory_profiler is None:
+        run_traversal(syntax_tree, active_check_classes, check_context)
+        return check_context.violations
+
+    for one_check_class in active_check_classes:
+        with memory_profiler.measure_check(one_check_class.__name__):
+            run_traversal(syntax_tree, (one_check_class,), check_context)
+    return check_context.violations
@@ -0,0 +1,516 @@
+"""Fix mode: rewrite the mechanically fixable COP violations in place.
+
+Every file is checked once, and each reported COP012, COP013, COP014 or COP015 violation is turned into
+text edits at the positions of the nodes it was reported on. The edits of a violation form one group that
+is applied in full or not at all: a group overlapping an edit accepted earlier is left out, and the
+violation stays reported. All accepted edits are then spliced into the source in a single pass, and the
+file is written once, in its own encoding and line endings, only if the result still parses.
+Violations suppressed with ``# noqa`` or turned off by a path profile are not fixed.
+
+Loop variables are renamed everywhere in the scope that binds them, including nested functions that
+read them. A rename is skipped when the name is also bound in some other way in that scope, such as by
+an assignment, an argument, an import or a ``global`` statement, or when the new name is already used
+in the module, as the result could then change meaning.
+"""
+
+from __future__ import annotations
+import ast
+import bisect
+import dataclasses
+import functools
+import io
+import itertools
+import pathlib
+import time
+import tokenize
+import typing
+
+from community_of_python_flake8_plugin.checks.dataclass_config import is_dataclass_decorator
+from community_of_python_flake8_plugin.engine import collect_check_classes
+from community_of_python_flake8_plugin.lsp import extract_first_line
+from community_of_python_flake8_plugin.notebooks import NOTEBOOK_SUFFIX
+from community_of_python_flake8_plugin.profiles import DEFAULT_RULE_PROFILES, fetch_profile_matcher
+from community_of_python_flake8_plugin.runner import (
+    FILES_PER_CHUNK,
+    FileReport,
+    build_decode_error_violation,
+    build_read_error_report,
+    build_syntax_error_violation,
+    build_worker_pool,
+    check_file,
+    check_syntax_tree,
+)
+from community_of_python_flake8_plugin.violation_codes import ViolationCodes
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+
+    from community_of_python_flake8_plugin.profiles import RuleProfiles
+    from community_of_python_flake8_plugin.runner import ReportedViolation
+
+
+LOOP_VARIABLE_PREFIX: typing.Final = "one_"
+REQUIRED_DATACLASS_KEYWORDS: typing.Final = ("kw_only", "slots", "frozen")
+COMPREHENSION_TYPES: typing.Final = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+SCOPE_TYPES: typing.Final = (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, *COMPREHENSION_TYPES)
+# Node fields that bind a name given as a string rather than as an ast.Name
+BINDING_NAME_FIELDS: typing.Final = ("name", "arg", "asname", "rest")
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class TextEdit:
+    # Positions are (line number, UTF-8 column), as in ast nodes
+    start_position: tuple[int, int]
+    end_position: tuple[int, int]
+    replacement_text: str
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class FixedSource:
+    source_text: str
+    fixed_count: int
+    # What is still reported for the fixed source
+    violations: list[ReportedViolation]
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class FixOutcome:
+    file_report: FileReport
+    fixed_count: int
+
+
+def build_node_replacement(ast_node: ast.expr, replacement_text: str) -> TextEdit:
+    return TextEdit(
+        start_position=(ast_node.lineno, ast_node.col_offset),
+        end_position=(ast_node.end_lineno or ast_node.lineno, ast_node.end_col_offset or ast_node.col_offset),
+        replacement_text=replacement_text,
+    )
+
+
+def build_insertion(insert_position: tuple[int, int], inserted_text: str) -> TextEdit:
+    return TextEdit(start_position=insert_position, end_position=insert_position, replacement_text=inserted_text)
+
+
+def check_is_true_constant(expression: ast.expr) -> bool:
+    return isinstance(expression, ast.Constant) and expression.value is True
+
+
+def build_keywords_insertion(call_node: ast.Call, keywords_text: str) -> TextEdit:
+    """Append keyword arguments after the last argument of a call, which keeps a trailing comma valid."""
+    call_arguments: typing.Final[list[ast.expr | ast.keyword]] = [*call_node.args, *call_node.keywords]
+    if not call_arguments:
+        # Just before the closing parenthesis
+        return build_insertion((call_node.end_lineno or 0, (call_node.end_col_offset or 1) - 1), keywords_text)
+    last_argument: typing.Final = max(
+        call_arguments, key=lambda one_argument: (one_argument.end_lineno or 0, one_argument.end_col_offset or 0)
+    )
+    return build_insertion((last_argument.end_lineno or 0, last_argument.end_col_offset or 0), f", {keywords_text}")
+
+
+def collect_bound_identifiers(ast_node: ast.AST) -> Iterator[str]:
+    """Yield the names a node binds other than through ``ast.Name``, such as arguments, imports and definitions."""
+    if isinstance(ast_node, ast.keyword):
+        return
+    if isinstance(ast_node, (ast.Global, ast.Nonlocal)):
+        yield from ast_node.names
+    elif isinstance(ast_node, ast.alias) and ast_node.asname is None:
+        yield ast_node.name.partition(".")[0]
+    for one_field_name in BINDING_NAME_FIELDS:
+        field_value = getattr(ast_node, one_field_name, None)
+        if isinstance(field_value, str):
+            yield field_value
+
+
+def collect_scope_roots(scope_node: ast.AST) -> list[ast.AST]:
+    """List the subtrees in which the names bound by a scope are visible."""
+    if isinstance(scope_node, COMPREHENSION_TYPES):
+        # The first iterable is evaluated in the enclosing scope
+        first_generator: typing.Final = scope_node.generators[0]
+        return [one_child for one_child in ast.iter_child_nodes(scope_node) if one_child is not first_generator] + [
+            first_generator.target,
+            *first_generator.ifs,
+        ]
+    if isinstance(scope_node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return list(scope_node.body)
+    if isinstance(scope_node, ast.Lambda):
+        return [scope_node.body]
+    return [scope_node]
+
+
+@typing.final
+class SourceFixer:
+    """Edits for the fixable violations of one parsed source, computed from the nodes they were reported on."""
+
+    def __init__(self, syntax_tree: ast.Module, source_text: str) -> None:
+        self.syntax_tree: typing.Final = syntax_tree
+        self.source_lines: typing.Final = io.StringIO(source_text, newline="").readlines()
+        self.line_ending: typing.Final = "\r\n" if self.source_lines and self.source_lines[0].endswith("\r\n") else "\n"
+        self.line_starts: typing.Final = list(
+            itertools.accumulate((len(one_line) for one_line in self.source_lines), initial=0)
+        )
+        self.positioned_nodes: typing.Final[dict[tuple[int, int], list[ast.AST]]] = {}
+        self.parent_nodes: typing.Final[dict[ast.AST, ast.AST]] = {}
+        for one_node in ast.walk(syntax_tree):
+            if isinstance(one_node, (ast.ClassDef, ast.Assign, ast.AnnAssign, ast.Name)):
+                self.positioned_nodes.setdefault((one_node.lineno, one_node.col_offset), []).append(one_node)
+            for one_child in ast.iter_child_nodes(one_node):
+                self.parent_nodes[one_child] = one_node
+        # Module names by the text of the import insertions built for them
+        self.imported_modules: typing.Final[dict[str, str]] = {}
+        self.edit_builders: typing.Final[dict[str, Callable[[ast.AST], list[TextEdit] | None]]] = {
+            ViolationCodes.FINAL_CLASS.code: self.build_final_class_edits,
+            ViolationCodes.MAPPING_PROXY.code: self.build_mapping_proxy_edits,
+            ViolationCodes.DATACLASS_CONFIG.code: self.build_dataclass_edits,
+            ViolationCodes.FOR_LOOP_VARIABLE_PREFIX.code: self.build_loop_variable_edits,
+        }
+
+    @functools.cached_property
+    def module_identifiers(self) -> frozenset[str]:
+        return frozenset(
+            itertools.chain.from_iterable(
+                [one_node.id] if isinstance(one_node, ast.Name) else collect_bound_identifiers(one_node)
+                for one_node in ast.walk(self.syntax_tree)
+            )
+        )
+
+    def convert_to_offset(self, text_position: tuple[int, int]) -> int:
+        line_number, byte_column = text_position
+        if line_number > len(self.source_lines):
+            return self.line_starts[-1]
+        return self.line_starts[line_number - 1] + len(
+            self.source_lines[line_number - 1].encode()[:byte_column].decode(errors="replace")
+        )
+
+    def find_reported_node(self, reported_violation: ReportedViolation, node_type: type[ast.AST]) -> ast.AST | None:
+        return next(
+            (
+                one_node
+                for one_node in self.positioned_nodes.get(
+                    (reported_violation.line_number, reported_violation.column_number), ()
+                )
+                if isinstance(one_node, node_type)
+            ),
+            None,
+        )
+
+    def build_import_edits(self, module_name: str) -> list[TextEdit]:
+        """Import a module at the top of the file unless it is, in order among the leading ``import`` statements."""
+        module_body: typing.Final = self.syntax_tree.body
+        if any(
+            isinstance(one_statement, ast.Import)
+            and any(one_alias.name == module_name and one_alias.asname is None for one_alias in one_statement.names)
+            for one_statement in module_body
+        ):
+            return []
+        # After the docstring, __future__ imports and the plain imports sorting before the module, if any
+        insert_line = 0
+        for one_index, one_statement in enumerate(module_body):
+            is_docstring = (
+                one_index == 0
+                and isinstance(one_statement, ast.Expr)
+                and isinstance(one_statement.value, ast.Constant)
+                and isinstance(one_statement.value.value, str)
+            )
+            is_preceding = (isinstance(one_statement, ast.ImportFrom) and one_statement.module == "__future__") or (
+                isinstance(one_statement, ast.Import) and one_statement.names[0].name < module_name
+            )
+            if not (is_docstring or is_preceding):
+                insert_line = insert_line or extract_first_line(one_statement)
+                break
+            insert_line = (one_statement.end_lineno or one_statement.lineno) + 1
+        is_line_open: typing.Final = (
+            insert_line > len(self.source_lines)
+            and bool(self.source_lines)
+            and not self.source_lines[-1].endswith(("\n", "\r"))
+        )
+        import_text: typing.Final = f"{self.line_ending if is_line_open else ''}import {module_name}{self.line_ending}"
+        self.imported_modules[import_text] = module_name
+        return [build_insertion((insert_line or 1, 0), import_text)]
+
+    def build_final_class_edits(self, class_node: ast.AST) -> list[TextEdit] | None:
+        if not isinstance(class_node, ast.ClassDef):
+            return None
+        first_line: typing.Final = extract_first_line(class_node)
+        first_line_text: typing.Final = self.source_lines[first_line - 1]
+        indentation: typing.Final = first_line_text[: len(first_line_text) - len(first_line_text.lstrip(" \t"))]
+        return [
+            *self.build_import_edits("typing"),
+            build_insertion((first_line, 0), f"{indentation}@typing.final{self.line_ending}"),
+        ]
+
+    def build_mapping_proxy_edits(self, statement_node: ast.AST) -> list[TextEdit] | None:
+        if not isinstance(statement_node, (ast.Assign, ast.AnnAssign)) or statement_node.value is None:
+            return None
+        assigned_value: typing.Final = statement_node.value
+        annotation_edits: typing.Final = []
+        if isinstance(statement_node, ast.AnnAssign):
+            dict_annotation: typing.Final = next(
+                (
+                    one_node
+                    for one_node in ast.walk(statement_node.annotation)
+                    if (isinstance(one_node, ast.Name) and one_node.id == "dict")
+                    or (isinstance(one_node, ast.Attribute) and one_node.attr == "dict")
+                ),
+                None,
+            )
+            if dict_annotation is None:
+                return None
+            annotation_edits.append(build_node_replacement(dict_annotation, "types.MappingProxyType"))
+        return [
+            *self.build_import_edits("types"),
+            *annotation_edits,
+            build_insertion((assigned_value.lineno, assigned_value.col_offset), "types.MappingProxyType("),
+            build_insertion((assigned_value.end_lineno or 0, assigned_value.end_col_offset or 0), ")"),
+        ]
+
+    def build_dataclass_edits(self, class_node: ast.AST) -> list[TextEdit] | None:
+        decorator: typing.Final = (
+            next(
+                (one_decorator for one_decorator in class_node.decorator_list if is_dataclass_decorator(one_decorator)),
+                None,
+            )
+            if isinstance(class_node, ast.ClassDef)
+            else None
+        )
+        if decorator is None:
+            return None
+        if not isinstance(decorator, ast.Call):
+            return [
+                build_insertion(
+                    (decorator.end_lineno or 0, decorator.end_col_offset or 0),
+                    f"({', '.join(f'{one_name}=True' for one_name in REQUIRED_DATACLASS_KEYWORDS)})",
+                )
+            ]
+        # Keywords unpacked from a mapping may already set some of them
+        if any(one_keyword.arg is None for one_keyword in decorator.keywords):
+            return None
+        given_keywords: typing.Final = {one_keyword.arg: one_keyword.value for one_keyword in decorator.keywords}
+        decorator_edits: typing.Final = [
+            build_node_replacement(given_keywords[one_name], "True")
+            for one_name in REQUIRED_DATACLASS_KEYWORDS
+            if one_name in given_keywords and not check_is_true_constant(given_keywords[one_name])
+        ]
+        missing_keywords_text: typing.Final = ", ".join(
+            f"{one_name}=True" for one_name in REQUIRED_DATACLASS_KEYWORDS if one_name not in given_keywords
+        )
+        if missing_keywords_text:
+            decorator_edits.append(build_keywords_insertion(decorator, missing_keywords_text))
+        return decorator_edits
+
+    def find_binding_scope(self, target_node: ast.AST) -> ast.AST | None:
+        current_node = target_node
+        while current_node in self.parent_nodes:
+            parent_node = self.parent_nodes[current_node]
+            if isinstance(parent_node, ast.comprehension):
+                return self.parent_nodes[parent_node]
+            if isinstance(parent_node, SCOPE_TYPES):
+                return parent_node
+            # Class bodies are scopes that nested functions do not see, so their loops are left alone
+            if isinstance(parent_node, ast.ClassDef):
+                return None
+            current_node = parent_node
+        return None
+
+    def check_prints_identifier(self, ast_node: ast.AST, identifier: str) -> bool:
+        """Tell a self-documenting f-string field, such as ``f"{item=}"``, that prints the identifier as written."""
+        if not isinstance(ast_node, ast.FormattedValue) or not any(
+            isinstance(one_name, ast.Name) and one_name.id == identifier for one_name in ast.walk(ast_node.value)
+        ):
+            return False
+        value_node: typing.Final = ast_node.value
+        if value_node.end_lineno is None or value_node.end_col_offset is None:
+            return False
+        # The field ends with ``=`` right after its expression
+        return (
+            self.source_lines[value_node.end_lineno - 1]
+            .encode()[value_node.end_col_offset :]
+            .decode(errors="replace")
+            .lstrip()
+            .startswith("=")
+        )
+
+    def build_loop_variable_edits(self, target_node: ast.AST) -> list[TextEdit] | None:
+        if not isinstance(target_node, ast.Name):
+            return None
+        identifier: typing.Final = target_node.id
+        prefixed_identifier: typing.Final = f"{LOOP_VARIABLE_PREFIX}{identifier}"
+        scope_node: typing.Final = self.find_binding_scope(target_node)
+        # Module-level loop variables can be imported or read by other modules, which the rename does not reach
+        if scope_node is None or isinstance(scope_node, ast.Module) or prefixed_identifier in self.module_identifiers:
+            return None
+        if isinstance(scope_node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)) and identifier in {
+            one_argument.arg for one_argument in ast.walk(scope_node.args) if isinstance(one_argument, ast.arg)
+        }:
+            return None
+        scope_nodes: typing.Final = [
+            one_node for one_root in collect_scope_roots(scope_node) for one_node in ast.walk(one_root)
+        ]
+        # The generators of a comprehension scope are its own loops, even if collect_scope_roots splits them up
+        loop_targets: typing.Final = {
+            id(one_name)
+            for one_node in ast.walk(scope_node)
+            if isinstance(one_node, (ast.For, ast.AsyncFor, ast.comprehension))
+            for one_name in ast.walk(one_node.target)
+        }
+        renamed_names: typing.Final = []
+        for one_node in scope_nodes:
+            if identifier in collect_bound_identifiers(one_node) or self.check_prints_identifier(one_node, identifier):
+                return None
+            if isinstance(one_node, ast.Name) and one_node.id == identifier:
+                if not isinstance(one_node.ctx, ast.Load) and id(one_node) not in loop_targets:
+                    return None
+                renamed_names.append(one_node)
+        return [build_node_replacement(one_name, prefixed_identifier) for one_name in renamed_names]
+
+    def build_violation_edits(self, reported_violation: ReportedViolation) -> list[TextEdit] | None:
+        violation_code: typing.Final = reported_violation.violation_code.code
+        if violation_code not in self.edit_builders:
+            return None
+        node_type: typing.Final = {
+            ViolationCodes.MAPPING_PROXY.code: ast.stmt,
+            ViolationCodes.FOR_LOOP_VARIABLE_PREFIX.code: ast.Name,
+        }.get(violation_code, ast.ClassDef)
+        reported_node: typing.Final = self.find_reported_node(reported_violation, node_type)
+        return None if reported_node is None else self.edit_builders[violation_code](reported_node)
+
+    def apply_violation_fixes(self, violations: Iterable[ReportedViolation]) -> tuple[str, int]:
+        """Splice in the edits of every violation whose edits do not overlap those accepted before."""
+        accepted_edits: typing.Final[dict[tuple[int, int, str], int]] = {}
+        # Sorted, non-overlapping character ranges of the accepted replacements; insertions only need a free point
+        replaced_starts: typing.Final[list[int]] = []
+        replaced_ends: typing.Final[list[int]] = []
+        fixed_count = 0
+        for one_violation in violations:
+            violation_edits = self.build_violation_edits(one_violation)
+            if violation_edits is None:
+                continue
+            offset_edits = [
+                (
+                    self.convert_to_offset(one_edit.start_position),
+                    self.convert_to_offset(one_edit.end_position),
+                    one_edit.replacement_text,
+                )
+                for one_edit in violation_edits
+            ]
+            new_edits = [one_edit for one_edit in dict.fromkeys(offset_edits) if one_edit not in accepted_edits]
+            if any(
+                self.check_overlaps(one_start_offset, one_end_offset, replaced_starts, replaced_ends)
+                for one_start_offset, one_end_offset, _ in new_edits
+            ):
+                continue
+            for one_edit in new_edits:
+                accepted_edits[one_edit] = len(accepted_edits)
+                if one_edit[1] > one_edit[0]:
+                    insert_index = bisect.bisect_left(replaced_starts, one_edit[0])
+                    replaced_starts.insert(insert_index, one_edit[0])
+                    replaced_ends.insert(insert_index, one_edit[1])
+            fixed_count += 1
+        source_text: typing.Final = "".join(self.source_lines)
+        fixed_parts: typing.Final[list[str]] = []
+        copied_until = 0
+        # Insertions at a point go before a replacement starting there: imports first, sorted as isort would,
+        # since each was placed against the original module, then the others in the order they were accepted
+        for one_start_offset, one_end_offset, one_text in sorted(
+            accepted_edits,
+            key=lambda one_edit: (
+                one_edit[0],
+                one_edit[1] > one_edit[0],
+                one_edit[2] not in self.imported_modules,
+                self.imported_modules.get(one_edit[2], ""),
+                accepted_edits[one_edit],
+            ),
+        ):
+            fixed_parts.extend((source_text[copied_until:one_start_offset], one_text))
+            copied_until = max(copied_until, one_end_offset)
+        fixed_parts.append(source_text[copied_until:])
+        return "".join(fixed_parts), fixed_count
+
+    @staticmethod
+    def check_overlaps(edit_start: int, edit_end: int, replaced_starts: list[int], replaced_ends: list[int]) -> bool:
+        following_index: typing.Final = bisect.bisect_right(replaced_starts, edit_start)
+        # The closest replacement starting at or before the edit must end before the edit, or at its point
+        if following_index and replaced_ends[following_index - 1] > edit_start:
+            return edit_end > edit_start or replaced_starts[following_index - 1] < edit_start
+        return following_index < len(replaced_starts) and replaced_starts[following_index] < edit_end
+
+
+def fix_source(source_text: str, filename: str, rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES) -> FixedSource:
+    source_lines: typing.Final = source_text.splitlines()
+    file_rules: typing.Final = fetch_profile_matcher(rule_profiles).resolve_file_rules(filename, source_lines)
+    if not file_rules.check_classes:
+        return FixedSource(source_text=source_text, fixed_count=0, violations=[])
+    try:
+        syntax_tree: typing.Final = ast.parse(source_text, filename=filename)
+    except SyntaxError as syntax_error:
+        return FixedSource(
+            source_text=source_text, fixed_count=0, violations=[build_syntax_error_violation(syntax_error, filename)]
+        )
+    reported_violations: typing.Final = check_syntax_tree(syntax_tree, filename, source_lines, file_rules)
+    fixed_text, fixed_count = SourceFixer(syntax_tree, source_text).apply_violation_fixes(reported_violations)
+    if not fixed_count:
+        return FixedSource(source_text=source_text, fixed_count=0, violations=reported_violations)
+    try:
+        fixed_tree: typing.Final = ast.parse(fixed_text, filename=filename)
+    except SyntaxError:
+        # A fix that breaks the module is a bug in the fixer; the file is left as it was
+        return FixedSource(source_text=source_text, fixed_count=0, violations=reported_violations)
+    return FixedSource(
+        source_text=fixed_text,
+        fixed_count=fixed_count,
+        violations=check_syntax_tree(fixed_tree, filename, fixed_text.splitlines(), file_rules),
+    )
+
+
+def fix_file(filename: str, rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES) -> FixOutcome:
+    """Fix a file in place with one write, reporting what is left and how many violations were fixed."""
+    if filename.endswith(NOTEBOOK_SUFFIX):
+        return FixOutcome(file_report=check_file(filename, rule_profiles), fixed_count=0)
+    collect_check_classes()
+    started_at: typing.Final = time.perf_counter()
+    file_path: typing.Final = pathlib.Path(filename)
+    try:
+        source_bytes: typing.Final = file_path.read_bytes()
+    except OSError as read_error:
+        return FixOutcome(file_report=build_read_error_report(filename, read_error), fixed_count=0)
+    try:
+        source_encoding, _ = tokenize.detect_encoding(io.BytesIO(source_bytes).readline)
+        source_text: typing.Final = source_bytes.decode(source_encoding)
+    except (SyntaxError, UnicodeDecodeError) as decode_error:
+        return FixOutcome(
+            file_report=FileReport(
+                filename=filename,
+                violations=(build_decode_error_violation(decode_error, filename),),
+                elapsed_seconds=time.perf_counter() - started_at,
+            ),
+            fixed_count=0,
+        )
+    fixed_source: typing.Final = fix_source(source_text, filename, rule_profiles)
+    if fixed_source.fixed_count:
+        file_path.write_bytes(fixed_source.source_text.encode(source_encoding))
+    return FixOutcome(
+        file_report=FileReport(
+            filename=filename,
+            violations=tuple(fixed_source.violations),
+            elapsed_seconds=time.perf_counter() - started_at,
+        ),
+        fixed_count=fixed_source.fixed_count,
+    )
+
+
+def run_fixes(
+    filenames: Sequence[str],
+    jobs_count: int = 1,
+    pool_kind: str = "process",
+    rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES,
+) -> Iterator[FixOutcome]:
+    """Fix files, in a pool of ``pool_kind`` workers when more than one job is requested, in input order."""
+    fix_profiled_file: typing.Final = functools.partial(fix_file, rule_profiles=rule_profiles)
+    if jobs_count <= 1 or len(filenames) <= 1:
+        yield from map(fix_profiled_file, filenames)
+        return
+    with build_worker_pool(pool_kind, jobs_count) as worker_pool:
+        yield from worker_pool.map(fix_profiled_file, filenames, chunksize=FILES_PER_CHUNK)
@@ -0,0 +1,387 @@
+"""Language server publishing COP diagnostics over JSON-RPC on stdio.
+
+Messages are read on the calling thread while analysis runs on a single worker thread after a
+debounce delay, so editing never waits for diagnostics. Every document keeps the results of its
+top-level statements keyed by their source text; after an edit the whole document is parsed again,
+but only the statements whose text changed are checked. Checks on those statements see the
+module-wide facts of the whole document, and a change to those facts drops the cached results.
+"""
+
+from __future__ import annotations
+import ast
+import bisect
+import concurrent.futures
+import contextlib
+import json
+import re
+import threading
+import typing
+import urllib.parse
+
+from community_of_python_flake8_plugin.engine import collect_check_classes, run_checks
+from community_of_python_flake8_plugin.module_facts import ModuleFacts, register_module_facts
+from community_of_python_flake8_plugin.plugin import CommunityOfPythonFlake8Plugin
+from community_of_python_flake8_plugin.profiles import DEFAULT_RULE_PROFILES, fetch_profile_matcher
+from community_of_python_flake8_plugin.runner import build_reported_violations, build_syntax_error_violation
+from community_of_python_flake8_plugin.violations import Violation
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from community_of_python_flake8_plugin.runner import ReportedViolation
+
+
+DEBOUNCE_SECONDS: typing.Final = 0.25
+TEXT_DOCUMENT_SYNC_INCREMENTAL: typing.Final = 2
+DIAGNOSTIC_SEVERITY_WARNING: typing.Final = 2
+METHOD_NOT_FOUND_ERROR: typing.Final = -32601
+DIAGNOSTIC_WORD_PATTERN: typing.Final = re.compile(r"\w+")
+
+
+def extract_first_line(statement_node: ast.stmt) -> int:
+    # Decorators belong to the statement they decorate, and come before its own line
+    if isinstance(statement_node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return min([statement_node.lineno, *(one_decorator.lineno for one_decorator in statement_node.decorator_list)])
+    return statement_node.lineno
+
+
+@typing.final
+class DocumentAnalyzer:
+    """Per-document cache of check results for top-level statements."""
+
+    def __init__(self) -> None:
+        self.module_facts: ModuleFacts | None = None
+        self.statement_results: dict[str, tuple[Violation, ...]] = {}
+        self.checked_statements_count = 0
+
+    def check_statements(
+        self, statement_items: list[tuple[tuple[int, int], ast.stmt, str]], module_facts: ModuleFacts
+    ) -> dict[str, tuple[Violation, ...]]:
+        """Check the given statements together; violations are stored relative to each statement's first line."""
+        partial_tree: typing.Final = ast.Module(
+            body=[one_statement for _, one_statement, _ in statement_items], type_ignores=[]
+        )
+        register_module_facts(partial_tree, module_facts)
+        first_positions: typing.Final = [one_first_position for one_first_position, _, _ in statement_items]
+        relative_violations: typing.Final[list[list[Violation]]] = [[] for _ in statement_items]
+        for one_violation in run_checks(partial_tree, collect_check_classes()):
+            # By line and column, as statements joined with ``;`` share their line
+            statement_index = max(
+                bisect.bisect_right(first_positions, (one_violation.line_number, one_violation.column_number)) - 1, 0
+            )
+            relative_violations[statement_index].append(
+                Violation(
+                    line_number=one_violation.line_number - first_positions[statement_index][0],
+                    column_number=one_violation.column_number,
+                    violation_code=one_violation.violation_code,
+                )
+            )
+        return {
+            one_statement_key: tuple(one_violations)
+            for (_, _, one_statement_key), one_violations in zip(statement_items, relative_violations, strict=True)
+        }
+
+    def check_source_text(self, source_text: str, filename: str) -> list[ReportedViolation]:
+        plain_lines: typing.Final = source_text.splitlines()
+        # Without path profiles a file runs either every check or, when generated, none
+        file_rules: typing.Final = fetch_profile_matcher(DEFAULT_RULE_PROFILES).resolve_file_rules(
+            filename, plain_lines
+        )
+        if not file_rules.check_classes:
+            return []
+        try:
+            syntax_tree: typing.Final = ast.parse(source_text, filename=filename)
+        except SyntaxError as syntax_error:
+            return [build_syntax_error_violation(syntax_error, filename)]
+
+        module_facts: typing.Final = ModuleFacts.collect_from_tree(syntax_tree)
+        if module_facts != self.module_facts:
+            self.statement_results = {}
+            self.module_facts = module_facts
+
+        source_lines: typing.Final = source_text.splitlines(keepends=True)
+        statement_items: typing.Final = []
+        for one_statement in syntax_tree.body:
+            first_line, first_column = extract_first_line(one_statement), one_statement.col_offset
+            # Columns are part of the key: statements joined with ``;`` share their lines but not their results
+            statement_items.append(
+                (
+                    (first_line, first_column),
+                    one_statement,
+                    f"{first_column}:{one_statement.end_col_offset}:"
+                    + "".join(source_lines[first_line - 1 : one_statement.end_lineno or one_statement.lineno]),
+                )
+            )
+
+        missing_items: typing.Final = list(
+            {
+                one_statement_key: (one_first_line, one_statement, one_statement_key)
+                for one_first_line, one_statement, one_statement_key in statement_items
+                if one_statement_key not in self.statement_results
+            }.values()
+        )
+        self.checked_statements_count = len(missing_items)
+        known_results: typing.Final = {
+            **self.statement_results,
+            **(self.check_statements(missing_items, module_facts) if missing_items else {}),
+        }
+        # Only the statements of the current text are kept, so the cache never outgrows the document
+        self.statement_results = {
+            one_statement_key: known_results[one_statement_key] for _, _, one_statement_key in statement_items
+        }
+        return build_reported_violations(
+            (
+                Violation(
+                    line_number=one_first_position[0] + one_violation.line_number,
+                    column_number=one_violation.column_number,
+                    violation_code=one_violation.violation_code,
+                )
+                for one_first_position, _, one_statement_key in statement_items
+                for one_violation in self.statement_results[one_statement_key]
+            ),
+            filename,
+            plain_lines,
+            file_rules,
+        )
+
+
+@typing.final
+class TextDocument:
+    def __init__(self, *, document_uri: str, text_content: str, document_version: int) -> None:
+        self.document_uri: typing.Final = document_uri
+        self.text_content = text_content
+        self.document_version = document_version
+        self.document_analyzer: typing.Final = DocumentAnalyzer()
+        self.debounce_timer: threading.Timer | None = None
+
+
+def convert_position_to_offset(text_content: str, line_index: int, utf16_character: int) -> int:
+    """Convert an LSP position, counted in UTF-16 code units, into an index of ``text_content``."""
+    line_offset = 0
+    for _ in range(line_index):
+        newline_offset = text_content.find("\n", line_offset)
+        if newline_offset < 0:
+            return len(text_content)
+        line_offset = newline_offset + 1
+    line_end: typing.Final = text_content.find("\n", line_offset)
+    line_text: typing.Final = text_content[line_offset : len(text_content) if line_end < 0 else line_end]
+    if line_text.isascii():
+        return line_offset + min(utf16_character, len(line_text))
+    consumed_units = 0
+    for one_index, one_character in enumerate(line_text):
+        if consumed_units >= utf16_character:
+            return line_offset + one_index
+        consumed_units += 2 if ord(one_character) > 0xFFFF else 1  # noqa: PLR2004
+    return line_offset + len(line_text)
+
+
+def convert_to_utf16_length(text_fragment: str) -> int:
+    return len(text_fragment.encode("utf-16-le")) // 2
+
+
+def build_diagnostic(reported_violation: ReportedViolation, source_lines: list[str]) -> dict[str, object]:
+    line_index: typing.Final = max(reported_violation.line_number - 1, 0)
+    line_text: typing.Final = source_lines[line_index] if line_index < len(source_lines) else ""
+    # AST columns are UTF-8 byte offsets, LSP columns are UTF-16 code units
+    start_index: typing.Final = len(line_text.encode()[: reported_violation.column_number].decode(errors="ignore"))
+    # Highlight the word the violation points at, such as the keyword of a definition
+    word_match: typing.Final = DIAGNOSTIC_WORD_PATTERN.match(line_text, start_index)
+    return {
+        "range": {
+            "start": {"line": line_index, "character": convert_to_utf16_length(line_text[:start_index])},
+            "end": {
+                "line": line_index,
+                "character": convert_to_utf16_length(line_text[: word_match.end() if word_match else start_index + 1]),
+            },
+        },
+        "severity": DIAGNOSTIC_SEVERITY_WARNING,
+        "code": reported_violation.violation_code.code,
+        "source": "cop",
+        "message": reported_violation.violation_code.description,
+    }
+
+
+@typing.final
+class LanguageServer:
+    def __init__(
+        self,
+        input_stream: typing.BinaryIO,
+        output_stream: typing.BinaryIO,
+        debounce_seconds: float = DEBOUNCE_SECONDS,
+    ) -> None:
+        self.input_stream: typing.Final = input_stream
+        self.output_stream: typing.Final = output_stream
+        self.debounce_seconds: typing.Final = debounce_seconds
+        self.text_documents: typing.Final[dict[str, TextDocument]] = {}
+        self.documents_lock: typing.Final = threading.Lock()
+        self.output_lock: typing.Final = threading.Lock()
+        self.analysis_executor: typing.Final = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="cop-analysis"
+        )
+        self.is_shutdown_requested = False
+        self.message_handlers: typing.Final[dict[str, Callable[[dict[str, typing.Any]], object]]] = {
+            "initialize": self.handle_initialize,
+            "shutdown": self.handle_shutdown,
+            "textDocument/didOpen": self.handle_did_open,
+            "textDocument/didChange": self.handle_did_change,
+            "textDocument/didClose": self.handle_did_close,
+        }
+
+    def read_message(self) -> dict[str, typing.Any] | None:
+        content_length = 0
+        while True:
+            header_line = self.input_stream.readline()
+            if not header_line:
+                return None
+            if not header_line.strip():
+                break
+            header_name, _, header_value = header_line.decode("ascii").partition(":")
+            if header_name.strip().lower() == "content-length":
+                content_length = int(header_value.strip())
+        return typing.cast("dict[str, typing.Any]", json.loads(self.input_stream.read(content_length)))
+
+    def write_message(self, message_payload: dict[str, object]) -> None:
+        encoded_payload: typing.Final = json.dumps(message_payload, separators=(",", ":")).encode()
+        with self.output_lock:
+            self.output_stream.write(b"Content-Length: %d\r\n\r\n" % len(encoded_payload) + encoded_payload)
+            self.output_stream.flush()
+
+    def run_forever(self) -> int:
+        """Serve until ``exit`` or end of input; the exit code follows the protocol's shutdown rules."""
+        try:
+            while (incoming_message := self.read_message()) is not None:
+                if incoming_message.get("method") == "exit":
+                    break
+                self.handle_message(incoming_message)
+        finally:
+            with self.documents_lock:
+                for one_document in self.text_documents.values():
+                    if one_document.debounce_timer is not None:
+                        one_document.debounce_timer.cancel()
+            self.analysis_executor.shutdown(wait=True)
+        return 0 if self.is_shutdown_requested else 1
+
+    def handle_message(self, incoming_message: dict[str, typing.Any]) -> None:
+        message_handler: typing.Final = self.message_handlers.get(incoming_message.get("method", ""))
+        if "id" not in incoming_message:
+            # Notifications without a handler, such as initialized or $/cancelRequest, need no answer
+            if message_handler is not None:
+                message_handler(incoming_message.get("params") or {})
+            return
+        if message_handler is None:
+            self.write_message(
+                {
+                    "jsonrpc": "2.0",
+                    "id": incoming_message["id"],
+                    "error": {
+                        "code": METHOD_NOT_FOUND_ERROR,
+                        "message": f"Unknown method {incoming_message.get('method')}",
+                    },
+                }
+            )
+            return
+        self.write_message(
+            {
+                "jsonrpc": "2.0",
+                "id": incoming_message["id"],
+                "result": message_handler(incoming_message.get("params") or {}),
+            }
+        )
+
+    def handle_initialize(self, _: dict[str, typing.Any]) -> dict[str, object]:
+        return {
+            "capabilities": {"textDocumentSync": {"openClose": True, "change": TEXT_DOCUMENT_SYNC_INCREMENTAL}},
+            "serverInfo": {"name": "cop", "version": CommunityOfPythonFlake8Plugin.version},
+        }
+
+    def handle_shutdown(self, _: dict[str, typing.Any]) -> None:
+        self.is_shutdown_requested = True
+
+    def handle_did_open(self, message_parameters: dict[str, typing.Any]) -> None:
+        text_item: typing.Final = message_parameters["textDocument"]
+        with self.documents_lock:
+            self.text_documents[text_item["uri"]] = TextDocument(
+                document_uri=text_item["uri"], text_content=text_item["text"], document_version=text_item["version"]
+            )
+        self.reset_debounce_timer(text_item["uri"])
+
+    def handle_did_change(self, message_parameters: dict[str, typing.Any]) -> None:
+        document_uri: typing.Final = message_parameters["textDocument"]["uri"]
+        with self.documents_lock:
+            text_document: typing.Final = self.text_documents.get(document_uri)
+            if text_document is None:
+                return
+            for one_change in message_parameters["contentChanges"]:
+                if "range" not in one_change:
+                    text_document.text_content = one_change["text"]
+                    continue
+                change_start = one_change["range"]["start"]
+                change_end = one_change["range"]["end"]
+                text_content = text_document.text_content
+                text_document.text_content = (
+                    text_content[
+                        : convert_position_to_offset(text_content, change_start["line"], change_start["character"])
+                    ]
+                    + one_change["text"]
+                    + text_content[
+                        convert_position_to_offset(text_content, change_end["line"], change_end["character"]) :
+                    ]
+                )
+            text_document.document_version = message_parameters["textDocument"]["version"]
+        self.reset_debounce_timer(document_uri)
+
+    def handle_did_close(self, message_parameters: dict[str, typing.Any]) -> None:
+        document_uri: typing.Final = message_parameters["textDocument"]["uri"]
+        with self.documents_lock:
+            text_document: typing.Final = self.text_documents.pop(document_uri, None)
+            if text_document is not None and text_document.debounce_timer is not None:
+                text_document.debounce_timer.cancel()
+        self.publish_diagnostics(document_uri, [])
+
+    def reset_debounce_timer(self, document_uri: str) -> None:
+        """Restart the document's debounce timer; the analysis runs once edits pause."""
+        with self.documents_lock:
+            text_document: typing.Final = self.text_documents[document_uri]
+            if text_document.debounce_timer is not None:
+                text_document.debounce_timer.cancel()
+            text_document.debounce_timer = threading.Timer(
+                self.debounce_seconds, self.submit_analysis, args=(document_uri,)
+            )
+            text_document.debounce_timer.daemon = True
+            text_document.debounce_timer.start()
+
+    def submit_analysis(self, document_uri: str) -> None:
+        # The executor refuses new work while the server shuts down, and that analysis is no longer needed
+        with contextlib.suppress(RuntimeError):
+            self.analysis_executor.submit(self.check_document, document_uri)
+
+    def check_document(self, document_uri: str) -> None:
+        with self.documents_lock:
+            text_document: typing.Final = self.text_documents.get(document_uri)
+            if text_document is None:
+                return
+            text_content: typing.Final = text_document.text_content
+            document_version: typing.Final = text_document.document_version
+        reported_violations: typing.Final = text_document.document_analyzer.check_source_text(
+            text_content, urllib.parse.unquote(urllib.parse.urlparse(document_uri).path)
+        )
+        with self.documents_lock:
+            # A newer edit has its own analysis scheduled, so stale results are dropped
+            if self.text_documents.get(document_uri) is not text_document:
+                return
+            if text_document.document_version != document_version:
+                return
+        source_lines: typing.Final = text_content.splitlines()
+        self.publish_diagnostics(
+            document_uri, [build_diagnostic(one_violation, source_lines) for one_violation in reported_violations]
+        )
+
+    def publish_diagnostics(self, document_uri: str, diagnostics: list[dict[str, object]]) -> None:
+        self.write_message(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/publishDiagnostics",
+                "params": {"uri": document_uri, "diagnostics": diagnostics},
+            }
+        )
@@ -0,0 +1,115 @@
+"""Opt-in tracemalloc profiling of COP checks.
+
+Every process (the flake8 main process and each worker) keeps its own profiler and writes
+``memory-profile-<pid>.json`` into the configured directory when it exits.
+"""
+
+from __future__ import annotations
+import contextlib
+import functools
+import heapq
+import json
+import multiprocessing.util
+import os
+import tracemalloc
+import typing
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Iterator
+
+
+LARGEST_FILES_LIMIT: typing.Final = 10
+
+
+@typing.final
+class CheckMemoryStatistics:
+    def __init__(self) -> None:
+        self.files_count = 0
+        self.peak_bytes = 0
+        self.retained_bytes = 0
+        self.total_retained_bytes = 0
+
+    def record_measurement(self, *, peak_bytes: int, retained_bytes: int) -> None:
+        self.files_count += 1
+        self.peak_bytes = max(self.peak_bytes, peak_bytes)
+        self.retained_bytes = max(self.retained_bytes, retained_bytes)
+        self.total_retained_bytes += retained_bytes
+
+    def convert_to_dict(self) -> dict[str, int]:
+        return {
+            "files_count": self.files_count,
+            "peak_bytes": self.peak_bytes,
+            "retained_bytes": self.retained_bytes,
+            "total_retained_bytes": self.total_retained_bytes,
+        }
+
+
+@typing.final
+class MemoryProfiler:
+    def __init__(self, report_directory: pathlib.Path) -> None:
+        self.report_directory: typing.Final = report_directory
+        self.process_identifier: typing.Final = os.getpid()
+        self.check_statistics: typing.Final[dict[str, CheckMemoryStatistics]] = {}
+        self.largest_files: typing.Final[list[tuple[int, int, str]]] = []
+        self.files_count = 0
+        self.peak_bytes = 0
+        self._file_baseline_bytes = 0
+        self._file_peak_bytes = 0
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        # Pool workers leave through os._exit, which skips atexit but still runs multiprocessing finalizers.
+        multiprocessing.util.Finalize(None, self.write_summary, exitpriority=0)
+
+    @contextlib.contextmanager
+    def measure_file(self, filename: str) -> Iterator[None]:
+        self._file_baseline_bytes = tracemalloc.get_traced_memory()[0]
+        self._file_peak_bytes = 0
+        yield
+        retained_bytes: typing.Final = tracemalloc.get_traced_memory()[0] - self._file_baseline_bytes
+        self.files_count += 1
+        self.peak_bytes = max(self.peak_bytes, self._file_peak_bytes)
+        heapq.heappush(self.largest_files, (self._file_peak_bytes, retained_bytes, filename))
+        if len(self.largest_files) > LARGEST_FILES_LIMIT:
+            heapq.heappop(self.largest_files)
+
+    @contextlib.contextmanager
+    def measure_check(self, check_name: str) -> Iterator[None]:
+        baseline_bytes: typing.Final = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        yield
+        current_bytes, traced_peak_bytes = tracemalloc.get_traced_memory()
+        self._file_peak_bytes = max(self._file_peak_bytes, traced_peak_bytes - self._file_baseline_bytes)
+        self.check_statistics.setdefault(check_name, CheckMemoryStatistics()).record_measurement(
+            peak_bytes=traced_peak_bytes - baseline_bytes, retained_bytes=current_bytes - baseline_bytes
+        )
+
+    def build_summary(self) -> dict[str, object]:
+        sorted_statistics: typing.Final = sorted(
+            self.check_statistics.items(), key=lambda one_item: one_item[1].peak_bytes, reverse=True
+        )
+        return {
+            "process_identifier": self.process_identifier,
+            "files_count": self.files_count,
+            "peak_bytes": self.peak_bytes,
+            "checks": {one_name: one_statistics.convert_to_dict() for one_name, one_statistics in sorted_statistics},
+            "largest_files": [
+                {"filename": one_filename, "peak_bytes": one_peak_bytes, "retained_bytes": one_retained_bytes}
+                for one_peak_bytes, one_retained_bytes, one_filename in sorted(self.largest_files, reverse=True)
+            ],
+        }
+
+    def write_summary(self) -> None:
+        if self.files_count == 0:
+            return
+        self.report_directory.mkdir(parents=True, exist_ok=True)
+        (self.report_directory / f"memory-profile-{self.process_identifier}.json").write_text(
+            json.dumps(self.build_summary(), indent=2)
+        )
+
+
+@functools.cache
+def fetch_memory_profiler(report_directory: pathlib.Path, process_identifier: int) -> MemoryProfiler:  # noqa: ARG001
+    # The process identifier is part of the cache key so that forked workers build their own profiler.
+    return MemoryProfiler(report_directory)
@@ -0,0 +1,109 @@
+"""Module-wide facts that checks need beyond the statement they are looking at.
+
+Facts are collected once per tree. Callers that run checks on a part of a module, such as the
+language server re-checking a few statements, register the facts of the whole module for that part;
+facts of separately parsed parts of one module are combined with ``merge_facts``.
+"""
+
+from __future__ import annotations
+import ast
+import collections
+import dataclasses
+import threading
+import typing
+import weakref
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+# Fields holding statements, or the handlers and match cases that hold them
+STATEMENT_LIST_FIELDS: typing.Final = ("body", "orelse", "finalbody", "handlers", "cases")
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class ModuleFacts:
+    # For every base name, how many classes of the module list it among their bases, by name or attribute
+    base_class_references: collections.Counter[str]
+    # Whether the module assigns ``__all__`` at the top level
+    has_all_declaration: bool
+
+    @classmethod
+    def collect_from_tree(cls, syntax_tree: ast.AST) -> ModuleFacts:
+        base_class_references: typing.Final[collections.Counter[str]] = collections.Counter()
+        # Classes are statements, so only statement lists need to be searched, not expressions
+        pending_nodes: typing.Final[list[ast.AST]] = [syntax_tree]
+        while pending_nodes:
+            current_node = pending_nodes.pop()
+            if isinstance(current_node, ast.ClassDef):
+                base_class_references.update(extract_base_names(current_node))
+            for one_field_name in STATEMENT_LIST_FIELDS:
+                child_nodes = getattr(current_node, one_field_name, None)
+                if isinstance(child_nodes, list):
+                    pending_nodes.extend(child_nodes)
+        return cls(
+            base_class_references=base_class_references,
+            has_all_declaration=isinstance(syntax_tree, ast.Module)
+            and any(check_is_all_declaration(one_statement) for one_statement in syntax_tree.body),
+        )
+
+    @classmethod
+    def merge_facts(cls, facts_parts: Iterable[ModuleFacts]) -> ModuleFacts:
+        """Combine the facts of consecutive parts of one module, consuming them one at a time."""
+        base_class_references: typing.Final[collections.Counter[str]] = collections.Counter()
+        has_all_declaration = False
+        for one_part in facts_parts:
+            base_class_references.update(one_part.base_class_references)
+            has_all_declaration = has_all_declaration or one_part.has_all_declaration
+        return cls(base_class_references=base_class_references, has_all_declaration=has_all_declaration)
+
+    def has_local_subclasses(self, class_node: ast.ClassDef) -> bool:
+        """Check if another class of the module inherits from this class."""
+        # A class listing its own name among its bases does not count as its own subclass
+        return self.base_class_references[class_node.name] > int(class_node.name in extract_base_names(class_node))
+
+
+def check_is_all_declaration(statement_node: ast.stmt) -> bool:
+    if isinstance(statement_node, ast.Assign):
+        return any(
+            isinstance(one_target, ast.Name) and one_target.id == "__all__" for one_target in statement_node.targets
+        )
+    return (
+        isinstance(statement_node, ast.AnnAssign)
+        and isinstance(statement_node.target, ast.Name)
+        and statement_node.target.id == "__all__"
+    )
+
+
+def extract_base_names(class_node: ast.ClassDef) -> set[str]:
+    base_names: typing.Final[set[str]] = set()
+    for one_base in class_node.bases:
+        # Direct class reference: class Child(Parent)
+        if isinstance(one_base, ast.Name):
+            base_names.add(one_base.id)
+        # Attributed class reference: class Child(module.Parent)
+        elif isinstance(one_base, ast.Attribute):
+            base_names.add(one_base.attr)
+    return base_names
+
+
+_module_facts: typing.Final[weakref.WeakKeyDictionary[ast.AST, ModuleFacts]] = weakref.WeakKeyDictionary()
+_module_facts_lock: typing.Final = threading.Lock()
+
+
+def fetch_module_facts(syntax_tree: ast.AST) -> ModuleFacts:
+    with _module_facts_lock:
+        cached_facts: typing.Final = _module_facts.get(syntax_tree)
+    if cached_facts is not None:
+        return cached_facts
+    collected_facts: typing.Final = ModuleFacts.collect_from_tree(syntax_tree)
+    with _module_facts_lock:
+        return _module_facts.setdefault(syntax_tree, collected_facts)
+
+
+def register_module_facts(syntax_tree: ast.AST, module_facts: ModuleFacts) -> None:
+    """Make checks running on ``syntax_tree``, a part of a module, see the facts of the whole module."""
+    with _module_facts_lock:
+        _module_facts[syntax_tree] = module_facts
@@ -0,0 +1,182 @@
+"""Declarative naming policy shared by the naming checks.
+
+The policy is a small set of values that projects can tune: the minimum name length, the exempt
+names, the verbs and the required or forbidden prefixes. It is turned into a table of rules, and the
+rules that apply to an identifier kind are compiled into a single regular expression with one optional
+lookahead per rule, so one match classifies an identifier against every rule at once. Classifications
+are cached per identifier and kind, so tuning or extending the policy adds no cost per node.
+"""
+
+from __future__ import annotations
+import dataclasses
+import enum
+import functools
+import re
+import typing
+
+from community_of_python_flake8_plugin.constants import (
+    ASYNC_FORBIDDEN_PREFIX,
+    LOOP_VARIABLE_PREFIX,
+    MIN_NAME_LENGTH,
+    SHORT_NAME_EXEMPTIONS,
+    VERB_PREFIXES,
+)
+from community_of_python_flake8_plugin.symbols import IdentifierKind
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+CLASSIFIED_IDENTIFIERS_CACHE_SIZE: typing.Final = 64 * 1024
+# Upper-case constants such as ``MAX_SIZE``; names with other letters are left to ``str.isupper``
+CONSTANT_NAME_PATTERN: typing.Final = r"[A-Z0-9_]*[A-Z][A-Z0-9_]*"
+
+
+@typing.final
+class NameTrait(enum.Enum):
+    SHORT_NAME = "short_name"
+    LENGTH_EXEMPT = "length_exempt"
+    VERB_NAME = "verb_name"
+    VERB_EXEMPT = "verb_exempt"
+    FORBIDDEN_ASYNC_PREFIX = "forbidden_async_prefix"
+    LOOP_PREFIX = "loop_prefix"
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class NamingPolicy:
+    min_name_length: int = MIN_NAME_LENGTH
+    short_name_exemptions: frozenset[str] = SHORT_NAME_EXEMPTIONS
+    verb_prefixes: frozenset[str] = VERB_PREFIXES
+    async_forbidden_prefix: str = ASYNC_FORBIDDEN_PREFIX
+    loop_variable_prefix: str = LOOP_VARIABLE_PREFIX
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class NamingRule:
+    name_trait: NameTrait
+    identifier_kinds: frozenset[IdentifierKind]
+    # Matched from the start of the identifier; rules about the whole name end with \Z
+    rule_pattern: str
+
+
+ALL_IDENTIFIER_KINDS: typing.Final = frozenset(IdentifierKind)
+DEFAULT_NAMING_POLICY: typing.Final = NamingPolicy()
+
+
+def build_alternation(alternatives: Iterable[str]) -> str:
+    # Longer alternatives first, so that a shorter one never hides a longer one that would also match
+    return "|".join(
+        re.escape(one_alternative)
+        for one_alternative in sorted(alternatives, key=lambda one_text: (-len(one_text), one_text))
+    )
+
+
+def build_naming_rules(naming_policy: NamingPolicy) -> tuple[NamingRule, ...]:
+    """Spell the policy as rules; a rule listing several kinds applies to each of them."""
+    common_exemptions: typing.Final = (
+        rf"_.*|{CONSTANT_NAME_PATTERN}|{build_alternation(naming_policy.short_name_exemptions)}"
+    )
+    return (
+        NamingRule(
+            name_trait=NameTrait.SHORT_NAME,
+            identifier_kinds=ALL_IDENTIFIER_KINDS,
+            rule_pattern=rf".{{0,{max(naming_policy.min_name_length - 1, 0)}}}\Z",
+        ),
+        NamingRule(
+            name_trait=NameTrait.LENGTH_EXEMPT,
+            identifier_kinds=frozenset({IdentifierKind.ATTRIBUTE, IdentifierKind.VARIABLE, IdentifierKind.LOOP_TARGET}),
+            rule_pattern=rf"(?:{common_exemptions})\Z",
+        ),
+        NamingRule(
+            name_trait=NameTrait.LENGTH_EXEMPT,
+            identifier_kinds=frozenset({IdentifierKind.ARGUMENT}),
+            rule_pattern=rf"(?:{common_exemptions}|self|cls)\Z",
+        ),
+        NamingRule(
+            name_trait=NameTrait.LENGTH_EXEMPT,
+            identifier_kinds=frozenset({IdentifierKind.FUNCTION}),
+            rule_pattern=rf"(?:{common_exemptions}|main)\Z",
+        ),
+        NamingRule(
+            name_trait=NameTrait.LENGTH_EXEMPT,
+            identifier_kinds=frozenset({IdentifierKind.CLASS}),
+            rule_pattern=rf"(?:{common_exemptions}|Test.*)\Z",
+        ),
+        NamingRule(
+            name_trait=NameTrait.VERB_NAME,
+            identifier_kinds=frozenset({IdentifierKind.FUNCTION}),
+            # Private and name-mangled functions may start with up to two underscores
+            rule_pattern=rf"_{{0,2}}(?:{build_alternation(naming_policy.verb_prefixes)})(?:_|\Z)",
+        ),
+        NamingRule(
+            name_trait=NameTrait.VERB_EXEMPT,
+            identifier_kinds=frozenset({IdentifierKind.FUNCTION}),
+            rule_pattern=r"(?:main\Z|(?=__).*__\Z)",
+        ),
+        NamingRule(
+            name_trait=NameTrait.FORBIDDEN_ASYNC_PREFIX,
+            identifier_kinds=frozenset({IdentifierKind.FUNCTION}),
+            rule_pattern=re.escape(naming_policy.async_forbidden_prefix),
+        ),
+        NamingRule(
+            name_trait=NameTrait.LOOP_PREFIX,
+            identifier_kinds=frozenset({IdentifierKind.LOOP_TARGET}),
+            rule_pattern=rf"(?:_\Z|{re.escape(naming_policy.loop_variable_prefix)})",
+        ),
+    )
+
+
+@typing.final
+class NamingMatcher:
+    def __init__(self, naming_rules: Iterable[NamingRule]) -> None:
+        # Group names must be unique within a pattern, so each rule's group is named after its position
+        self.group_traits: typing.Final[dict[str, NameTrait]] = {}
+        kind_fragments: typing.Final[dict[IdentifierKind, list[str]]] = {one_kind: [] for one_kind in IdentifierKind}
+        for one_rule in naming_rules:
+            group_name = f"rule_{len(self.group_traits)}"
+            self.group_traits[group_name] = one_rule.name_trait
+            for one_kind in one_rule.identifier_kinds:
+                kind_fragments[one_kind].append(f"(?=(?P<{group_name}>{one_rule.rule_pattern}))?")
+        self.kind_patterns: typing.Final = {
+            one_kind: re.compile("".join(one_fragments), re.DOTALL)
+            for one_kind, one_fragments in kind_fragments.items()
+        }
+        self.classify_identifier: typing.Final = functools.lru_cache(maxsize=CLASSIFIED_IDENTIFIERS_CACHE_SIZE)(
+            self.match_traits
+        )
+
+    def match_traits(self, identifier: str, identifier_kind: IdentifierKind) -> frozenset[NameTrait]:
+        # Every rule is optional, so the pattern always matches; the groups that took part tell which rules held
+        rule_match: typing.Final = typing.cast("re.Match[str]", self.kind_patterns[identifier_kind].match(identifier))
+        name_traits: typing.Final = {
+            self.group_traits[one_group_name]
+            for one_group_name, one_matched_text in rule_match.groupdict().items()
+            if one_matched_text is not None
+        }
+        if not identifier.isascii() and identifier.isupper():
+            name_traits.add(NameTrait.LENGTH_EXEMPT)
+        return frozenset(name_traits)
+
+
+@functools.cache
+def build_naming_matcher(naming_policy: NamingPolicy) -> NamingMatcher:
+    return NamingMatcher(build_naming_rules(naming_policy))
+
+
+_active_policies: typing.Final[list[NamingPolicy]] = [DEFAULT_NAMING_POLICY]
+
+
+def register_naming_policy(naming_policy: NamingPolicy) -> None:
+    """Make the naming checks of this process follow ``naming_policy``, for example from the flake8 options."""
+    _active_policies[:] = [naming_policy]
+
+
+def fetch_naming_policy() -> NamingPolicy:
+    return _active_policies[0]
+
+
+def fetch_naming_matcher() -> NamingMatcher:
+    return build_naming_matcher(_active_policies[0])
@@ -0,0 +1,104 @@
+"""Jupyter notebooks: code cells assembled into one module and checked in a single traversal.
+
+Every code cell is parsed on its own, so that a cell with a syntax error only loses that cell, and its
+statements are appended to one ``ast.Module`` with line numbers shifted to where the cell starts in the
+combined source. Module-wide facts, such as local subclasses or module-level dictionaries, therefore
+see every cell, and the checks run once per notebook rather than once per cell. A line map turns
+combined line numbers back into the cell and the line within it. IPython magics and shell escapes are
+blanked out, which keeps the numbering of the other lines.
+"""
+
+from __future__ import annotations
+import ast
+import dataclasses
+import json
+import re
+import typing
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+NOTEBOOK_SUFFIX: typing.Final = ".ipynb"
+CELL_MAGIC_PREFIX: typing.Final = "%%"
+# Line magics such as "%matplotlib inline" and shell escapes such as "!pip install ..."
+LINE_MAGIC_PATTERN: typing.Final = re.compile(r"\s*[%!]")
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class NotebookCell:
+    # One-based position among all the cells of the notebook, markdown included, as editors number them
+    cell_number: int
+    source_text: str
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class CellSyntaxError:
+    cell_number: int
+    syntax_error: SyntaxError
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class NotebookModule:
+    syntax_tree: ast.Module
+    source_lines: list[str]
+    # For every line of the combined source, the cell number and the one-based line within that cell
+    line_locations: list[tuple[int, int]]
+    syntax_errors: list[CellSyntaxError]
+
+    def find_cell_line(self, line_number: int) -> tuple[int, int]:
+        if not 0 < line_number <= len(self.line_locations):
+            return (0, line_number)
+        return self.line_locations[line_number - 1]
+
+
+def clear_magic_lines(source_text: str) -> str:
+    source_lines: typing.Final = source_text.splitlines()
+    # A cell magic hands the whole cell to another interpreter, such as %%bash or %%sql
+    if source_text.lstrip().startswith(CELL_MAGIC_PREFIX):
+        return "\n" * len(source_lines)
+    return "".join("\n" if LINE_MAGIC_PATTERN.match(one_line) else f"{one_line}\n" for one_line in source_lines)
+
+
+def parse_code_cells(notebook_bytes: bytes) -> Iterator[NotebookCell]:
+    """Read the code cells of a notebook; raise ValueError or TypeError when it is not notebook JSON."""
+    notebook_document: typing.Final = json.loads(notebook_bytes)
+    if not isinstance(notebook_document, dict):
+        raise TypeError("Notebook must be a JSON object")
+    for one_cell_number, one_cell in enumerate(notebook_document.get("cells", ()), start=1):
+        if not isinstance(one_cell, dict) or one_cell.get("cell_type") != "code":
+            continue
+        cell_source = one_cell.get("source", "")
+        yield NotebookCell(
+            cell_number=one_cell_number,
+            source_text=clear_magic_lines(cell_source if isinstance(cell_source, str) else "".join(cell_source)),
+        )
+
+
+def assemble_notebook_module(notebook_cells: Iterable[NotebookCell]) -> NotebookModule:
+    module_body: typing.Final[list[ast.stmt]] = []
+    source_lines: typing.Final[list[str]] = []
+    line_locations: typing.Final[list[tuple[int, int]]] = []
+    syntax_errors: typing.Final[list[CellSyntaxError]] = []
+    for one_cell in notebook_cells:
+        cell_lines = one_cell.source_text.splitlines()
+        try:
+            cell_tree = ast.parse(one_cell.source_text)
+        except SyntaxError as syntax_error:
+            syntax_errors.append(CellSyntaxError(cell_number=one_cell.cell_number, syntax_error=syntax_error))
+        else:
+            module_body.extend(ast.increment_lineno(cell_tree, len(source_lines)).body)
+        source_lines.extend(cell_lines)
+        line_locations.extend(
+            (one_cell.cell_number, one_line_number) for one_line_number in range(1, len(cell_lines) + 1)
+        )
+    return NotebookModule(
+        syntax_tree=ast.Module(body=module_body, type_ignores=[]),
+        source_lines=source_lines,
+        line_locations=line_locations,
+        syntax_errors=syntax_errors,
+    )
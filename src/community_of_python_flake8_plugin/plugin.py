@@ -1,54 +1,127 @@
 from __future__ import annotations
-import importlib
 import importlib.metadata
+import os
 import pathlib
-import pkgutil
 import typing
 
-import community_of_python_flake8_plugin.checks as checks_module
+from community_of_python_flake8_plugin.engine import run_checks
+from community_of_python_flake8_plugin.memory_profile import fetch_memory_profiler
+from community_of_python_flake8_plugin.naming_policy import DEFAULT_NAMING_POLICY, NamingPolicy, register_naming_policy
+from community_of_python_flake8_plugin.profiles import (
+    RuleProfiles,
+    fetch_profile_matcher,
+    parse_rule_profiles,
+)
 
 
 if typing.TYPE_CHECKING:
+    import argparse
     import ast
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Sequence
 
+    from community_of_python_flake8_plugin.profiles import FileRules
     from community_of_python_flake8_plugin.violations import Violation
 
 
-class PluginCheckProtocol(typing.Protocol):
-    violations: list[Violation]
-
-    def __init__(self, tree: ast.AST) -> None: ...  # noqa: COP006
-    def visit(self, node: ast.AST) -> None: ...  # noqa: COP007,COP006,COP012
+class OptionManagerProtocol(typing.Protocol):
+    def add_option(self, *arguments: str, **keyword_arguments: object) -> None: ...
 
 
 @typing.final
 class CommunityOfPythonFlake8Plugin:
     name: typing.Final[str] = str(pathlib.Path(__file__).parent.name)  # noqa: COP004
     version: typing.Final[str] = importlib.metadata.version(name)  # noqa: COP004
+    memory_profile_directory: typing.ClassVar[pathlib.Path | None] = None
+    # Unlike the cop runner, the plugin checks generated files unless --cop-skip-generated is given
+    rule_profiles: typing.ClassVar[RuleProfiles] = RuleProfiles(is_generated_code_checked=True)
 
-    def __init__(self, tree: ast.AST) -> None:  # noqa: COP006
+    def __init__(self, tree: ast.AST, filename: str = "stdin", lines: Sequence[str] = ()) -> None:  # noqa: COP006
         self.ast_syntax_tree: typing.Final[ast.AST] = tree
+        self.filename: typing.Final = filename
+        self.file_rules: typing.Final[FileRules] = fetch_profile_matcher(self.rule_profiles).resolve_file_rules(
+            filename, lines
+        )
+
+    @classmethod
+    def add_options(cls, option_manager: OptionManagerProtocol) -> None:
+        option_manager.add_option(
+            "--cop-memory-profile",
+            metavar="DIRECTORY",
+            default=None,
+            parse_from_config=True,
+            help="Profile COP checks with tracemalloc and write one JSON summary per process into DIRECTORY.",
+        )
+        option_manager.add_option(
+            "--cop-min-name-length",
+            type=int,
+            metavar="LENGTH",
+            default=DEFAULT_NAMING_POLICY.min_name_length,
+            parse_from_config=True,
+            help="Minimum length of names checked by COP004 to COP008 (default: %(default)s).",
+        )
+        option_manager.add_option(
+            "--cop-short-names",
+            metavar="NAMES",
+            default=[],
+            comma_separated_list=True,
+            parse_from_config=True,
+            help="Comma-separated names allowed to be shorter than the minimum length, in addition to the defaults.",
+        )
+        option_manager.add_option(
+            "--cop-extra-verbs",
+            metavar="VERBS",
+            default=[],
+            comma_separated_list=True,
+            parse_from_config=True,
+            help="Comma-separated verbs accepted by COP009 as function name prefixes, in addition to the defaults.",
+        )
+        option_manager.add_option(
+            "--cop-profiles",
+            metavar="PROFILES",
+            default="",
+            parse_from_config=True,
+            help="Path globs with the COP codes they turn off, in the syntax of --per-file-ignores.",
+        )
+        option_manager.add_option(
+            "--cop-skip-generated",
+            action="store_true",
+            default=False,
+            parse_from_config=True,
+            help="Skip files marked as generated ('@generated' or '# Code generated ... DO NOT EDIT.' near the top).",
+        )
+
+    @classmethod
+    def parse_options(cls, parsed_options: argparse.Namespace) -> None:
+        cls.memory_profile_directory = (
+            pathlib.Path(parsed_options.cop_memory_profile) if parsed_options.cop_memory_profile else None
+        )
+        register_naming_policy(
+            NamingPolicy(
+                min_name_length=parsed_options.cop_min_name_length,
+                short_name_exemptions=DEFAULT_NAMING_POLICY.short_name_exemptions.union(parsed_options.cop_short_names),
+                verb_prefixes=DEFAULT_NAMING_POLICY.verb_prefixes.union(parsed_options.cop_extra_verbs),
+            )
+        )
+        cls.rule_profiles = RuleProfiles(
+            path_profiles=parse_rule_profiles(parsed_options.cop_profiles),
+            is_generated_code_checked=not parsed_options.cop_skip_generated,
+        )
 
     def run(self) -> Iterable[tuple[int, int, str, type[object]]]:  # noqa: COP007
-        for one_check_instance in self._collect_checks():
-            for one_violation in one_check_instance.violations:
-                yield (
-                    one_violation.line_number,
-                    one_violation.column_number,
-                    f"{one_violation.violation_code.code} {one_violation.violation_code.description}",
-                    type(self),
-                )
-
-    def _collect_checks(self) -> list[PluginCheckProtocol]:
-        checks_collection: typing.Final = []
-        for _, one_module_name, _ in pkgutil.iter_modules(checks_module.__path__):
-            imported_module = importlib.import_module(f"{checks_module.__name__}.{one_module_name}")
-
-            for one_attribute_name in dir(imported_module):
-                attribute = getattr(imported_module, one_attribute_name)
-                if isinstance(attribute, type) and one_attribute_name.endswith("Check") and hasattr(attribute, "visit"):
-                    check_instance = attribute(self.ast_syntax_tree)
-                    check_instance.visit(self.ast_syntax_tree)
-                    checks_collection.append(check_instance)
-        return checks_collection
+        for one_violation in self._collect_violations():
+            if not self.file_rules.check_is_reported(one_violation.violation_code.code):
+                continue
+            yield (
+                one_violation.line_number,
+                one_violation.column_number,
+                f"{one_violation.violation_code.code} {one_violation.violation_code.description}",
+                type(self),
+            )
+
+    def _collect_violations(self) -> list[Violation]:
+        if self.memory_profile_directory is None:
+            return run_checks(self.ast_syntax_tree, self.file_rules.check_classes)
+
+        memory_profiler: typing.Final = fetch_memory_profiler(self.memory_profile_directory, os.getpid())
+        with memory_profiler.measure_file(self.filename):
+            return run_checks(self.ast_syntax_tree, self.file_rules.check_classes, memory_profiler)
@@ -0,0 +1,162 @@
+"""Path-scoped rule profiles and detection of generated files, decided before a file is traversed.
+
+A profile names a path glob and the COP codes it turns off, in the syntax of flake8's
+``per-file-ignores``. All globs are compiled into one regular expression, so each file is matched
+against every profile at once, and the checks left for each combination of matched profiles are
+resolved once per run. Checks whose codes are all turned off for a file are never instantiated for it.
+Files whose header comments mark them as generated are not checked at all, unless asked to.
+"""
+
+from __future__ import annotations
+import dataclasses
+import fnmatch
+import functools
+import itertools
+import re
+import typing
+
+from flake8.exceptions import ExecutionError  # type: ignore[import-untyped]
+from flake8.utils import parse_files_to_codes_mapping  # type: ignore[import-untyped]
+
+from community_of_python_flake8_plugin.engine import collect_check_classes
+from community_of_python_flake8_plugin.naming_policy import NamingPolicy, register_naming_policy
+from community_of_python_flake8_plugin.utils import convert_to_repository_path
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from community_of_python_flake8_plugin.engine import CheckClass
+
+
+FILE_RULES_CACHE_SIZE: typing.Final = 1024
+# Generators put their marker in a comment near the top, after a shebang, a coding line or a license
+GENERATED_HEADER_LINES: typing.Final = 10
+# Only the two conventions meant for tools: a ``@generated`` tag and Go's ``Code generated ... DO NOT EDIT.`` line
+GENERATED_HEADER_PATTERN: typing.Final = re.compile(r"#.*@generated\b.*|# Code generated .* DO NOT EDIT\.")
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class PathProfile:
+    # Globs with a slash match the path relative to the current directory, others match the file name
+    path_pattern: str
+    disabled_codes: tuple[str, ...]
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class RuleProfiles:
+    path_profiles: tuple[PathProfile, ...] = ()
+    is_generated_code_checked: bool = False
+    # None keeps the policy registered in the process, as the flake8 plugin does from its options
+    naming_policy: NamingPolicy | None = None
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class FileRules:
+    check_classes: tuple[CheckClass, ...]
+    # Code prefixes, matched like noqa codes, whose violations are dropped from the checks that still run
+    disabled_codes: tuple[str, ...]
+
+    def check_is_reported(self, violation_code: str) -> bool:
+        return not violation_code.startswith(self.disabled_codes)
+
+
+DEFAULT_RULE_PROFILES: typing.Final = RuleProfiles()
+SKIPPED_FILE_RULES: typing.Final = FileRules(check_classes=(), disabled_codes=("",))
+
+
+def parse_rule_profiles(profiles_text: str | Sequence[str]) -> tuple[PathProfile, ...]:
+    """Read ``glob:CODE,CODE`` entries separated by whitespace or new lines; raise ValueError when malformed."""
+    try:
+        profile_entries: typing.Final = parse_files_to_codes_mapping(profiles_text)
+    except ExecutionError as parse_error:
+        raise ValueError(str(parse_error)) from parse_error
+    return tuple(
+        PathProfile(path_pattern=one_pattern, disabled_codes=tuple(one_codes))
+        for one_pattern, one_codes in profile_entries
+    )
+
+
+def convert_profile_pattern(path_pattern: str) -> str:
+    if "/" in path_pattern:
+        return fnmatch.translate(path_pattern.removeprefix("./"))
+    return rf"(?:.*/)?{fnmatch.translate(path_pattern)}"
+
+
+def check_is_generated(header_lines: Iterable[str]) -> bool:
+    return any(GENERATED_HEADER_PATTERN.fullmatch(one_line.rstrip("\r\n")) for one_line in header_lines)
+
+
+@typing.final
+class ProfileMatcher:
+    def __init__(self, rule_profiles: RuleProfiles, check_classes: tuple[CheckClass, ...]) -> None:
+        self.rule_profiles: typing.Final = rule_profiles
+        self.check_classes: typing.Final = check_classes
+        # Every profile is an optional lookahead, so one match tells all the profiles that apply
+        self.profiles_pattern: typing.Final = re.compile(
+            "".join(
+                f"(?=(?P<profile_{one_index}>{convert_profile_pattern(one_profile.path_pattern)}))?"
+                for one_index, one_profile in enumerate(rule_profiles.path_profiles)
+            )
+        )
+        self.resolve_matched_profiles: typing.Final = functools.lru_cache(maxsize=FILE_RULES_CACHE_SIZE)(
+            self.build_file_rules
+        )
+
+    def build_file_rules(self, profile_indices: frozenset[int]) -> FileRules:
+        disabled_codes: typing.Final = tuple(
+            sorted(
+                {
+                    one_code
+                    for one_index in profile_indices
+                    for one_code in self.rule_profiles.path_profiles[one_index].disabled_codes
+                }
+            )
+        )
+        return FileRules(
+            check_classes=tuple(
+                one_check_class
+                for one_check_class in self.check_classes
+                if not (
+                    one_check_class.violation_codes
+                    and all(
+                        one_violation_code.code.startswith(disabled_codes)
+                        for one_violation_code in one_check_class.violation_codes
+                    )
+                )
+            ),
+            disabled_codes=disabled_codes,
+        )
+
+    def resolve_file_rules(self, filename: str, source_lines: Iterable[str]) -> FileRules:
+        """Choose the checks to run on a file and the codes to drop, from its path and its first lines."""
+        if not self.rule_profiles.is_generated_code_checked and check_is_generated(
+            itertools.islice(source_lines, GENERATED_HEADER_LINES)
+        ):
+            return SKIPPED_FILE_RULES
+        profiles_match: typing.Final = typing.cast(
+            "re.Match[str]", self.profiles_pattern.match(convert_to_repository_path(filename))
+        )
+        return self.resolve_matched_profiles(
+            frozenset(
+                int(one_group_name.removeprefix("profile_"))
+                for one_group_name, one_matched_text in profiles_match.groupdict().items()
+                if one_matched_text is not None
+            )
+        )
+
+
+@functools.cache
+def build_profile_matcher(rule_profiles: RuleProfiles, check_classes: tuple[CheckClass, ...]) -> ProfileMatcher:
+    return ProfileMatcher(rule_profiles, check_classes)
+
+
+def fetch_profile_matcher(rule_profiles: RuleProfiles) -> ProfileMatcher:
+    # Profiles travel to worker processes and interpreters, which start with the default naming policy
+    if rule_profiles.naming_policy is not None:
+        register_naming_policy(rule_profiles.naming_policy)
+    # Keyed by the registry too, so that reloading the rule packs never serves stale check lists
+    return build_profile_matcher(rule_profiles, collect_check_classes())
@@ -0,0 +1,454 @@
+"""Standalone COP runner that lints files with the COP engine without starting flake8.
+
+Results are reported in flake8's default format and honour ``# noqa`` comments on the reported line.
+Modules of ``CHUNKED_MODE_MIN_BYTES`` or more are streamed and checked a batch of top-level statements
+at a time, after a first pass that collects the module-wide facts, so their whole tree never exists.
+"""
+
+from __future__ import annotations
+import ast
+import concurrent.futures
+import dataclasses
+import fnmatch
+import functools
+import importlib.util
+import io
+import os
+import pathlib
+import re
+import time
+import tokenize
+import typing
+
+from community_of_python_flake8_plugin.chunked import (
+    StatementChunk,
+    StatementChunkReader,
+    merge_statement_chunks,
+    read_line_batches,
+)
+from community_of_python_flake8_plugin.engine import collect_check_classes, run_checks
+from community_of_python_flake8_plugin.module_facts import ModuleFacts, register_module_facts
+from community_of_python_flake8_plugin.notebooks import NOTEBOOK_SUFFIX, assemble_notebook_module, parse_code_cells
+from community_of_python_flake8_plugin.profiles import DEFAULT_RULE_PROFILES, fetch_profile_matcher
+from community_of_python_flake8_plugin.sharding import build_cost_chunks, calculate_file_costs
+from community_of_python_flake8_plugin.subinterpreters import build_interpreter_pool
+from community_of_python_flake8_plugin.traversal import load_node_grammar
+from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+
+    from community_of_python_flake8_plugin.profiles import FileRules, RuleProfiles
+    from community_of_python_flake8_plugin.violations import Violation
+
+
+DEFAULT_EXCLUDE_PATTERNS: typing.Final = (
+    ".svn",
+    "CVS",
+    ".bzr",
+    ".hg",
+    ".git",
+    "__pycache__",
+    ".tox",
+    ".nox",
+    ".eggs",
+    "*.egg",
+    ".venv",
+)
+# Notebooks are linted alongside modules, their code cells assembled into one module
+LINTED_SUFFIXES: typing.Final = (".py", NOTEBOOK_SUFFIX)
+SYNTAX_ERROR_CODE: typing.Final = "E999"
+# flake8's code for files it cannot read
+READ_ERROR_CODE: typing.Final = "E902"
+NOQA_PATTERN: typing.Final = re.compile(
+    r"#\s*noqa(?::[\s]?(?P<codes>[A-Z]+[0-9]+(?:[,\s]+[A-Z]+[0-9]+)*))?", re.IGNORECASE
+)
+FILES_PER_CHUNK: typing.Final = 8
+# Threads share one interpreter and its memory, but check files in parallel only on free-threaded builds;
+# subinterpreters have a GIL each and need Python 3.14, falling back to processes elsewhere
+POOL_KINDS: typing.Final = ("process", "thread", "interpreter")
+CHUNKED_MODE_MIN_BYTES: typing.Final = 4 * 1024 * 1024
+# Statements are checked in batches of about this many characters, bounding memory by the batch
+STATEMENT_BATCH_BYTES: typing.Final = 256 * 1024
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class ReportedViolation:
+    filename: str
+    line_number: int
+    column_number: int
+    violation_code: ViolationCodeItem
+    # Set for notebooks, whose line numbers then count from the start of this cell
+    cell_number: int | None = None
+
+    def render_line(self) -> str:
+        cell_part: typing.Final = "" if self.cell_number is None else f"cell_{self.cell_number}:"
+        return (
+            f"{self.filename}:{cell_part}{self.line_number}:{self.column_number + 1}: "
+            f"{self.violation_code.code} {self.violation_code.description}"
+        )
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class FileReport:
+    filename: str
+    violations: tuple[ReportedViolation, ...]
+    elapsed_seconds: float
+
+
+def check_is_excluded(file_path: pathlib.PurePath, exclude_patterns: Sequence[str]) -> bool:
+    return any(
+        fnmatch.fnmatch(one_part, one_pattern) for one_part in file_path.parts for one_pattern in exclude_patterns
+    )
+
+
+def convert_to_posix_filename(file_path: pathlib.PurePath) -> str:
+    # Shards and cost files are keyed by this form, so it must not depend on how paths were spelled
+    return file_path.as_posix().removeprefix("./")
+
+
+def collect_python_files(
+    input_paths: Iterable[str],
+    exclude_patterns: Sequence[str] = DEFAULT_EXCLUDE_PATTERNS,
+    file_suffixes: tuple[str, ...] = LINTED_SUFFIXES,
+) -> list[str]:
+    """Expand files and directories into a sorted, de-duplicated list of Python files and notebooks.
+
+    Directories are searched for names ending in one of ``file_suffixes``; files given directly are always kept.
+    """
+    python_files: typing.Final[set[str]] = set()
+    for one_input_path in input_paths:
+        input_path = pathlib.Path(one_input_path)
+        if not input_path.is_dir():
+            python_files.add(convert_to_posix_filename(input_path))
+            continue
+        for one_directory, one_directory_names, one_file_names in os.walk(input_path):
+            one_directory_names[:] = sorted(
+                one_name
+                for one_name in one_directory_names
+                if not check_is_excluded(pathlib.PurePath(one_name), exclude_patterns)
+            )
+            python_files.update(
+                convert_to_posix_filename(pathlib.PurePath(one_directory, one_name))
+                for one_name in one_file_names
+                if one_name.endswith(file_suffixes)
+                and not check_is_excluded(pathlib.PurePath(one_name), exclude_patterns)
+            )
+    return sorted(python_files)
+
+
+def check_is_suppressed(reported_violation: ReportedViolation, source_lines: Sequence[str]) -> bool:
+    if not 0 < reported_violation.line_number <= len(source_lines):
+        return False
+    noqa_match: typing.Final = NOQA_PATTERN.search(source_lines[reported_violation.line_number - 1])
+    if noqa_match is None:
+        return False
+    if noqa_match.group("codes") is None:
+        return True
+    return reported_violation.violation_code.code.startswith(
+        tuple(re.split(r"[,\s]+", noqa_match.group("codes").upper()))
+    )
+
+
+def build_syntax_error_violation(syntax_error: SyntaxError, filename: str) -> ReportedViolation:
+    return ReportedViolation(
+        filename=filename,
+        line_number=syntax_error.lineno or 1,
+        column_number=max((syntax_error.offset or 1) - 1, 0),
+        violation_code=ViolationCodeItem(code=SYNTAX_ERROR_CODE, description=f"SyntaxError: {syntax_error.msg}"),
+    )
+
+
+def build_decode_error_violation(decode_error: SyntaxError | UnicodeDecodeError, filename: str) -> ReportedViolation:
+    """Report a source that cannot be decoded, whether for its coding cookie or its bytes, as a syntax error."""
+    if isinstance(decode_error, SyntaxError):
+        return build_syntax_error_violation(decode_error, filename)
+    return ReportedViolation(
+        filename=filename,
+        line_number=1,
+        column_number=0,
+        violation_code=ViolationCodeItem(code=SYNTAX_ERROR_CODE, description=f"SyntaxError: {decode_error}"),
+    )
+
+
+def build_read_error_report(filename: str, read_error: OSError) -> FileReport:
+    return FileReport(
+        filename=filename,
+        violations=(
+            ReportedViolation(
+                filename=filename,
+                line_number=1,
+                column_number=0,
+                violation_code=ViolationCodeItem(
+                    code=READ_ERROR_CODE, description=f"{type(read_error).__name__}: {read_error}"
+                ),
+            ),
+        ),
+        elapsed_seconds=0.0,
+    )
+
+
+def build_reported_violations(
+    violations: Iterable[Violation], filename: str, source_lines: Sequence[str], file_rules: FileRules
+) -> list[ReportedViolation]:
+    """Attach the filename, drop violations turned off for the file or with ``# noqa`` and sort by position."""
+    reported_violations: typing.Final = (
+        ReportedViolation(
+            filename=filename,
+            line_number=one_violation.line_number,
+            column_number=one_violation.column_number,
+            violation_code=one_violation.violation_code,
+        )
+        for one_violation in violations
+        if file_rules.check_is_reported(one_violation.violation_code.code)
+    )
+    return sorted(
+        (
+            one_violation
+            for one_violation in reported_violations
+            if not check_is_suppressed(one_violation, source_lines)
+        ),
+        key=lambda one_violation: (
+            one_violation.line_number,
+            one_violation.column_number,
+            one_violation.violation_code.code,
+        ),
+    )
+
+
+def check_syntax_tree(
+    syntax_tree: ast.AST, filename: str, source_lines: Sequence[str], file_rules: FileRules
+) -> list[ReportedViolation]:
+    return build_reported_violations(
+        run_checks(syntax_tree, file_rules.check_classes), filename, source_lines, file_rules
+    )
+
+
+def check_source(
+    source_text: str, filename: str, rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES
+) -> list[ReportedViolation]:
+    source_lines: typing.Final = source_text.splitlines()
+    file_rules: typing.Final = fetch_profile_matcher(rule_profiles).resolve_file_rules(filename, source_lines)
+    # Files left without checks, such as generated ones, are not even parsed
+    if not file_rules.check_classes:
+        return []
+    try:
+        syntax_tree: typing.Final = ast.parse(source_text, filename=filename)
+    except SyntaxError as syntax_error:
+        return [build_syntax_error_violation(syntax_error, filename)]
+    return check_syntax_tree(syntax_tree, filename, source_lines, file_rules)
+
+
+def generate_batch_facts(
+    statement_batches: Iterable[StatementChunk], filename: str, batch_line_counts: list[int]
+) -> Iterator[ModuleFacts]:
+    for one_batch in statement_batches:
+        batch_line_counts.append(len(one_batch.source_lines))
+        yield ModuleFacts.collect_from_tree(one_batch.parse_statements(filename))
+
+
+def check_notebook(
+    notebook_bytes: bytes, filename: str, rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES
+) -> list[ReportedViolation]:
+    """Check all code cells of a notebook in one traversal and report positions as cell and line."""
+    try:
+        notebook_module: typing.Final = assemble_notebook_module(parse_code_cells(notebook_bytes))
+    except (TypeError, ValueError) as notebook_error:
+        return [
+            ReportedViolation(
+                filename=filename,
+                line_number=1,
+                column_number=0,
+                violation_code=ViolationCodeItem(
+                    code=SYNTAX_ERROR_CODE, description=f"Invalid notebook: {notebook_error}"
+                ),
+            )
+        ]
+    file_rules: typing.Final = fetch_profile_matcher(rule_profiles).resolve_file_rules(
+        filename, notebook_module.source_lines
+    )
+    if not file_rules.check_classes:
+        return []
+    located_violations: typing.Final = [
+        dataclasses.replace(
+            build_syntax_error_violation(one_error.syntax_error, filename), cell_number=one_error.cell_number
+        )
+        for one_error in notebook_module.syntax_errors
+    ]
+    for one_violation in check_syntax_tree(
+        notebook_module.syntax_tree, filename, notebook_module.source_lines, file_rules
+    ):
+        cell_number, cell_line_number = notebook_module.find_cell_line(one_violation.line_number)
+        located_violations.append(
+            dataclasses.replace(one_violation, cell_number=cell_number, line_number=cell_line_number)
+        )
+    return sorted(
+        located_violations,
+        key=lambda one_violation: (
+            one_violation.cell_number or 0,
+            one_violation.line_number,
+            one_violation.column_number,
+            one_violation.violation_code.code,
+        ),
+    )
+
+
+def check_source_stream(
+    open_source_stream: Callable[[], typing.TextIO],
+    filename: str,
+    batch_bytes: int = STATEMENT_BATCH_BYTES,
+    rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES,
+) -> list[ReportedViolation]:
+    """Check a module read twice from fresh streams, holding the trees of only one batch of statements at a time.
+
+    The first pass tokenizes the stream into batches of whole top-level statements and collects the module facts;
+    the second cuts the stream into the same batches by their line counts and runs the checks on each. Batches are
+    parsed with their own line numbers, which only move the reported violations, rather than every node.
+    """
+    batch_line_counts: typing.Final[list[int]] = []
+    try:
+        with open_source_stream() as source_stream:
+            file_rules: typing.Final = fetch_profile_matcher(rule_profiles).resolve_file_rules(filename, source_stream)
+        if not file_rules.check_classes:
+            return []
+        with open_source_stream() as source_stream:
+            module_facts: typing.Final = ModuleFacts.merge_facts(
+                generate_batch_facts(
+                    merge_statement_chunks(StatementChunkReader(source_stream).generate_chunks(), batch_bytes),
+                    filename,
+                    batch_line_counts,
+                )
+            )
+        reported_violations: typing.Final[list[ReportedViolation]] = []
+        with open_source_stream() as source_stream:
+            for one_batch in read_line_batches(source_stream, batch_line_counts):
+                batch_tree = one_batch.parse_statements(filename)
+                register_module_facts(batch_tree, module_facts)
+                reported_violations.extend(
+                    dataclasses.replace(
+                        one_violation, line_number=one_violation.line_number + one_batch.first_line_number - 1
+                    )
+                    for one_violation in build_reported_violations(
+                        run_checks(batch_tree, file_rules.check_classes), filename, one_batch.source_lines, file_rules
+                    )
+                )
+    except (SyntaxError, UnicodeDecodeError) as decode_error:
+        return [build_decode_error_violation(decode_error, filename)]
+    return reported_violations
+
+
+def open_source_buffer(source_bytes: bytes) -> typing.TextIO:
+    """Decode like ``tokenize.open``: honour the coding cookie and translate newlines."""
+    source_encoding, _ = tokenize.detect_encoding(io.BytesIO(source_bytes).readline)
+    return io.TextIOWrapper(io.BytesIO(source_bytes), source_encoding)
+
+
+def measure_file_report(filename: str, check_violations: Callable[[], list[ReportedViolation]]) -> FileReport:
+    # Loading the check registry and the node grammar are one-off costs, not to be charged to the first file
+    collect_check_classes()
+    load_node_grammar()
+    started_at: typing.Final = time.perf_counter()
+    reported_violations: typing.Final = check_violations()
+    return FileReport(
+        filename=filename,
+        violations=tuple(reported_violations),
+        elapsed_seconds=time.perf_counter() - started_at,
+    )
+
+
+def check_source_bytes(
+    source_bytes: bytes, filename: str, rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES
+) -> list[ReportedViolation]:
+    try:
+        source_text: typing.Final = importlib.util.decode_source(source_bytes)
+    except (SyntaxError, UnicodeDecodeError) as decode_error:
+        return [build_decode_error_violation(decode_error, filename)]
+    return check_source(source_text, filename, rule_profiles)
+
+
+def check_buffer(source_bytes: bytes, filename: str, rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES) -> FileReport:
+    # Notebook size is mostly cell outputs, so notebooks never take the chunked path
+    if filename.endswith(NOTEBOOK_SUFFIX):
+        return measure_file_report(filename, lambda: check_notebook(source_bytes, filename, rule_profiles))
+    if len(source_bytes) >= CHUNKED_MODE_MIN_BYTES:
+        return measure_file_report(
+            filename,
+            functools.partial(
+                check_source_stream,
+                functools.partial(open_source_buffer, source_bytes),
+                filename,
+                rule_profiles=rule_profiles,
+            ),
+        )
+    return measure_file_report(filename, lambda: check_source_bytes(source_bytes, filename, rule_profiles))
+
+
+def check_file(filename: str, rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES) -> FileReport:
+    file_path: typing.Final = pathlib.Path(filename)
+    try:
+        if file_path.suffix != NOTEBOOK_SUFFIX and file_path.stat().st_size >= CHUNKED_MODE_MIN_BYTES:
+            return measure_file_report(
+                filename,
+                functools.partial(
+                    check_source_stream,
+                    functools.partial(tokenize.open, file_path),
+                    filename,
+                    rule_profiles=rule_profiles,
+                ),
+            )
+        source_bytes: typing.Final = file_path.read_bytes()
+    except OSError as read_error:
+        return build_read_error_report(filename, read_error)
+    return check_buffer(source_bytes, filename, rule_profiles)
+
+
+def build_worker_pool(pool_kind: str, jobs_count: int) -> concurrent.futures.Executor:
+    if pool_kind == "thread":
+        return concurrent.futures.ThreadPoolExecutor(max_workers=jobs_count, thread_name_prefix="cop-worker")
+    if pool_kind == "interpreter":
+        return build_interpreter_pool(jobs_count)
+    return concurrent.futures.ProcessPoolExecutor(max_workers=jobs_count)
+
+
+def check_file_chunk(filenames: Sequence[str], rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES) -> list[FileReport]:
+    return [check_file(one_filename, rule_profiles) for one_filename in filenames]
+
+
+def run_files(
+    filenames: Sequence[str],
+    jobs_count: int = 1,
+    pool_kind: str = "process",
+    rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES,
+    recorded_costs: Mapping[str, float] | None = None,
+) -> Iterator[FileReport]:
+    """Check files, in a pool of ``pool_kind`` workers when more than one job is requested, in input order.
+
+    The pool's queue holds chunks ordered by expected cost, from ``recorded_costs`` or else the file size,
+    most expensive first; idle workers take the next chunk, so a few large files do not finish last.
+    """
+    if jobs_count <= 1 or len(filenames) <= 1:
+        yield from (check_file(one_filename, rule_profiles) for one_filename in filenames)
+        return
+    file_costs: typing.Final = calculate_file_costs(filenames, recorded_costs or {})
+    file_chunks: typing.Final = build_cost_chunks(
+        [file_costs[one_filename] for one_filename in filenames], jobs_count, FILES_PER_CHUNK
+    )
+    check_profiled_chunk: typing.Final = functools.partial(check_file_chunk, rule_profiles=rule_profiles)
+    finished_reports: typing.Final[dict[int, FileReport]] = {}
+    next_position = 0
+    with build_worker_pool(pool_kind, jobs_count) as worker_pool:
+        for one_chunk, one_reports in zip(
+            file_chunks,
+            worker_pool.map(
+                check_profiled_chunk,
+                [[filenames[one_position] for one_position in one_chunk] for one_chunk in file_chunks],
+            ),
+            strict=True,
+        ):
+            finished_reports.update(zip(one_chunk, one_reports, strict=True))
+            while next_position in finished_reports:
+                yield finished_reports.pop(next_position)
+                next_position += 1
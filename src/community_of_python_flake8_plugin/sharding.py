@@ -0,0 +1,130 @@
+"""Cost-balanced partitioning of files between CI shards, and between the workers of one run.
+
+Every shard computes the full partition from the same inputs, the file list and the cost file,
+so shards agree on the assignment without coordinating. Files missing from the cost file are
+estimated from their size, scaled by the seconds-per-byte ratio of the files that were recorded.
+Within a run, the same costs order the work queue of the pool, most expensive files first.
+"""
+
+from __future__ import annotations
+import dataclasses
+import heapq
+import json
+import pathlib
+import re
+import typing
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from community_of_python_flake8_plugin.runner import FileReport
+
+
+# Chunks are kept to a fraction of a worker's fair share, so that the last ones to finish are short
+CHUNKS_PER_WORKER: typing.Final = 4
+SHARD_PATTERN: typing.Final = re.compile(r"(?P<shard_index>[0-9]+)/(?P<shards_count>[0-9]+)")
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class ShardSelection:
+    shard_index: int
+    shards_count: int
+
+    @classmethod
+    def parse_from_text(cls, shard_text: str) -> ShardSelection:
+        """Parse ``i/N`` with a one-based shard index."""
+        shard_match: typing.Final = SHARD_PATTERN.fullmatch(shard_text.strip())
+        if shard_match is None:
+            raise ValueError(f"shard must look like i/N, got {shard_text!r}")
+        shard_selection: typing.Final = cls(
+            shard_index=int(shard_match.group("shard_index")), shards_count=int(shard_match.group("shards_count"))
+        )
+        if not 1 <= shard_selection.shard_index <= shard_selection.shards_count:
+            raise ValueError(f"shard index must be between 1 and {shard_selection.shards_count}, got {shard_text!r}")
+        return shard_selection
+
+
+def load_file_costs(cost_file: pathlib.Path) -> dict[str, float]:
+    if not cost_file.exists():
+        return {}
+    loaded_costs: typing.Final = json.loads(cost_file.read_text())
+    if not isinstance(loaded_costs, dict):
+        raise TypeError(f"cost file {cost_file} must contain a JSON object")
+    return {str(one_filename): float(one_cost) for one_filename, one_cost in loaded_costs.items()}
+
+
+def write_file_costs(cost_file: pathlib.Path, file_reports: Iterable[FileReport]) -> None:
+    """Merge measured timings into the cost file, keeping entries for files this run did not check."""
+    file_costs: typing.Final = load_file_costs(cost_file)
+    file_costs.update((one_report.filename, round(one_report.elapsed_seconds, 6)) for one_report in file_reports)
+    cost_file.write_text(json.dumps(dict(sorted(file_costs.items())), indent=0, separators=(",", ":")) + "\n")
+
+
+def measure_file_size(filename: str) -> int:
+    # A file gone since it was collected costs nothing to schedule; checking it reports the read error
+    try:
+        return pathlib.Path(filename).stat().st_size
+    except OSError:
+        return 0
+
+
+def calculate_file_costs(filenames: Iterable[str], recorded_costs: Mapping[str, float]) -> dict[str, float]:
+    file_sizes: typing.Final = {one_filename: measure_file_size(one_filename) for one_filename in filenames}
+    recorded_bytes: typing.Final = sum(
+        one_size for one_filename, one_size in file_sizes.items() if one_filename in recorded_costs
+    )
+    recorded_seconds: typing.Final = sum(
+        recorded_costs[one_filename] for one_filename in file_sizes if one_filename in recorded_costs
+    )
+    # Without any recorded file the sizes themselves are the costs; only their proportions matter
+    seconds_per_byte: typing.Final = recorded_seconds / recorded_bytes if recorded_bytes and recorded_seconds else 1.0
+    return {
+        one_filename: recorded_costs.get(one_filename, one_size * seconds_per_byte)
+        for one_filename, one_size in file_sizes.items()
+    }
+
+
+def build_shard_partition(file_costs: Mapping[str, float], shards_count: int) -> list[list[str]]:
+    """Greedily assign the most expensive remaining file to the least loaded shard.
+
+    Ties are broken by file name and shard index, so the result only depends on the inputs.
+    """
+    shard_loads: typing.Final = [(0.0, one_index) for one_index in range(shards_count)]
+    shard_files: typing.Final[list[list[str]]] = [[] for _ in range(shards_count)]
+    for one_filename, one_cost in sorted(file_costs.items(), key=lambda one_item: (-one_item[1], one_item[0])):
+        lightest_load, lightest_index = heapq.heappop(shard_loads)
+        shard_files[lightest_index].append(one_filename)
+        heapq.heappush(shard_loads, (lightest_load + one_cost, lightest_index))
+    return [sorted(one_files) for one_files in shard_files]
+
+
+def extract_shard_files(
+    filenames: Sequence[str], shard_selection: ShardSelection, recorded_costs: Mapping[str, float]
+) -> list[str]:
+    return build_shard_partition(calculate_file_costs(filenames, recorded_costs), shard_selection.shards_count)[
+        shard_selection.shard_index - 1
+    ]
+
+
+def build_cost_chunks(file_costs: Sequence[float], workers_count: int, max_chunk_files: int) -> list[list[int]]:
+    """Group file positions into chunks for a pool's work queue, most expensive first.
+
+    Files costing more than a chunk's share are chunks of their own, so the largest files start first
+    and on different workers; cheap files are grouped, up to ``max_chunk_files``, to save round trips.
+    """
+    chunk_cost_limit: typing.Final = sum(file_costs) / max(workers_count * CHUNKS_PER_WORKER, 1)
+    file_chunks: typing.Final[list[list[int]]] = []
+    chunk_cost = 0.0
+    for one_position in sorted(range(len(file_costs)), key=lambda one_index: -file_costs[one_index]):
+        if (
+            not file_chunks
+            or len(file_chunks[-1]) >= max_chunk_files
+            or chunk_cost + file_costs[one_position] > chunk_cost_limit
+        ):
+            file_chunks.append([])
+            chunk_cost = 0.0
+        file_chunks[-1].append(one_position)
+        chunk_cost += file_costs[one_position]
+    return file_chunks
@@ -0,0 +1,141 @@
+"""Pre-commit mode: lint the staged content of files rather than the working tree.
+
+Staged files are listed with one ``git diff --cached`` call and their blobs are streamed through
+a single long-lived ``git cat-file --batch`` process, straight into the checks. No files are written
+to disk and no process is started per file.
+"""
+
+from __future__ import annotations
+import dataclasses
+import functools
+import pathlib
+import subprocess
+import threading
+import typing
+
+from community_of_python_flake8_plugin.profiles import DEFAULT_RULE_PROFILES
+from community_of_python_flake8_plugin.runner import (
+    DEFAULT_EXCLUDE_PATTERNS,
+    FILES_PER_CHUNK,
+    LINTED_SUFFIXES,
+    build_worker_pool,
+    check_buffer,
+    check_is_excluded,
+)
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from community_of_python_flake8_plugin.profiles import RuleProfiles
+    from community_of_python_flake8_plugin.runner import FileReport
+
+
+# Symbolic links (120000) and submodules (160000) have no Python source to lint
+REGULAR_FILE_MODES: typing.Final = frozenset({"100644", "100755"})
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class StagedFile:
+    filename: str
+    object_name: str
+
+
+def collect_staged_files(
+    pathspecs: Sequence[str] = (".",), exclude_patterns: Sequence[str] = DEFAULT_EXCLUDE_PATTERNS
+) -> list[StagedFile]:
+    """List the added, copied and modified Python files in the index, relative to the current directory."""
+    diff_output: typing.Final = subprocess.run(  # noqa: S603
+        [  # noqa: S607
+            "git",
+            "diff",
+            "--cached",
+            "--raw",
+            "-z",
+            "--no-abbrev",
+            "--no-renames",
+            "--relative",
+            "--diff-filter=ACM",
+            "--",
+            *pathspecs,
+        ],
+        capture_output=True,
+        check=True,
+    ).stdout
+    diff_fields: typing.Final = diff_output.decode(errors="surrogateescape").split("\0")
+    staged_files: typing.Final = []
+    # Every entry is ":<old mode> <new mode> <old object> <new object> <status>" followed by the path
+    for one_metadata, one_filename in zip(diff_fields[0::2], diff_fields[1::2], strict=False):
+        metadata_parts = one_metadata.split()
+        if (
+            metadata_parts[1] in REGULAR_FILE_MODES
+            and one_filename.endswith(LINTED_SUFFIXES)
+            and not check_is_excluded(pathlib.PurePosixPath(one_filename), exclude_patterns)
+        ):
+            staged_files.append(StagedFile(filename=one_filename, object_name=metadata_parts[3]))
+    return sorted(staged_files, key=lambda one_file: one_file.filename)
+
+
+@typing.final
+class GitBlobReader:
+    """A single ``git cat-file --batch`` process answering every request of a run."""
+
+    def __init__(self, repository_directory: str | None = None) -> None:
+        self.git_process: typing.Final = subprocess.Popen(
+            ["git", "cat-file", "--batch"],  # noqa: S607
+            cwd=repository_directory,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self.request_stream: typing.Final = typing.cast("typing.IO[bytes]", self.git_process.stdin)
+        self.response_stream: typing.Final = typing.cast("typing.IO[bytes]", self.git_process.stdout)
+
+    def read_blobs(self, object_names: Sequence[str]) -> Iterator[bytes]:
+        """Yield the contents of the objects in order; raise LookupError for an object git does not have."""
+        # Requests are written from another thread, so neither process blocks on a full pipe
+        writer_thread: typing.Final = threading.Thread(target=self.write_requests, args=(object_names,), daemon=True)
+        writer_thread.start()
+        for one_object_name in object_names:
+            yield self.read_response(one_object_name)
+        writer_thread.join()
+
+    def write_requests(self, object_names: Sequence[str]) -> None:
+        self.request_stream.write(b"".join(f"{one_object_name}\n".encode() for one_object_name in object_names))
+        self.request_stream.flush()
+
+    def read_response(self, object_name: str) -> bytes:
+        # A found object is "<object> <type> <size>", then its contents and a newline; otherwise "<object> missing"
+        header_parts: typing.Final = self.response_stream.readline().split()
+        if len(header_parts) != 3:  # noqa: PLR2004
+            raise LookupError(f"git cat-file cannot read {object_name}")
+        return self.response_stream.read(int(header_parts[2]) + 1)[:-1]
+
+    def stop_reading(self) -> None:
+        # Responses left unread after an error would keep git blocked on a full pipe, so it is not waited for politely
+        self.git_process.kill()
+        self.git_process.wait()
+        self.request_stream.close()
+        self.response_stream.close()
+
+
+def run_staged_files(
+    staged_files: Sequence[StagedFile],
+    jobs_count: int = 1,
+    pool_kind: str = "process",
+    rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES,
+) -> Iterator[FileReport]:
+    """Check the staged contents, in a pool of ``pool_kind`` workers when more than one job is requested, in order."""
+    blob_reader: typing.Final = GitBlobReader()
+    try:
+        blob_contents: typing.Final = blob_reader.read_blobs([one_file.object_name for one_file in staged_files])
+        filenames: typing.Final = [one_file.filename for one_file in staged_files]
+        check_profiled_buffer: typing.Final = functools.partial(check_buffer, rule_profiles=rule_profiles)
+        if jobs_count <= 1 or len(staged_files) <= 1:
+            yield from map(check_profiled_buffer, blob_contents, filenames)
+            return
+        with build_worker_pool(pool_kind, jobs_count) as worker_pool:
+            # Chunks are submitted as their blobs arrive, so checking overlaps reading the remaining blobs
+            yield from worker_pool.map(check_profiled_buffer, blob_contents, filenames, chunksize=FILES_PER_CHUNK)
+    finally:
+        blob_reader.stop_reading()
@@ -0,0 +1,184 @@
+"""Worker pool of subinterpreters, each with its own GIL (``concurrent.interpreters``, Python 3.14+).
+
+Workers share the process, so they start without forking or spawning a process and without a copy
+of the parent's memory, yet check files in parallel on standard builds. Every interpreter imports
+the package and loads the check registry once, then takes tasks from a shared queue until it is told
+to stop. Tasks and results cross interpreters pickled as bytes, which every queue can carry.
+"""
+
+from __future__ import annotations
+import concurrent.futures
+import contextlib
+import importlib
+import itertools
+import pickle
+import queue
+import sys
+import threading
+import typing
+
+from community_of_python_flake8_plugin.engine import collect_check_classes
+
+
+if typing.TYPE_CHECKING:
+    import types
+    from collections.abc import Callable
+
+
+INTERPRETERS_MODULE_NAME: typing.Final = "concurrent.interpreters"
+
+
+class InterpreterQueueProtocol(typing.Protocol):
+    def put(self, queue_item: bytes | None) -> None: ...  # noqa: COP007, COP009
+
+    def get(self) -> bytes | None: ...  # noqa: COP007
+
+    def get_nowait(self) -> bytes | None: ...
+
+
+def load_interpreters_module() -> types.ModuleType | None:
+    try:
+        return importlib.import_module(INTERPRETERS_MODULE_NAME)
+    except ImportError:
+        return None
+
+
+def run_pickled_task(task_payload: bytes) -> bytes:
+    task_number, task_function, task_arguments, task_keyword_arguments = pickle.loads(task_payload)  # noqa: S301
+    # As in process pools, any exception of a task, SystemExit included, belongs to its future
+    try:
+        task_outcome = (task_number, False, task_function(*task_arguments, **task_keyword_arguments))
+    except BaseException as task_error:  # noqa: BLE001
+        task_outcome = (task_number, True, task_error)
+    try:
+        return pickle.dumps(task_outcome)
+    except Exception as pickling_error:  # noqa: BLE001
+        return pickle.dumps((task_number, True, RuntimeError(f"cannot send the task outcome: {pickling_error!r}")))
+
+
+def run_interpreter_worker(task_queue: InterpreterQueueProtocol, result_queue: InterpreterQueueProtocol) -> None:
+    """Run inside a worker interpreter: answer tasks until the ``None`` sentinel arrives.
+
+    Whatever else stops the worker is sent with a ``None`` task number, so that the pool fails the
+    pending tasks instead of waiting for them forever.
+    """
+    try:
+        collect_check_classes()
+        while (task_payload := task_queue.get()) is not None:
+            result_queue.put(run_pickled_task(task_payload))
+    except BaseException as worker_error:  # noqa: BLE001
+        broken_error: typing.Final = concurrent.futures.BrokenExecutor(
+            f"a worker interpreter stopped: {worker_error!r}"
+        )
+        result_queue.put(pickle.dumps((None, True, broken_error)))
+
+
+@typing.final
+class SubinterpreterPool(concurrent.futures.Executor):
+    def __init__(self, interpreters_module: types.ModuleType, max_workers: int) -> None:
+        self.task_queue: typing.Final[InterpreterQueueProtocol] = interpreters_module.create_queue()
+        self.result_queue: typing.Final[InterpreterQueueProtocol] = interpreters_module.create_queue()
+        self.pending_futures: typing.Final[dict[int, concurrent.futures.Future[typing.Any]]] = {}
+        self.pending_lock: typing.Final = threading.Lock()
+        self.task_numbers: typing.Final = itertools.count()
+        self.is_shut_down = False
+        self.broken_error: concurrent.futures.BrokenExecutor | None = None
+        self.worker_interpreters: typing.Final = [interpreters_module.create() for _ in range(max_workers)]
+        self.worker_threads: typing.Final[list[threading.Thread]] = []
+        for one_interpreter in self.worker_interpreters:
+            # New interpreters start from the default import path, without the entries added at runtime
+            one_interpreter.exec(f"import sys; sys.path[:] = {sys.path!r}")
+            self.worker_threads.append(
+                one_interpreter.call_in_thread(run_interpreter_worker, self.task_queue, self.result_queue)
+            )
+        self.collector_thread: typing.Final = threading.Thread(target=self.collect_results, daemon=True)
+        self.collector_thread.start()
+
+    def submit(  # noqa: COP007
+        self, task_function: Callable[..., typing.Any], /, *task_arguments: object, **task_keyword_arguments: object
+    ) -> concurrent.futures.Future[typing.Any]:
+        """Queue a call; functions are pickled by reference, so they must be importable module-level functions."""
+        if self.is_shut_down:
+            raise RuntimeError("cannot submit tasks after shutdown")
+        task_future: typing.Final[concurrent.futures.Future[typing.Any]] = concurrent.futures.Future()
+        task_number: typing.Final = next(self.task_numbers)
+        with self.pending_lock:
+            if self.broken_error is not None:
+                raise concurrent.futures.BrokenExecutor(str(self.broken_error))
+            self.pending_futures[task_number] = task_future
+        self.task_queue.put(pickle.dumps((task_number, task_function, task_arguments, task_keyword_arguments)))
+        return task_future
+
+    def collect_results(self) -> None:
+        while (result_payload := self.result_queue.get()) is not None:
+            task_number, is_error, task_result = pickle.loads(result_payload)  # noqa: S301
+            if task_number is None:
+                self.handle_worker_failure(task_result)
+                continue
+            with self.pending_lock:
+                task_future = self.pending_futures.pop(task_number, None)
+            # Failed already, when a worker stopped
+            if task_future is None:
+                continue
+            # A future cancelled while its task was running keeps its cancelled state
+            with contextlib.suppress(concurrent.futures.InvalidStateError):
+                if is_error:
+                    task_future.set_exception(task_result)
+                else:
+                    task_future.set_result(task_result)
+
+    def handle_worker_failure(self, broken_error: concurrent.futures.BrokenExecutor) -> None:
+        """Fail every pending task and refuse new ones, as process pools do once a worker dies."""
+        with self.pending_lock:
+            self.broken_error = broken_error
+            failed_futures: typing.Final = list(self.pending_futures.values())
+            self.pending_futures.clear()
+        for one_future in failed_futures:
+            with contextlib.suppress(concurrent.futures.InvalidStateError):
+                one_future.set_exception(broken_error)
+
+    def remove_cancelled_tasks(self, cancel_futures: bool) -> None:
+        """Take the cancelled tasks out of the queue, so that workers stop as soon as the others are done."""
+        remaining_payloads: typing.Final = []
+        while True:
+            try:
+                task_payload = self.task_queue.get_nowait()
+            except queue.Empty:
+                break
+            task_number = pickle.loads(typing.cast("bytes", task_payload))[0]  # noqa: S301
+            with self.pending_lock:
+                task_future = self.pending_futures.get(task_number)
+                # Failed already, when a worker stopped
+                if task_future is None:
+                    continue
+                if cancel_futures:
+                    task_future.cancel()
+                if task_future.cancelled():
+                    del self.pending_futures[task_number]
+                else:
+                    remaining_payloads.append(task_payload)
+        for one_payload in remaining_payloads:
+            self.task_queue.put(one_payload)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:  # noqa: ARG002, COP006, COP009
+        """Stop the workers after the tasks that are not cancelled; unlike other executors, always waits."""
+        if self.is_shut_down:
+            return
+        self.is_shut_down = True
+        self.remove_cancelled_tasks(cancel_futures)
+        for _ in self.worker_threads:
+            self.task_queue.put(None)
+        for one_thread in self.worker_threads:
+            one_thread.join()
+        self.result_queue.put(None)
+        self.collector_thread.join()
+        for one_interpreter in self.worker_interpreters:
+            one_interpreter.close()
+
+
+def build_interpreter_pool(max_workers: int) -> concurrent.futures.Executor:
+    """Start a pool of subinterpreters, or of processes on interpreters without ``concurrent.interpreters``."""
+    interpreters_module: typing.Final = load_interpreters_module()
+    if interpreters_module is None:
+        return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+    return SubinterpreterPool(interpreters_module, max_workers)
@@ -0,0 +1,348 @@
+"""Per-file table of the identifiers that the naming checks look at.
+
+The table is built by one traversal of the tree and cached per tree, so the naming checks share it
+and evaluate their rules over identifiers instead of each re-inspecting the syntax tree.
+Symbols keep only the syntactic facts the rules need, never the nodes themselves.
+"""
+
+from __future__ import annotations
+import ast
+import dataclasses
+import enum
+import threading
+import typing
+import weakref
+
+from community_of_python_flake8_plugin.constants import FINAL_CLASS_EXCLUDED_BASES
+from community_of_python_flake8_plugin.traversal import PrunedNodeVisitor
+from community_of_python_flake8_plugin.utils import check_inherits_from_bases
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+COMPREHENSION_NODE_TYPES: typing.Final = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+@typing.final
+class IdentifierKind(enum.Enum):
+    ATTRIBUTE = "attribute"
+    VARIABLE = "variable"
+    ARGUMENT = "argument"
+    FUNCTION = "function"
+    CLASS = "class"
+    LOOP_TARGET = "loop_target"
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class SymbolScope:
+    is_in_class: bool = False
+    is_in_function: bool = False
+    is_in_excluded_class: bool = False
+
+
+MODULE_SCOPE: typing.Final = SymbolScope()
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class IdentifierSymbol:
+    identifier: str
+    identifier_kind: IdentifierKind
+    binding_type: type[ast.AST]
+    line_number: int
+    column_number: int
+    symbol_scope: SymbolScope
+    is_async: bool = False
+    is_property: bool = False
+    is_plain_fixture: bool = False
+    is_fixture: bool = False
+    has_whitelisted_annotation: bool = False
+    requires_loop_prefix: bool = False
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class SymbolTable:
+    symbols_by_identifier: dict[str, list[IdentifierSymbol]]
+
+
+def check_is_whitelisted_annotation(annotation: ast.expr | None) -> bool:
+    if annotation is None:
+        return False
+    if isinstance(annotation, ast.Name):
+        return annotation.id in {"fixture", "Faker"}
+    if isinstance(annotation, ast.Attribute) and isinstance(annotation.value, ast.Name):
+        return annotation.value.id in {"pytest", "faker"}
+    return False
+
+
+def check_is_property_decorator(decorator: ast.expr) -> bool:  # noqa: PLR0911
+    if isinstance(decorator, ast.Name):
+        return decorator.id in {"property", "cached_property"}
+
+    # Handle attribute references like @functools.cached_property
+    if isinstance(decorator, ast.Attribute) and decorator.attr in {"property", "setter", "cached_property"}:
+        if isinstance(decorator.value, ast.Name) and decorator.value.id == "functools":
+            return decorator.attr == "cached_property"
+        return decorator.attr in {"property", "setter"}
+
+    # Handle decorator calls like @property() or @functools.cached_property()
+    if isinstance(decorator, ast.Call):
+        if isinstance(decorator.func, ast.Name):
+            return decorator.func.id in {"property", "cached_property"}
+        if isinstance(decorator.func, ast.Attribute):
+            if (
+                decorator.func.attr in {"property", "setter", "cached_property"}
+                and isinstance(decorator.func.value, ast.Name)
+                and decorator.func.value.id == "functools"
+            ):
+                return decorator.func.attr == "cached_property"
+            if decorator.func.attr in {"property", "setter", "cached_property"}:
+                return decorator.func.attr in {"property", "setter"}
+
+    return False
+
+
+def check_is_plain_fixture_decorator(decorator: ast.expr) -> bool:
+    if isinstance(decorator, ast.Name):
+        return decorator.id == "fixture"
+    if isinstance(decorator, ast.Attribute):
+        return decorator.attr == "fixture" and isinstance(decorator.value, ast.Name) and decorator.value.id == "pytest"
+    return False
+
+
+def check_is_fixture_decorator(decorator: ast.expr) -> bool:
+    if check_is_plain_fixture_decorator(decorator):
+        return True
+    # Handle cases where decorator might be a call like @pytest.fixture(name="events")
+    return isinstance(decorator, ast.Call) and check_is_plain_fixture_decorator(decorator.func)
+
+
+def check_is_literal_range(iter_node: ast.expr) -> bool:
+    if not (isinstance(iter_node, ast.Call) and isinstance(iter_node.func, ast.Name) and iter_node.func.id == "range"):
+        return False
+    # UnaryOp is allowed to handle negative numbers like -1
+    return all(
+        isinstance(one_argument, ast.Constant)
+        or (isinstance(one_argument, ast.UnaryOp) and isinstance(one_argument.operand, ast.Constant))
+        for one_argument in iter_node.args
+    )
+
+
+def count_unpacked_names(target_node: ast.expr) -> int:
+    if isinstance(target_node, ast.Name):
+        return 1
+    if isinstance(target_node, ast.Tuple):
+        return sum(isinstance(one_element, ast.Name) for one_element in target_node.elts)
+    return 0
+
+
+def extract_target_names(target_node: ast.expr, *, nesting_depth: int = 0) -> Iterator[tuple[ast.Name, int]]:
+    if isinstance(target_node, ast.Name):
+        yield target_node, nesting_depth
+    elif isinstance(target_node, ast.Tuple):
+        for one_element in target_node.elts:
+            yield from extract_target_names(one_element, nesting_depth=nesting_depth + 1)
+
+
+def count_referenced_names(expression: ast.expr) -> int:
+    # Expressions other than tuples, like calls or attributes, are assumed to reference one variable
+    if isinstance(expression, ast.Tuple):
+        return count_unpacked_names(expression)
+    return 1
+
+
+@typing.final
+class SymbolCollector(PrunedNodeVisitor):
+    def __init__(self) -> None:
+        super().__init__()
+        self.symbols_by_identifier: typing.Final[dict[str, list[IdentifierSymbol]]] = {}
+        self.symbol_scope = MODULE_SCOPE
+
+    def record_symbol(self, identifier: str, ast_node: ast.AST, **symbol_facts: typing.Any) -> None:  # noqa: ANN401
+        self.symbols_by_identifier.setdefault(identifier, []).append(
+            IdentifierSymbol(
+                identifier=identifier,
+                line_number=getattr(ast_node, "lineno", 0),
+                column_number=getattr(ast_node, "col_offset", 0),
+                symbol_scope=self.symbol_scope,
+                **symbol_facts,
+            )
+        )
+
+    def record_arguments(self, arguments_node: ast.arguments, binding_type: type[ast.AST]) -> None:
+        all_arguments: typing.Final = [*arguments_node.posonlyargs, *arguments_node.args, *arguments_node.kwonlyargs]
+        if arguments_node.vararg is not None:
+            all_arguments.append(arguments_node.vararg)
+        if arguments_node.kwarg is not None:
+            all_arguments.append(arguments_node.kwarg)
+        for one_argument in all_arguments:
+            self.record_symbol(
+                one_argument.arg,
+                one_argument,
+                identifier_kind=IdentifierKind.ARGUMENT,
+                binding_type=binding_type,
+                has_whitelisted_annotation=check_is_whitelisted_annotation(one_argument.annotation),
+            )
+
+    def record_assignment_target(self, target_node: ast.expr, ast_node: ast.Assign | ast.AnnAssign) -> None:
+        if not isinstance(target_node, ast.Name):
+            return
+        # An attribute is bound in a class body, outside of any function or method
+        is_attribute: typing.Final = self.symbol_scope.is_in_class and not self.symbol_scope.is_in_function
+        self.record_symbol(
+            target_node.id,
+            ast_node,
+            identifier_kind=IdentifierKind.ATTRIBUTE if is_attribute else IdentifierKind.VARIABLE,
+            binding_type=type(ast_node),
+        )
+
+    def record_loop_targets(
+        self, target_node: ast.expr, iter_node: ast.expr, *, expression_count: int, binding_type: type[ast.AST]
+    ) -> None:
+        unpacked_count: typing.Final = count_unpacked_names(target_node)
+        # Partial unpacking (fewer names used than unpacked) and literal ranges are exempt from the prefix rule
+        is_exempt_loop: typing.Final = (
+            unpacked_count > expression_count and unpacked_count > 1
+        ) or check_is_literal_range(iter_node)
+        for one_name, one_nesting_depth in extract_target_names(target_node):
+            self.record_symbol(
+                one_name.id,
+                one_name,
+                identifier_kind=IdentifierKind.LOOP_TARGET,
+                binding_type=binding_type,
+                requires_loop_prefix=not is_exempt_loop and one_nesting_depth <= 1,
+            )
+
+    def visit_in_scope(self, ast_node: ast.AST, symbol_scope: SymbolScope) -> None:
+        outer_scope: typing.Final = self.symbol_scope
+        self.symbol_scope = symbol_scope
+        self.generic_visit(ast_node)
+        self.symbol_scope = outer_scope
+
+    def visit_ClassDef(self, ast_node: ast.ClassDef) -> None:
+        self.record_symbol(ast_node.name, ast_node, identifier_kind=IdentifierKind.CLASS, binding_type=ast.ClassDef)
+        # Base-class exemptions follow the outermost enclosing class
+        self.visit_in_scope(
+            ast_node,
+            dataclasses.replace(
+                self.symbol_scope,
+                is_in_class=True,
+                is_in_excluded_class=self.symbol_scope.is_in_excluded_class
+                if self.symbol_scope.is_in_class
+                else check_inherits_from_bases(ast_node, FINAL_CLASS_EXCLUDED_BASES),
+            ),
+        )
+
+    def visit_function(self, ast_node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        self.record_symbol(
+            ast_node.name,
+            ast_node,
+            identifier_kind=IdentifierKind.FUNCTION,
+            binding_type=type(ast_node),
+            is_async=isinstance(ast_node, ast.AsyncFunctionDef),
+            is_property=any(check_is_property_decorator(one_decorator) for one_decorator in ast_node.decorator_list),
+            is_plain_fixture=any(
+                check_is_plain_fixture_decorator(one_decorator) for one_decorator in ast_node.decorator_list
+            ),
+            is_fixture=any(check_is_fixture_decorator(one_decorator) for one_decorator in ast_node.decorator_list),
+        )
+        self.record_arguments(ast_node.args, type(ast_node))
+        self.visit_in_scope(ast_node, dataclasses.replace(self.symbol_scope, is_in_function=True))
+
+    def visit_FunctionDef(self, ast_node: ast.FunctionDef) -> None:
+        self.visit_function(ast_node)
+
+    def visit_AsyncFunctionDef(self, ast_node: ast.AsyncFunctionDef) -> None:
+        self.visit_function(ast_node)
+
+    def visit_Lambda(self, ast_node: ast.Lambda) -> None:
+        self.record_arguments(ast_node.args, ast.Lambda)
+        self.generic_visit(ast_node)
+
+    def visit_Assign(self, ast_node: ast.Assign) -> None:
+        for one_target in ast_node.targets:
+            self.record_assignment_target(one_target, ast_node)
+        self.generic_visit(ast_node)
+
+    def visit_AnnAssign(self, ast_node: ast.AnnAssign) -> None:
+        self.record_assignment_target(ast_node.target, ast_node)
+        self.generic_visit(ast_node)
+
+    def visit_For(self, ast_node: ast.For) -> None:
+        # For-loops have no expression that references the loop variables
+        self.record_loop_targets(ast_node.target, ast_node.iter, expression_count=1, binding_type=ast.For)
+        self.generic_visit(ast_node)
+
+    def visit_comprehension_expression(self, ast_node: ast.ListComp | ast.SetComp | ast.GeneratorExp) -> None:
+        for one_comprehension in ast_node.generators:
+            self.record_loop_targets(
+                one_comprehension.target,
+                one_comprehension.iter,
+                expression_count=count_referenced_names(ast_node.elt),
+                binding_type=type(ast_node),
+            )
+        self.generic_visit(ast_node)
+
+    def visit_ListComp(self, ast_node: ast.ListComp) -> None:
+        self.visit_comprehension_expression(ast_node)
+
+    def visit_SetComp(self, ast_node: ast.SetComp) -> None:
+        self.visit_comprehension_expression(ast_node)
+
+    def visit_GeneratorExp(self, ast_node: ast.GeneratorExp) -> None:
+        self.visit_comprehension_expression(ast_node)
+
+    def visit_DictComp(self, ast_node: ast.DictComp) -> None:
+        # Both the key and the value of a dict comprehension reference the loop variables
+        for one_comprehension in ast_node.generators:
+            self.record_loop_targets(
+                one_comprehension.target, one_comprehension.iter, expression_count=2, binding_type=ast.DictComp
+            )
+        self.generic_visit(ast_node)
+
+    def visit_With(self, ast_node: ast.With) -> None:
+        for one_item in ast_node.items:
+            if one_item.optional_vars is not None:
+                for one_name, _ in extract_target_names(one_item.optional_vars):
+                    self.record_symbol(
+                        one_name.id, one_name, identifier_kind=IdentifierKind.VARIABLE, binding_type=ast.With
+                    )
+        self.generic_visit(ast_node)
+
+    def visit_ExceptHandler(self, ast_node: ast.ExceptHandler) -> None:
+        if ast_node.name is not None:
+            self.symbols_by_identifier.setdefault(ast_node.name, []).append(
+                IdentifierSymbol(
+                    identifier=ast_node.name,
+                    identifier_kind=IdentifierKind.VARIABLE,
+                    binding_type=ast.ExceptHandler,
+                    line_number=ast_node.lineno,
+                    column_number=0,  # the handler name has no position of its own
+                    symbol_scope=self.symbol_scope,
+                )
+            )
+        self.generic_visit(ast_node)
+
+
+_symbol_tables: typing.Final[weakref.WeakKeyDictionary[ast.AST, SymbolTable]] = weakref.WeakKeyDictionary()
+# Weak dictionaries are not safe to mutate from several threads, even with the GIL
+_symbol_tables_lock: typing.Final = threading.Lock()
+
+
+def fetch_symbol_table(syntax_tree: ast.AST) -> SymbolTable:
+    """Build the symbol table of a tree once and share it between the checks running on that tree."""
+    with _symbol_tables_lock:
+        cached_table: typing.Final = _symbol_tables.get(syntax_tree)
+    if cached_table is not None:
+        return cached_table
+    # Tables are built outside the lock; when two threads race on one tree, both get the first table stored
+    symbol_collector: typing.Final = SymbolCollector()
+    symbol_collector.visit(syntax_tree)
+    with _symbol_tables_lock:
+        return _symbol_tables.setdefault(
+            syntax_tree, SymbolTable(symbols_by_identifier=symbol_collector.symbols_by_identifier)
+        )
@@ -0,0 +1,193 @@
+"""Traversal that skips the subtrees which cannot contain any of the node types a visitor looks for.
+
+Which node types can appear below which is read once from the grammar that ``ast`` documents in the
+signature of every node class, such as ``List(expr* elts, expr_context ctx)``. For a set of target
+node types, a descent plan then names the fields worth following in every node type. Expressions
+never hold statements, so statement-level visitors skip whole expressions, and leaves such as
+constants are never visited at all, which keeps literal data tables out of every traversal.
+"""
+
+from __future__ import annotations
+import ast
+import dataclasses
+import functools
+import re
+import typing
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+
+# One field of a node signature: its type, optionally repeated ("*") or optional ("?"), and its name
+FIELD_SIGNATURE_PATTERN: typing.Final = re.compile(r"(\w+)[*?]? (\w+)")
+
+
+def collect_node_classes() -> list[type[ast.AST]]:
+    node_classes: typing.Final[list[type[ast.AST]]] = []
+    pending_classes: typing.Final[list[type[ast.AST]]] = [ast.AST]
+    while pending_classes:
+        current_class = pending_classes.pop()
+        node_classes.append(current_class)
+        pending_classes.extend(one_subclass for one_subclass in current_class.__subclasses__())
+    return list(dict.fromkeys(node_classes))
+
+
+def resolve_field_node_types(type_name: str, node_classes: list[type[ast.AST]]) -> frozenset[type[ast.AST]]:
+    """Map a grammar type such as ``expr`` to the node classes it stands for; builtins like ``identifier`` hold none."""
+    field_class: typing.Final = getattr(ast, type_name, None)
+    if not (isinstance(field_class, type) and issubclass(field_class, ast.AST)):
+        return frozenset()
+    return frozenset(one_class for one_class in node_classes if issubclass(one_class, field_class))
+
+
+def parse_node_fields(
+    node_class: type[ast.AST], node_classes: list[type[ast.AST]]
+) -> dict[str, frozenset[type[ast.AST]]] | None:
+    """Read the node types each field may hold, or None when the signature cannot be read."""
+    if not node_class._fields:
+        return {}
+    signature_match: typing.Final = re.fullmatch(
+        rf"{node_class.__name__}\((.*)\)", (node_class.__doc__ or "").split("\n", 1)[0]
+    )
+    if signature_match is None:
+        return None
+    field_types: typing.Final = {
+        one_field_name: resolve_field_node_types(one_type_name, node_classes)
+        for one_type_name, one_field_name in FIELD_SIGNATURE_PATTERN.findall(signature_match[1])
+    }
+    if set(field_types) != set(node_class._fields):
+        return None
+    return {one_field_name: field_types[one_field_name] for one_field_name in node_class._fields}
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class NodeGrammar:
+    # Node types each field may hold directly; None for classes whose signature could not be read
+    node_fields: dict[type[ast.AST], dict[str, frozenset[type[ast.AST]]] | None]
+    # Node types that may appear anywhere below a node of each type
+    contained_node_types: dict[type[ast.AST], frozenset[type[ast.AST]]]
+
+
+@functools.cache
+def load_node_grammar() -> NodeGrammar:
+    node_classes: typing.Final = collect_node_classes()
+    node_fields: typing.Final = {one_class: parse_node_fields(one_class, node_classes) for one_class in node_classes}
+    for one_class, one_fields in node_fields.items():
+        # Deprecated aliases such as ast.Num document no signature, but construct their base class instead
+        if one_fields is None:
+            node_fields[one_class] = next(
+                (
+                    node_fields[one_base]
+                    for one_base in one_class.__mro__[1:]
+                    if issubclass(one_base, ast.AST) and node_fields.get(one_base)
+                ),
+                None,
+            )
+    all_node_types: typing.Final = frozenset(node_classes)
+    # Nodes of an unreadable signature are assumed to contain anything
+    contained_node_types: typing.Final = {
+        one_class: all_node_types if one_fields is None else frozenset().union(*one_fields.values())
+        for one_class, one_fields in node_fields.items()
+    }
+    has_grown = True
+    while has_grown:
+        has_grown = False
+        for one_class, one_contained_types in contained_node_types.items():
+            expanded_types = one_contained_types.union(
+                *(contained_node_types[one_type] for one_type in one_contained_types)
+            )
+            if expanded_types != one_contained_types:
+                contained_node_types[one_class] = expanded_types
+                has_grown = True
+    return NodeGrammar(node_fields=node_fields, contained_node_types=contained_node_types)
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class DescentPlan:
+    # Known node types that neither are targets nor can contain one; node types missing here are visited
+    skipped_node_types: frozenset[type[ast.AST]]
+    # Fields that may lead to a target, per node type; fields missing here are all followed
+    descent_fields: dict[type[ast.AST], tuple[str, ...]]
+
+    def iter_child_nodes(self, ast_node: ast.AST) -> Iterator[ast.AST]:
+        """Yield the children that are targets or may contain one, in the order of ``ast.iter_child_nodes``."""
+        for one_field_name in self.descent_fields.get(type(ast_node), ast_node._fields):
+            field_value = getattr(ast_node, one_field_name, None)
+            if isinstance(field_value, list):
+                yield from (
+                    one_item
+                    for one_item in field_value
+                    if isinstance(one_item, ast.AST) and type(one_item) not in self.skipped_node_types
+                )
+            elif isinstance(field_value, ast.AST) and type(field_value) not in self.skipped_node_types:
+                yield field_value
+
+    def iter_tree_nodes(self, syntax_tree: ast.AST) -> Iterator[ast.AST]:
+        """Yield the root and every node on a path to a target, like ``ast.walk`` for the rest."""
+        pending_nodes: typing.Final = [syntax_tree]
+        while pending_nodes:
+            current_node = pending_nodes.pop()
+            pending_nodes.extend(self.iter_child_nodes(current_node))
+            yield current_node
+
+
+@functools.cache
+def build_descent_plan(target_node_types: frozenset[type[ast.AST]]) -> DescentPlan:
+    node_grammar: typing.Final = load_node_grammar()
+    skipped_node_types: typing.Final = frozenset(
+        one_class
+        for one_class, one_contained_types in node_grammar.contained_node_types.items()
+        if one_class not in target_node_types and one_contained_types.isdisjoint(target_node_types)
+    )
+    return DescentPlan(
+        skipped_node_types=skipped_node_types,
+        descent_fields={
+            one_class: tuple(
+                one_field_name
+                for one_field_name, one_field_types in one_fields.items()
+                if not one_field_types <= skipped_node_types
+            )
+            for one_class, one_fields in node_grammar.node_fields.items()
+            if one_fields is not None
+        },
+    )
+
+
+class PrunedNodeVisitor(ast.NodeVisitor):  # noqa: COP012
+    """``ast.NodeVisitor`` that only descends where one of the ``visit_*`` methods of its class can apply.
+
+    Handlers are looked up once per class rather than by name for every node.
+    """
+
+    visited_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset()
+    node_handlers: typing.ClassVar[dict[type[ast.AST], Callable[[typing.Any, typing.Any], object]]] = {}
+
+    def __init_subclass__(cls, **keyword_arguments: typing.Any) -> None:  # noqa: ANN401
+        super().__init_subclass__(**keyword_arguments)
+        # Handlers inherited from ast.NodeVisitor, such as its visit_Constant shim, are not targets
+        visitor_classes: typing.Final = cls.__mro__[: cls.__mro__.index(PrunedNodeVisitor)]
+        cls.node_handlers = {
+            getattr(ast, one_attribute_name.removeprefix("visit_")): getattr(cls, one_attribute_name)
+            for one_class in reversed(visitor_classes)
+            for one_attribute_name in vars(one_class)
+            if one_attribute_name.startswith("visit_")
+            and isinstance(getattr(ast, one_attribute_name.removeprefix("visit_"), None), type)
+        }
+        cls.visited_node_types = frozenset(cls.node_handlers)
+
+    def __init__(self) -> None:
+        self.descent_plan: typing.Final = build_descent_plan(self.visited_node_types)
+
+    def visit(self, node: ast.AST) -> None:  # noqa: COP006, COP007, COP009
+        node_handler: typing.Final = self.node_handlers.get(type(node))
+        if node_handler is None:
+            self.generic_visit(node)
+        else:
+            node_handler(self, node)
+
+    def generic_visit(self, node: ast.AST) -> None:  # noqa: COP006, COP009
+        for one_child_node in self.descent_plan.iter_child_nodes(node):
+            self.visit(one_child_node)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 import ast
+import os
+import pathlib
 
 
 def find_parent_class_definition(syntax_tree: ast.AST, target_node: ast.AST) -> ast.ClassDef | None:
@@ -22,7 +24,7 @@ def find_parent_function_definition(
     return None
 
 
-def check_inherits_from_bases(class_definition: ast.ClassDef, base_classes: set[str]) -> bool:
+def check_inherits_from_bases(class_definition: ast.ClassDef, base_classes: frozenset[str]) -> bool:
     for one_base_class in class_definition.bases:
         if isinstance(one_base_class, ast.Name) and one_base_class.id in base_classes:
             return True
@@ -44,3 +46,8 @@ def find_parent_node(syntax_tree: ast.AST, target_node: ast.AST, node_types: tup
                 if one_child_node is target_node:
                     return one_potential_parent
     return None
+
+
+def convert_to_repository_path(filename: str) -> str:
+    """Spell a reported filename relative to the current directory, where CODEOWNERS paths and profiles are rooted."""
+    return pathlib.PurePath(os.path.relpath(filename)).as_posix()
@@ -0,0 +1,325 @@
+"""Watch mode: keep results in memory and re-check only the files that changed.
+
+On Linux the watcher uses inotify through libc; elsewhere, or when inotify is unavailable, it polls
+modification times. All COP facts are computed from a single file, local subclasses included,
+so a change invalidates exactly the results of the changed file. Files whose bytes did not change
+(a save without edits, a ``touch``) are not checked again.
+"""
+
+from __future__ import annotations
+import contextlib
+import ctypes
+import ctypes.util
+import dataclasses
+import hashlib
+import os
+import pathlib
+import select
+import struct
+import sys
+import time
+import typing
+
+from community_of_python_flake8_plugin.profiles import DEFAULT_RULE_PROFILES
+from community_of_python_flake8_plugin.runner import (
+    LINTED_SUFFIXES,
+    check_buffer,
+    check_is_excluded,
+    collect_python_files,
+    convert_to_posix_filename,
+)
+
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from community_of_python_flake8_plugin.profiles import RuleProfiles
+    from community_of_python_flake8_plugin.runner import FileReport
+
+
+IN_MODIFY: typing.Final = 0x00000002
+IN_CLOSE_WRITE: typing.Final = 0x00000008
+IN_MOVED_FROM: typing.Final = 0x00000040
+IN_MOVED_TO: typing.Final = 0x00000080
+IN_CREATE: typing.Final = 0x00000100
+IN_DELETE: typing.Final = 0x00000200
+IN_Q_OVERFLOW: typing.Final = 0x00004000
+IN_ISDIR: typing.Final = 0x40000000
+WATCHED_EVENTS_MASK: typing.Final = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT_HEADER: typing.Final = struct.Struct("iIII")
+INOTIFY_READ_SIZE: typing.Final = 64 * 1024
+# Editors write a file in several system calls; events arriving this soon after the first one form one batch
+DEBOUNCE_SECONDS: typing.Final = 0.01
+DEFAULT_POLLING_INTERVAL_SECONDS: typing.Final = 0.5
+
+
+class FileWatcherProtocol(typing.Protocol):
+    def wait_for_changes(self, timeout_seconds: float | None) -> set[str]:
+        """Block until something changes and return the changed paths; a directory means rescan it."""
+
+    def stop_watching(self) -> None: ...
+
+
+@typing.final
+class InotifyWatcher:
+    def __init__(self, input_paths: Sequence[str], exclude_patterns: Sequence[str]) -> None:
+        self.libc_library: typing.Final = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.exclude_patterns: typing.Final = exclude_patterns
+        self.inotify_descriptor: typing.Final[int] = self.libc_library.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.inotify_descriptor < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watched_directories: typing.Final[dict[int, pathlib.Path]] = {}
+        self.root_directories: typing.Final = []
+        try:
+            for one_input_path in input_paths:
+                input_path = pathlib.Path(one_input_path)
+                if input_path.is_dir():
+                    self.root_directories.append(input_path)
+                    self.add_directory_tree(input_path)
+                else:
+                    # An explicitly listed file only needs its own directory, not everything below it
+                    self.root_directories.append(input_path.parent)
+                    self.add_directory(input_path.parent)
+        except BaseException:
+            # The caller falls back to polling and never sees this watcher to stop it
+            os.close(self.inotify_descriptor)
+            raise
+
+    def add_directory(self, directory_path: pathlib.Path) -> None:
+        watch_descriptor: typing.Final = self.libc_library.inotify_add_watch(
+            self.inotify_descriptor, os.fsencode(directory_path), WATCHED_EVENTS_MASK
+        )
+        if watch_descriptor < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory_path}")
+        self.watched_directories[watch_descriptor] = directory_path
+
+    def add_directory_tree(self, root_directory: pathlib.Path) -> None:
+        for one_directory, one_directory_names, _ in os.walk(root_directory):
+            one_directory_names[:] = [
+                one_name
+                for one_name in one_directory_names
+                if not check_is_excluded(pathlib.PurePath(one_name), self.exclude_patterns)
+            ]
+            self.add_directory(pathlib.Path(one_directory))
+
+    def remove_directory_tree(self, root_directory: pathlib.Path) -> None:
+        """Stop watching a directory moved away, whose watches would otherwise report under its old path."""
+        for one_descriptor, one_directory in list(self.watched_directories.items()):
+            if one_directory == root_directory or root_directory in one_directory.parents:
+                self.libc_library.inotify_rm_watch(self.inotify_descriptor, one_descriptor)
+                del self.watched_directories[one_descriptor]
+
+    def read_events(self) -> set[str]:
+        changed_paths: typing.Final[set[str]] = set()
+        while True:
+            try:
+                event_buffer = os.read(self.inotify_descriptor, INOTIFY_READ_SIZE)
+            except BlockingIOError:
+                return changed_paths
+            buffer_offset = 0
+            while buffer_offset < len(event_buffer):
+                watch_descriptor, event_mask, _, name_length = INOTIFY_EVENT_HEADER.unpack_from(
+                    event_buffer, buffer_offset
+                )
+                buffer_offset += INOTIFY_EVENT_HEADER.size
+                event_name = os.fsdecode(event_buffer[buffer_offset : buffer_offset + name_length].rstrip(b"\0"))
+                buffer_offset += name_length
+                if event_mask & IN_Q_OVERFLOW:
+                    # Events were dropped, so nothing short of a full rescan is precise
+                    changed_paths.update(str(one_root) for one_root in self.root_directories)
+                    continue
+                if watch_descriptor not in self.watched_directories or not event_name:
+                    continue
+                changed_path = self.watched_directories[watch_descriptor] / event_name
+                if event_mask & IN_ISDIR and event_mask & (IN_CREATE | IN_MOVED_TO):
+                    if not check_is_excluded(pathlib.PurePath(event_name), self.exclude_patterns):
+                        self.add_directory_tree(changed_path)
+                        changed_paths.add(str(changed_path))
+                    continue
+                if event_mask & IN_ISDIR and event_mask & IN_MOVED_FROM:
+                    self.remove_directory_tree(changed_path)
+                # A directory moved away or deleted is reported by its path, which removes the files under it
+                changed_paths.add(str(changed_path))
+
+    def wait_for_changes(self, timeout_seconds: float | None) -> set[str]:
+        readable_descriptors, _, _ = select.select([self.inotify_descriptor], [], [], timeout_seconds)
+        if not readable_descriptors:
+            return set()
+        changed_paths: typing.Final = self.read_events()
+        while select.select([self.inotify_descriptor], [], [], DEBOUNCE_SECONDS)[0]:
+            changed_paths.update(self.read_events())
+        return changed_paths
+
+    def stop_watching(self) -> None:
+        os.close(self.inotify_descriptor)
+
+
+@typing.final
+class PollingWatcher:
+    def __init__(
+        self,
+        input_paths: Sequence[str],
+        exclude_patterns: Sequence[str],
+        polling_interval: float = DEFAULT_POLLING_INTERVAL_SECONDS,
+    ) -> None:
+        self.input_paths: typing.Final = input_paths
+        self.exclude_patterns: typing.Final = exclude_patterns
+        self.polling_interval: typing.Final = polling_interval
+        self.file_signatures = self.collect_file_signatures()
+
+    def collect_file_signatures(self) -> dict[str, tuple[int, int]]:
+        file_signatures: typing.Final[dict[str, tuple[int, int]]] = {}
+        for one_filename in collect_python_files(self.input_paths, self.exclude_patterns):
+            with contextlib.suppress(FileNotFoundError):
+                file_status = os.stat(one_filename)  # noqa: PTH116
+                file_signatures[one_filename] = (file_status.st_mtime_ns, file_status.st_size)
+        return file_signatures
+
+    def wait_for_changes(self, timeout_seconds: float | None) -> set[str]:
+        deadline: typing.Final = None if timeout_seconds is None else time.monotonic() + timeout_seconds
+        while True:
+            file_signatures = self.collect_file_signatures()
+            changed_paths = {
+                one_filename
+                for one_filename in file_signatures.keys() | self.file_signatures.keys()
+                if file_signatures.get(one_filename) != self.file_signatures.get(one_filename)
+            }
+            self.file_signatures = file_signatures
+            if changed_paths or (deadline is not None and time.monotonic() >= deadline):
+                return changed_paths
+            time.sleep(self.polling_interval)
+
+    def stop_watching(self) -> None:
+        self.file_signatures = {}
+
+
+def create_file_watcher(
+    input_paths: Sequence[str], exclude_patterns: Sequence[str], *, force_polling: bool = False
+) -> FileWatcherProtocol:
+    if not force_polling and sys.platform.startswith("linux"):
+        with contextlib.suppress(OSError, AttributeError):
+            return InotifyWatcher(input_paths, exclude_patterns)
+    return PollingWatcher(input_paths, exclude_patterns)
+
+
+@typing.final
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class WatchUpdate:
+    refreshed_reports: list[FileReport]
+    removed_filenames: list[str]
+
+
+@typing.final
+class WatchSession:
+    """Per-file results and content digests kept between re-checks."""
+
+    def __init__(
+        self,
+        input_paths: Sequence[str],
+        exclude_patterns: Sequence[str],
+        rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES,
+    ) -> None:
+        self.input_paths: typing.Final = input_paths
+        self.exclude_patterns: typing.Final = exclude_patterns
+        self.rule_profiles: typing.Final = rule_profiles
+        self.file_reports: typing.Final[dict[str, FileReport]] = {}
+        self.file_digests: typing.Final[dict[str, bytes]] = {}
+
+    def check_is_watched(self, filename: str) -> bool:
+        file_path: typing.Final = pathlib.PurePath(filename)
+        for one_input_path in self.input_paths:
+            input_path = pathlib.PurePath(convert_to_posix_filename(pathlib.PurePath(one_input_path)))
+            if file_path == input_path:
+                return True
+            if input_path == pathlib.PurePath() or input_path in file_path.parents:
+                return file_path.suffix in LINTED_SUFFIXES and not check_is_excluded(
+                    file_path.relative_to(input_path), self.exclude_patterns
+                )
+        return False
+
+    def check_changed_files(self, changed_paths: Iterable[str]) -> WatchUpdate:
+        """Re-check the changed files whose content differs and forget the files that were removed."""
+        candidate_filenames: typing.Final[set[str]] = set()
+        for one_changed_path in changed_paths:
+            if pathlib.Path(one_changed_path).is_dir():
+                rescanned_filenames = set(collect_python_files([one_changed_path], self.exclude_patterns))
+                directory_path = pathlib.PurePath(convert_to_posix_filename(pathlib.PurePath(one_changed_path)))
+                # Files that disappeared from a rescanned directory must be forgotten too
+                candidate_filenames.update(
+                    one_filename
+                    for one_filename in self.file_reports
+                    if directory_path == pathlib.PurePath() or directory_path in pathlib.PurePath(one_filename).parents
+                )
+                candidate_filenames.update(rescanned_filenames)
+            else:
+                changed_filename = convert_to_posix_filename(pathlib.PurePath(one_changed_path))
+                candidate_filenames.add(changed_filename)
+                # A path that is gone may have been a directory, whose tracked files are gone with it
+                candidate_filenames.update(
+                    one_filename
+                    for one_filename in self.file_reports
+                    if pathlib.PurePath(changed_filename) in pathlib.PurePath(one_filename).parents
+                )
+
+        watch_update: typing.Final = WatchUpdate(refreshed_reports=[], removed_filenames=[])
+        for one_filename in sorted(candidate_filenames):
+            if not self.check_is_watched(one_filename):
+                continue
+            try:
+                source_bytes = pathlib.Path(one_filename).read_bytes()
+            except (FileNotFoundError, IsADirectoryError):
+                if self.file_reports.pop(one_filename, None) is not None:
+                    watch_update.removed_filenames.append(one_filename)
+                self.file_digests.pop(one_filename, None)
+                continue
+            source_digest = hashlib.blake2b(source_bytes, digest_size=16).digest()
+            if self.file_digests.get(one_filename) == source_digest:
+                continue
+            self.file_digests[one_filename] = source_digest
+            self.file_reports[one_filename] = check_buffer(source_bytes, one_filename, self.rule_profiles)
+            watch_update.refreshed_reports.append(self.file_reports[one_filename])
+        return watch_update
+
+    def calculate_violations_count(self) -> int:
+        return sum(len(one_report.violations) for one_report in self.file_reports.values())
+
+
+def write_reports(file_reports: Iterable[FileReport]) -> None:
+    for one_report in file_reports:
+        for one_violation in one_report.violations:
+            sys.stdout.write(f"{one_violation.render_line()}\n")
+    sys.stdout.flush()
+
+
+def run_watch_loop(
+    input_paths: Sequence[str],
+    exclude_patterns: Sequence[str],
+    rule_profiles: RuleProfiles = DEFAULT_RULE_PROFILES,
+    *,
+    force_polling: bool = False,
+) -> None:
+    watch_session: typing.Final = WatchSession(input_paths, exclude_patterns, rule_profiles)
+    file_watcher: typing.Final = create_file_watcher(input_paths, exclude_patterns, force_polling=force_polling)
+    write_reports(watch_session.check_changed_files(input_paths).refreshed_reports)
+    sys.stderr.write(
+        f"cop: watching {len(watch_session.file_reports)} file(s) with {type(file_watcher).__name__}, "
+        f"{watch_session.calculate_violations_count()} violations\n"
+    )
+    try:
+        while True:
+            changed_paths = file_watcher.wait_for_changes(None)
+            started_at = time.perf_counter()
+            watch_update = watch_session.check_changed_files(changed_paths)
+            if not watch_update.refreshed_reports and not watch_update.removed_filenames:
+                continue
+            write_reports(watch_update.refreshed_reports)
+            sys.stderr.write(
+                f"cop: re-checked {len(watch_update.refreshed_reports)} file(s) "
+                f"and forgot {len(watch_update.removed_filenames)} in "
+                f"{(time.perf_counter() - started_at) * 1000:.1f} ms, "
+                f"{watch_session.calculate_violations_count()} violation(s) in total\n"
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        file_watcher.stop_watching()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+import json
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin.aggregation import ViolationStatistics, find_code_owners, parse_code_owners
+from community_of_python_flake8_plugin.cli import main
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+CODE_OWNERS_LINES: typing.Final = [
+    "# comment",
+    "*.py @python",
+    "/src/ @core  # trailing comment",
+    "docs/* @writers",
+    "**/generated/** @robots",
+    "/src/vendored/",
+]
+
+
+@pytest.mark.parametrize(
+    ("repository_path", "expected_owners"),
+    [
+        ("setup.py", ("@python",)),
+        ("src/package/module.py", ("@core",)),
+        ("docs/index.md", ("@writers",)),
+        ("docs/api/index.md", ("(unowned)",)),
+        ("tests/generated/cases/module.py", ("@robots",)),
+        ("src/vendored/module.py", ("(unowned)",)),
+        ("README.md", ("(unowned)",)),
+    ],
+)
+def test_find_code_owners_follows_last_matching_rule(repository_path: str, expected_owners: tuple[str, ...]) -> None:
+    assert find_code_owners(repository_path, parse_code_owners(CODE_OWNERS_LINES)) == expected_owners
+
+
+def test_violation_statistics_counts_per_code_directory_and_owner() -> None:
+    violation_statistics: typing.Final = ViolationStatistics(parse_code_owners(["/src/ @core", "/src/api/ @api @core"]))
+    for one_filename, one_code in [
+        ("src/api/views.py", "COP012"),
+        ("src/api/views.py", "COP012"),
+        ("./src/models.py", "COP008"),
+        ("tests/test_models.py", "COP012"),
+    ]:
+        violation_statistics.record_violation(one_filename, one_code)
+    assert violation_statistics.build_summary() == {
+        "files": 0,
+        "violations": 4,
+        "codes": {"COP012": 3, "COP008": 1},
+        "directories": {"src/api": {"COP012": 2}, "src": {"COP008": 1}, "tests": {"COP012": 1}},
+        "owners": {"@api": {"COP012": 2}, "@core": {"COP012": 2, "COP008": 1}, "(unowned)": {"COP012": 1}},
+    }
+
+
+def test_main_statistics_prints_only_the_summary(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],  # noqa: COP006
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "package").mkdir()
+    (tmp_path / "package" / "module.py").write_text("class Ab:\n    pass\n")
+    (tmp_path / "clean.py").write_text("import os\n")
+
+    assert main(["--statistics", "--jobs", "1", "."]) == 1
+    assert json.loads(capsys.readouterr().out) == {
+        "files": 2,
+        "violations": 2,
+        "codes": {"COP008": 1, "COP012": 1},
+        "directories": {"package": {"COP008": 1, "COP012": 1}},
+    }
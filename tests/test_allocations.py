@@ -0,0 +1,241 @@
+"""Allocation budgets: every check must stay within the memory it was recorded to use on fixed corpora.
+
+Each check runs alone under tracemalloc on a corpus that trips it on every statement and on one written
+to the rules. Two figures are taken per 1,000 AST nodes: the blocks still allocated once the check is
+done, which counts violations, per-node records and caches, and the peak traced size while it runs, which
+is where temporary lists and strings built for every node show up. Both are compared with the budgets
+recorded below, so that an allocation regression in a hot loop fails here rather than in a large run.
+When an increase is intended, record the figures from the failure message.
+"""
+
+from __future__ import annotations
+import ast
+import dataclasses
+import gc
+import sys
+import tracemalloc
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin.engine import collect_check_classes, run_checks
+from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+from community_of_python_flake8_plugin.violations import Violation
+
+
+if typing.TYPE_CHECKING:
+    from community_of_python_flake8_plugin.engine import CheckClass, CheckContext
+
+
+pytestmark = pytest.mark.skipif(sys.implementation.name != "cpython", reason="budgets are recorded on CPython")
+
+CORPUS_COPIES_COUNT: typing.Final = 100
+# Figures vary slightly between runs and CPython versions; a check that allocates per node goes far beyond this
+BUDGET_HEADROOM: typing.Final = 1.3
+# Checks that keep next to nothing still get a few blocks and half a KiB of room
+BUDGET_SLACK_BLOCKS: typing.Final = 5
+BUDGET_SLACK_KIBIBYTES: typing.Final = 0.5
+CORPUS_TEMPLATES: typing.Final = {
+    "violating": """from os import path as path_{index}
+settings_{index} = {{"key": {index}}}
+count_{index}: int = {index}
+x{index} = lambda ab: [cd for cd in ab]
+
+
+class Model{index}(ModelBase):
+    pass
+
+
+@dataclasses.dataclass
+class Record{index}:
+    field_value: int = 0
+
+
+async def get_value_{index}():
+    pass
+
+
+def widget_{index}(items):
+    result = [entry for entry in items]
+    for item in items:
+        print(item)
+    return result
+""",
+    "conforming": """import typing
+SETTINGS_{index}: typing.Final = types.MappingProxyType({{"key": {index}}})
+
+
+@typing.final
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class ServiceRecord{index}:
+    field_value: str
+
+
+@typing.final
+class ServiceModel{index}(ModelBase):
+    async def fetch_values(self, all_items: list[int]) -> list[int]:
+        collected_values: typing.Final = []
+        for one_item in all_items:
+            collected_values.append(one_item * 2)
+        return collected_values
+""",
+}
+
+
+@typing.final
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class AllocationFigures:
+    """Allocations of one check per 1,000 AST nodes of the corpus."""
+
+    retained_blocks: float
+    peak_kibibytes: float
+
+    def check_is_within(self, allocation_budget: AllocationFigures) -> bool:
+        return (
+            self.retained_blocks <= allocation_budget.retained_blocks * BUDGET_HEADROOM + BUDGET_SLACK_BLOCKS
+            and self.peak_kibibytes <= allocation_budget.peak_kibibytes * BUDGET_HEADROOM + BUDGET_SLACK_KIBIBYTES
+        )
+
+
+# Recorded on CPython 3.11
+ALLOCATION_BUDGETS: typing.Final = {
+    "AsyncGetPrefixCheck": {
+        "violating": AllocationFigures(retained_blocks=422, peak_kibibytes=40.0),
+        "conforming": AllocationFigures(retained_blocks=204, peak_kibibytes=20.5),
+    },
+    "DataclassConfigCheck": {
+        "violating": AllocationFigures(retained_blocks=14, peak_kibibytes=1.1),
+        "conforming": AllocationFigures(retained_blocks=0, peak_kibibytes=0.4),
+    },
+    "FinalClassCheck": {
+        "violating": AllocationFigures(retained_blocks=28, peak_kibibytes=2.1),
+        "conforming": AllocationFigures(retained_blocks=1, peak_kibibytes=0.8),
+    },
+    "COP015ForLoopOnePrefixCheck": {
+        "violating": AllocationFigures(retained_blocks=449, peak_kibibytes=41.7),
+        "conforming": AllocationFigures(retained_blocks=204, peak_kibibytes=20.5),
+    },
+    "FunctionVerbCheck": {
+        "violating": AllocationFigures(retained_blocks=422, peak_kibibytes=40.0),
+        "conforming": AllocationFigures(retained_blocks=204, peak_kibibytes=20.5),
+    },
+    "MappingProxyCheck": {
+        "violating": AllocationFigures(retained_blocks=14, peak_kibibytes=1.1),
+        "conforming": AllocationFigures(retained_blocks=0, peak_kibibytes=0.6),
+    },
+    "COP002StdlibImportCheck": {
+        "violating": AllocationFigures(retained_blocks=14, peak_kibibytes=1.2),
+        "conforming": AllocationFigures(retained_blocks=0, peak_kibibytes=0.4),
+    },
+    "COP004NameLengthCheck": {
+        "violating": AllocationFigures(retained_blocks=506, peak_kibibytes=45.3),
+        "conforming": AllocationFigures(retained_blocks=204, peak_kibibytes=20.5),
+    },
+    "ScalarAnnotationCheck": {
+        "violating": AllocationFigures(retained_blocks=14, peak_kibibytes=5.5),
+        "conforming": AllocationFigures(retained_blocks=0, peak_kibibytes=2.7),
+    },
+    "TempVarCheck": {
+        "violating": AllocationFigures(retained_blocks=0, peak_kibibytes=3.3),
+        "conforming": AllocationFigures(retained_blocks=0, peak_kibibytes=1.7),
+    },
+}
+
+
+def build_corpus_source(corpus_name: str) -> str:
+    return "\n\n".join(
+        CORPUS_TEMPLATES[corpus_name].format(index=one_index) for one_index in range(CORPUS_COPIES_COUNT)
+    )
+
+
+def measure_check_allocations(check_class: CheckClass, source_text: str) -> AllocationFigures:
+    """Run the check on a fresh tree under tracemalloc, after a first run has filled the caches it keeps."""
+    run_checks(ast.parse(source_text), [check_class])
+    syntax_tree: typing.Final = ast.parse(source_text)
+    kilonodes_count: typing.Final = sum(1 for _ in ast.walk(syntax_tree)) / 1000
+    # A coverage tracer allocates for every frame it sees, which would be charged to the check
+    previous_tracer: typing.Final = sys.gettrace()
+    sys.settrace(None)
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        snapshot_before: typing.Final = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline_bytes: typing.Final = tracemalloc.get_traced_memory()[0]
+        # The violations are kept alive until the second snapshot
+        found_violations: typing.Final = run_checks(syntax_tree, [check_class])
+        peak_bytes: typing.Final = tracemalloc.get_traced_memory()[1] - baseline_bytes
+        # Garbage in reference cycles, such as classes built per call, is not retained by the check
+        gc.collect()
+        snapshot_after: typing.Final = tracemalloc.take_snapshot()
+        del found_violations
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+        sys.settrace(previous_tracer)
+    snapshot_filters: typing.Final = (tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),)
+    retained_blocks: typing.Final = sum(
+        one_difference.count_diff
+        for one_difference in snapshot_after.filter_traces(snapshot_filters).compare_to(
+            snapshot_before.filter_traces(snapshot_filters), "filename"
+        )
+    )
+    return AllocationFigures(
+        retained_blocks=retained_blocks / kilonodes_count, peak_kibibytes=peak_bytes / 1024 / kilonodes_count
+    )
+
+
+@typing.final
+class QuietNameCheck:
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.Name})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.Name})
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset()
+
+    def visit_Name(self, ast_node: ast.Name, check_context: CheckContext) -> None:
+        pass
+
+
+@typing.final
+class WastefulNameCheck:
+    """Reports every name it sees with a message formatted for it, so each name costs a few blocks."""
+
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.Name})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.Name})
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset()
+
+    def visit_Name(self, ast_node: ast.Name, check_context: CheckContext) -> None:
+        check_context.violations.append(
+            Violation(
+                line_number=ast_node.lineno,
+                column_number=ast_node.col_offset,
+                violation_code=ViolationCodeItem(code="TST001", description=f"Name {ast_node.id} is reported"),
+            )
+        )
+
+
+def test_every_check_has_a_budget() -> None:
+    assert {one_check_class.__name__ for one_check_class in collect_check_classes()} <= set(ALLOCATION_BUDGETS)
+
+
+@pytest.mark.parametrize("corpus_name", list(CORPUS_TEMPLATES))
+@pytest.mark.parametrize("check_class", collect_check_classes(), ids=lambda one_check_class: one_check_class.__name__)
+def test_check_stays_within_allocation_budget(check_class: CheckClass, corpus_name: str) -> None:
+    allocation_figures: typing.Final = measure_check_allocations(check_class, build_corpus_source(corpus_name))
+    assert allocation_figures.check_is_within(ALLOCATION_BUDGETS[check_class.__name__][corpus_name]), (
+        f"{check_class.__name__} on the {corpus_name} corpus: {allocation_figures}"
+    )
+
+
+def test_allocation_figures_detect_per_node_allocations() -> None:
+    corpus_source: typing.Final = build_corpus_source("conforming")
+    syntax_tree: typing.Final = ast.parse(corpus_source)
+    names_per_kilonode: typing.Final = (
+        sum(isinstance(one_node, ast.Name) for one_node in ast.walk(syntax_tree))
+        * 1000
+        / sum(1 for _ in ast.walk(syntax_tree))
+    )
+    quiet_figures: typing.Final = measure_check_allocations(QuietNameCheck, corpus_source)
+    wasteful_figures: typing.Final = measure_check_allocations(WastefulNameCheck, corpus_source)
+    assert wasteful_figures.retained_blocks - quiet_figures.retained_blocks >= names_per_kilonode
+    assert not wasteful_figures.check_is_within(quiet_figures)
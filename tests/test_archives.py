@@ -0,0 +1,112 @@
+from __future__ import annotations
+import io
+import tarfile
+import typing
+import zipfile
+
+from community_of_python_flake8_plugin.archives import check_archive, read_archive_members, run_archives
+from community_of_python_flake8_plugin.cli import main
+from community_of_python_flake8_plugin.runner import check_source, collect_python_files
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Mapping
+
+    import pytest
+
+
+ARCHIVE_MEMBERS: typing.Final = {
+    "acme/__init__.py": "",
+    "acme/models.py": "class BaseModel:\n    pass\n",
+    "acme/settings.py": "settings_values = {'debug': True}\n",
+    "acme/broken.py": "def broken(:\n",
+    "acme/data.json": "{}",
+    "acme/__pycache__/models.py": "class Ab:\n    pass\n",
+}
+EXPECTED_MEMBER_NAMES: typing.Final = ["acme/__init__.py", "acme/models.py", "acme/settings.py", "acme/broken.py"]
+
+
+def write_zip_archive(archive_path: pathlib.Path, archive_members: Mapping[str, str]) -> str:
+    with zipfile.ZipFile(archive_path, "w") as zip_archive:
+        zip_archive.writestr("acme/", "")
+        for one_name, one_source in archive_members.items():
+            zip_archive.writestr(one_name, one_source)
+    return str(archive_path)
+
+
+def write_tar_archive(archive_path: pathlib.Path, archive_members: Mapping[str, str]) -> str:
+    with tarfile.open(archive_path, "w:gz") as tar_archive:
+        for one_name, one_source in archive_members.items():
+            member_info = tarfile.TarInfo(one_name)
+            member_info.size = len(one_source.encode())
+            tar_archive.addfile(member_info, io.BytesIO(one_source.encode()))
+    return str(archive_path)
+
+
+def test_members_are_read_in_archive_order(tmp_path: pathlib.Path) -> None:
+    for one_archive in (
+        write_zip_archive(tmp_path / "acme-1.0-py3-none-any.whl", ARCHIVE_MEMBERS),
+        write_tar_archive(tmp_path / "acme-1.0.tar.gz", ARCHIVE_MEMBERS),
+    ):
+        assert [one_name for one_name, _ in read_archive_members(one_archive)] == EXPECTED_MEMBER_NAMES
+
+
+def test_check_archive_matches_checking_the_members(tmp_path: pathlib.Path) -> None:
+    archive_filename: typing.Final = write_tar_archive(tmp_path / "acme-1.0.tgz", ARCHIVE_MEMBERS)
+    assert [
+        [one_violation.render_line() for one_violation in one_report.violations]
+        for one_report in check_archive(archive_filename)
+    ] == [
+        [
+            one_violation.render_line()
+            for one_violation in check_source(ARCHIVE_MEMBERS[one_name], f"{archive_filename}!{one_name}")
+        ]
+        for one_name in EXPECTED_MEMBER_NAMES
+    ]
+
+
+def test_check_archive_reports_damaged_archives(tmp_path: pathlib.Path) -> None:
+    archive_path: typing.Final = tmp_path / "acme.zip"
+    archive_path.write_bytes(b"not a zip file")
+    assert [
+        one_violation.render_line()
+        for one_report in check_archive(str(archive_path))
+        for one_violation in one_report.violations
+    ] == [f"{archive_path}:1:1: E902 Cannot read archive: File is not a zip file"]
+
+
+def test_check_archive_reports_undecodable_members_alone(tmp_path: pathlib.Path) -> None:
+    archive_path: typing.Final = tmp_path / "acme-1.0-py3-none-any.whl"
+    with zipfile.ZipFile(archive_path, "w") as zip_archive:
+        zip_archive.writestr("acme/legacy.py", "greeting_text = 'gr\u00fc\u00dfe'\n".encode("latin-1"))
+        zip_archive.writestr("acme/models.py", ARCHIVE_MEMBERS["acme/models.py"])
+    assert [
+        [one_violation.violation_code.code for one_violation in one_report.violations]
+        for one_report in check_archive(str(archive_path))
+    ] == [["E999"], ["COP012"]]
+
+
+def test_run_archives_keeps_input_order(tmp_path: pathlib.Path) -> None:
+    archive_filenames: typing.Final = [
+        write_zip_archive(tmp_path / f"acme{one_index}.zip", {f"module{one_index}.py": "settings_values = {}\n"})
+        for one_index in range(6)
+    ]
+    assert [
+        one_report.filename for one_report in run_archives(archive_filenames, jobs_count=3, pool_kind="thread")
+    ] == [f"{one_archive}!module{one_index}.py" for one_index, one_archive in enumerate(archive_filenames)]
+
+
+def test_main_lints_archives(
+    tmp_path: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],  # noqa: COP006
+) -> None:
+    write_zip_archive(tmp_path / "acme-1.0-py3-none-any.whl", ARCHIVE_MEMBERS)
+    (tmp_path / "module.py").write_text("settings_values = {}\n")
+    assert collect_python_files([str(tmp_path)], file_suffixes=(".whl",)) == [
+        f"{tmp_path.as_posix()}/acme-1.0-py3-none-any.whl"
+    ]
+    assert main([str(tmp_path), "--archives", "--jobs", "1"]) == 1
+    lint_output: typing.Final = capsys.readouterr().out
+    assert "acme-1.0-py3-none-any.whl!acme/settings.py:1:1: COP013" in lint_output
+    assert f"{tmp_path.as_posix()}/module.py:" not in lint_output
@@ -0,0 +1,14 @@
+from __future__ import annotations
+import ast
+import typing
+
+from community_of_python_flake8_plugin.capabilities import FileCapabilities
+
+
+def test_file_capabilities_histogram() -> None:
+    file_capabilities: typing.Final = FileCapabilities.collect_from_tree(
+        ast.parse("import os\nfirst_value = 1\nsecond_value = 2\n")
+    )
+    assert file_capabilities.node_type_counts[ast.Assign] == 2  # noqa: PLR2004
+    assert file_capabilities.has_any_node_type({ast.ClassDef, ast.Import})
+    assert not file_capabilities.has_any_node_type({ast.ClassDef, ast.AsyncFunctionDef, ast.ImportFrom})
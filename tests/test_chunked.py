@@ -0,0 +1,102 @@
+from __future__ import annotations
+import functools
+import io
+import random
+import tokenize
+import tracemalloc
+import typing
+
+import pytest
+
+from benchmarks import corpus
+from community_of_python_flake8_plugin.chunked import StatementChunkReader
+from community_of_python_flake8_plugin.runner import check_source, check_source_stream, open_source_buffer
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+MIXED_SOURCE: typing.Final = """\
+# leading comment
+@first_decorator
+# between decorators
+@second_decorator
+def decorated_function(): pass
+if condition_value:
+    annotated_value: int = 1
+# before else
+else:
+    pass
+try:
+    pass
+except ValueError:
+    pass
+finally:
+    pass
+first_value = 1; second_value = 2  # noqa: COP011
+class Base: pass
+class Child(Base): pass
+__all__ = ["Child"]
+"""
+BROKEN_SOURCES: typing.Final = (
+    "import os\n\nvalues = (1,\n\ndef check_value():\n    pass\n",
+    "import os\n\ntext_value = '''unterminated\n\nclass Ab:\n    pass\n",
+    "import os\nif condition_value:\n    pass\n  else:\n    pass\n",
+)
+
+
+def test_statement_chunks_keep_decorators_and_clauses_with_their_statement() -> None:
+    assert [
+        one_chunk.first_line_number for one_chunk in StatementChunkReader(io.StringIO(MIXED_SOURCE)).generate_chunks()
+    ] == [1, 6, 11, 17, 18, 19, 20]
+
+
+@pytest.mark.parametrize("batch_bytes", [1, 1024 * 1024])
+@pytest.mark.parametrize(
+    "source_text",
+    [MIXED_SOURCE, corpus.generate_module(random.Random(0), 40), *BROKEN_SOURCES],
+)
+def test_chunked_checking_matches_whole_module(source_text: str, batch_bytes: int) -> None:
+    assert check_source_stream(lambda: io.StringIO(source_text), "module.py", batch_bytes) == check_source(
+        source_text, "module.py"
+    )
+
+
+@pytest.mark.parametrize("source_bytes", [b"# coding: no-such-codec\nvalue = 1\n", b"value = '\xff\xfe'\n"])
+def test_chunked_checking_reports_undecodable_sources(source_bytes: bytes) -> None:
+    assert [
+        one_violation.violation_code.code
+        for one_violation in check_source_stream(functools.partial(open_source_buffer, source_bytes), "module.py")
+    ] == ["E999"]
+
+
+def write_clean_module(module_path: pathlib.Path, statements_count: int) -> None:
+    module_path.write_text(
+        "".join(
+            f"@typing.final\nclass CustomerAccount{one_index}:\n"
+            "    def calculate_balance(self, payment_amounts: list[int]) -> int:\n"
+            "        return sum(payment_amounts)\n"
+            for one_index in range(statements_count)
+        )
+    )
+
+
+def measure_peak_memory(check_module: typing.Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        assert check_module() == []
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_chunked_checking_peak_memory_stays_below_small_whole_tree(tmp_path: pathlib.Path) -> None:
+    small_module: typing.Final = tmp_path / "small.py"
+    large_module: typing.Final = tmp_path / "large.py"
+    write_clean_module(small_module, 300)
+    write_clean_module(large_module, 1200)
+    # Peaks vary with garbage collection timing, so the large module is compared with a module four times smaller
+    assert measure_peak_memory(
+        lambda: check_source_stream(functools.partial(tokenize.open, large_module), "large.py", batch_bytes=4096)
+    ) < measure_peak_memory(lambda: check_source(small_module.read_text(), "small.py"))
@@ -0,0 +1,140 @@
+"""Growth tests: every check must scale about linearly with the size of its worst-case input.
+
+Each check is timed on modules built from N, 2N, 4N and 8N copies of a statement it inspects, laid out
+at module level, in one class body and in one function body, where parent lookups and per-scope scans
+used to repeat. The growth exponent is the slope of log time over log size, so it does not depend on
+how fast the machine is.
+"""
+
+from __future__ import annotations
+import ast
+import gc
+import math
+import statistics
+import textwrap
+import time
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin.engine import collect_check_classes, run_checks
+from community_of_python_flake8_plugin.utils import find_parent_class_definition
+
+
+if typing.TYPE_CHECKING:
+    from community_of_python_flake8_plugin.engine import CheckClass, CheckContext
+    from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+
+
+BASE_STATEMENTS_COUNT: typing.Final = 100
+SIZE_FACTORS: typing.Final = (1, 2, 4, 8)
+TIMING_REPEATS: typing.Final = 3
+# A check is re-measured once before failing, as a busy machine can slow down any single measurement
+MEASUREMENT_ATTEMPTS: typing.Final = 2
+# Linear is 1.0 and n log n stays below 1.2, while the quadratic checks that slipped in before measured 2
+MAX_GROWTH_EXPONENT: typing.Final = 1.4
+# Statements that each check inspects; "{index}" keeps the names of the copies apart
+WORST_CASE_STATEMENTS: typing.Final = {
+    "AsyncGetPrefixCheck": "async def get_value_{index}(): pass",
+    "DataclassConfigCheck": "@dataclasses.dataclass\nclass Record{index}:\n    field_value: int = 0",
+    "FinalClassCheck": "class Model{index}(Model{index}Base):\n    pass",
+    "COP015ForLoopOnePrefixCheck": "for item in items_{index}:\n    total = [entry for entry in item]",
+    "FunctionVerbCheck": "def widget_{index}(): pass",
+    "MappingProxyCheck": "settings_{index}: dict[str, int] = {{'key': {index}}}",
+    "COP002StdlibImportCheck": "from os import path as path_{index}",
+    "COP004NameLengthCheck": "x{index} = lambda ab: [cd for cd in ab]",
+    "ScalarAnnotationCheck": "count_{index}: int = {index}",
+    "TempVarCheck": "def compute_{index}():\n    result = {index}\n    return result",
+}
+LAYOUT_HEADERS: typing.Final = {"module": None, "class": "class Container:", "function": "def run_container():"}
+
+
+def build_source(statement_template: str, statements_count: int, layout_header: str | None) -> str:
+    statements_source: typing.Final = "\n".join(
+        statement_template.format(index=one_index) for one_index in range(statements_count)
+    )
+    if layout_header is None:
+        return statements_source
+    return f"{layout_header}\n{textwrap.indent(statements_source, '    ')}"
+
+
+def measure_check_seconds(check_class: CheckClass, source_texts: list[str]) -> list[float]:
+    """Time one check on fresh trees of every source, so that no per-tree cache is reused.
+
+    Sizes take turns within each round, so a slow spell of the machine does not land on a single size.
+    """
+    syntax_trees: typing.Final = [[ast.parse(one_source) for one_source in source_texts] for _ in range(TIMING_REPEATS)]
+    fastest_seconds: typing.Final = [math.inf] * len(source_texts)
+    # Collections triggered by earlier allocations would be charged to whichever size runs next
+    gc.collect()
+    gc.disable()
+    try:
+        for one_round in syntax_trees:
+            for one_index, one_tree in enumerate(one_round):
+                started_at = time.perf_counter()
+                run_checks(one_tree, [check_class])
+                fastest_seconds[one_index] = min(fastest_seconds[one_index], time.perf_counter() - started_at)
+    finally:
+        gc.enable()
+    return fastest_seconds
+
+
+def calculate_growth_exponent(
+    check_class: CheckClass,
+    statement_template: str,
+    layout_name: str,
+    base_statements_count: int = BASE_STATEMENTS_COUNT,
+) -> float:
+    """Fit the exponent k of time ~ size^k, keeping the lowest of the attempts."""
+    statement_counts: typing.Final = [base_statements_count * one_factor for one_factor in SIZE_FACTORS]
+    source_texts: typing.Final = [
+        build_source(statement_template, one_size, LAYOUT_HEADERS[layout_name]) for one_size in statement_counts
+    ]
+    growth_exponent = math.inf
+    for _ in range(MEASUREMENT_ATTEMPTS):
+        check_timings = measure_check_seconds(check_class, source_texts)
+        growth_exponent = min(
+            growth_exponent,
+            statistics.linear_regression(
+                [math.log(one_size) for one_size in statement_counts],
+                [math.log(one_timing) for one_timing in check_timings],
+            ).slope,
+        )
+        if growth_exponent < MAX_GROWTH_EXPONENT:
+            break
+    return growth_exponent
+
+
+@typing.final
+class QuadraticParentCheck:
+    """Looks up the enclosing class of every annotated assignment from the root, as checks once did."""
+
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.AnnAssign})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.AnnAssign})
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset()
+
+    def visit_AnnAssign(self, ast_node: ast.AnnAssign, check_context: CheckContext) -> None:
+        find_parent_class_definition(check_context.syntax_tree, ast_node)
+
+
+def test_every_check_has_a_worst_case_shape() -> None:
+    assert {one_check_class.__name__ for one_check_class in collect_check_classes()} <= set(WORST_CASE_STATEMENTS)
+
+
+@pytest.mark.parametrize("layout_name", list(LAYOUT_HEADERS))
+@pytest.mark.parametrize("check_class", collect_check_classes(), ids=lambda one_check_class: one_check_class.__name__)
+def test_check_scales_linearly(check_class: CheckClass, layout_name: str) -> None:
+    growth_exponent: typing.Final = calculate_growth_exponent(
+        check_class, WORST_CASE_STATEMENTS[check_class.__name__], layout_name
+    )
+    assert growth_exponent < MAX_GROWTH_EXPONENT, f"{check_class.__name__} grows as n^{growth_exponent:.2f}"
+
+
+def test_growth_exponent_detects_quadratic_checks() -> None:
+    # Fewer statements keep the quadratic check fast; its growth still dominates the fixed costs
+    assert (
+        calculate_growth_exponent(
+            QuadraticParentCheck, WORST_CASE_STATEMENTS["ScalarAnnotationCheck"], "class", BASE_STATEMENTS_COUNT // 2
+        )
+        > MAX_GROWTH_EXPONENT
+    )
@@ -0,0 +1,153 @@
+from __future__ import annotations
+import json
+import socket
+import threading
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin import distributed, runner
+from community_of_python_flake8_plugin.cli import main
+from community_of_python_flake8_plugin.distributed import (
+    BatchCoordinator,
+    BatchQueue,
+    BatchRequestHandler,
+    parse_server_address,
+    run_local_cluster,
+    run_worker,
+)
+from community_of_python_flake8_plugin.runner import run_files
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+def build_module_files(tmp_path: pathlib.Path, modules_count: int) -> list[str]:
+    module_filenames: typing.Final = []
+    for one_index in range(modules_count):
+        module_path = tmp_path / f"module{one_index:02}.py"
+        module_path.write_text(f"class Ab{one_index}:\n    pass\n\nsettings_values = {{}}\n")
+        module_filenames.append(str(module_path))
+    return module_filenames
+
+
+def render_report_lines(filenames: list[str], file_reports: typing.Iterable[typing.Any]) -> list[str]:
+    reported_filenames: typing.Final[list[str]] = []
+    rendered_lines: typing.Final[list[str]] = []
+    for one_report in file_reports:
+        reported_filenames.append(one_report.filename)
+        rendered_lines.extend(one_violation.render_line() for one_violation in one_report.violations)
+    assert reported_filenames == filenames
+    return rendered_lines
+
+
+def test_parse_server_address() -> None:
+    assert parse_server_address("ci-runner:7700") == ("ci-runner", 7700)
+    assert parse_server_address("[::1]:7700") == ("::1", 7700)
+    with pytest.raises(ValueError, match="must look like HOST:PORT"):
+        parse_server_address("ci-runner")
+
+
+def test_local_cluster_matches_a_single_process(tmp_path: pathlib.Path) -> None:
+    module_filenames: typing.Final = build_module_files(tmp_path, 20)
+    assert render_report_lines(
+        module_filenames, run_local_cluster(module_filenames, workers_count=3, files_per_batch=3)
+    ) == render_report_lines(module_filenames, run_files(module_filenames))
+
+
+def test_batches_of_failed_workers_are_retried(tmp_path: pathlib.Path) -> None:
+    module_filenames: typing.Final = build_module_files(tmp_path, 6)
+    batch_coordinator: typing.Final = BatchCoordinator(module_filenames, ("127.0.0.1", 0), files_per_batch=2)
+
+    def run_failing_worker() -> None:
+        # Takes the first batch and disconnects without answering
+        with socket.create_connection(batch_coordinator.fetch_server_address()) as worker_socket:
+            worker_socket.makefile("rb").readline()
+        run_worker(batch_coordinator.fetch_server_address())
+
+    worker_thread: typing.Final = threading.Thread(target=run_failing_worker)
+    worker_thread.start()
+    assert render_report_lines(module_filenames, batch_coordinator.iter_reports()) == render_report_lines(
+        module_filenames, run_files(module_filenames)
+    )
+    worker_thread.join()
+
+
+def test_batches_failing_too_often_are_reported(tmp_path: pathlib.Path) -> None:
+    module_filenames: typing.Final = build_module_files(tmp_path, 2)
+    batch_coordinator: typing.Final = BatchCoordinator(module_filenames, ("127.0.0.1", 0), max_attempts=2)
+
+    def run_malformed_workers() -> None:
+        for _ in range(2):
+            with socket.create_connection(batch_coordinator.fetch_server_address()) as worker_socket:
+                assert json.loads(worker_socket.makefile("rb").readline())["batch_id"] == 0
+                worker_socket.sendall(b"not json\n")
+                worker_socket.makefile("rb").readline()
+
+    worker_thread: typing.Final = threading.Thread(target=run_malformed_workers)
+    worker_thread.start()
+    assert render_report_lines(module_filenames, batch_coordinator.iter_reports()) == [
+        f"{one_filename}:1:1: E902 Cannot check file: its batch failed 2 times" for one_filename in module_filenames
+    ]
+    worker_thread.join()
+
+
+def test_workers_gone_before_the_last_answer_are_ignored() -> None:
+    @typing.final
+    class BrokenPipeFile:
+        def write(self, _: bytes) -> int:  # noqa: COP007
+            raise BrokenPipeError
+
+    request_handler: typing.Final = object.__new__(BatchRequestHandler)
+    request_handler.wfile = typing.cast("typing.Any", BrokenPipeFile())
+    request_handler.run_batch_exchange(BatchQueue([], files_per_batch=1, max_attempts=1, worker_wait_seconds=0))
+
+
+def test_files_failing_in_a_worker_are_reported_alone(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    module_filenames: typing.Final = build_module_files(tmp_path, 4)
+    check_file: typing.Final = runner.check_file
+
+    def check_failing_file(filename: str, *check_arguments: typing.Any) -> typing.Any:  # noqa: ANN401
+        if filename == module_filenames[1]:
+            raise RecursionError("maximum recursion depth exceeded")
+        return check_file(filename, *check_arguments)
+
+    monkeypatch.setattr(distributed, "check_file", check_failing_file)
+    batch_coordinator: typing.Final = BatchCoordinator(module_filenames, ("127.0.0.1", 0), files_per_batch=4)
+    worker_thread: typing.Final = threading.Thread(target=run_worker, args=(batch_coordinator.fetch_server_address(),))
+    worker_thread.start()
+    report_lines: typing.Final = render_report_lines(module_filenames, batch_coordinator.iter_reports())
+    worker_thread.join()
+    assert (
+        f"{module_filenames[1]}:1:1: E902 Cannot check file: RecursionError: maximum recursion depth exceeded"
+        in report_lines
+    )
+    assert sum(" COP012 " in one_line for one_line in report_lines) == 3  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    ("worker_wait_seconds", "are_local_workers_gone"), [(0.0, False), (60.0, True)], ids=["timeout", "workers-gone"]
+)
+def test_batches_without_workers_are_reported(
+    tmp_path: pathlib.Path,
+    worker_wait_seconds: float,
+    are_local_workers_gone: bool,
+) -> None:
+    module_filenames: typing.Final = build_module_files(tmp_path, 3)
+    batch_coordinator: typing.Final = BatchCoordinator(
+        module_filenames, ("127.0.0.1", 0), files_per_batch=2, worker_wait_seconds=worker_wait_seconds
+    )
+    assert render_report_lines(module_filenames, batch_coordinator.iter_reports(lambda: are_local_workers_gone)) == [
+        f"{one_filename}:1:1: E902 Cannot check file: no worker was left to check its batch"
+        for one_filename in module_filenames
+    ]
+
+
+def test_main_runs_a_local_cluster(
+    tmp_path: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],  # noqa: COP006
+) -> None:
+    build_module_files(tmp_path, 4)
+    assert main([str(tmp_path), "--coordinator", "127.0.0.1:0", "--local-workers", "2"]) == 1
+    assert capsys.readouterr().out.count("COP013") == 4  # noqa: PLR2004
@@ -0,0 +1,122 @@
+from __future__ import annotations
+import ast
+import importlib.metadata
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin import engine
+from community_of_python_flake8_plugin.plugin import CommunityOfPythonFlake8Plugin
+from community_of_python_flake8_plugin.violation_codes import ViolationCodeItem
+from community_of_python_flake8_plugin.violations import Violation
+
+
+PRINT_CALL: typing.Final = ViolationCodeItem(code="ACM001", description="Do not call print")
+
+
+@typing.final
+class PrintCallCheck:
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.Call})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = required_node_types
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset({PRINT_CALL})
+
+    def __init__(self, syntax_tree: ast.AST) -> None:  # noqa: ARG002
+        self.violations: list[Violation] = []
+
+    def visit_Call(self, ast_node: ast.Call) -> None:
+        if isinstance(ast_node.func, ast.Name) and ast_node.func.id == "print":
+            self.violations.append(
+                Violation(line_number=ast_node.lineno, column_number=ast_node.col_offset, violation_code=PRINT_CALL)
+            )
+
+
+@typing.final
+class SharedPrintCallCheck:
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.Call})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = required_node_types
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset({PRINT_CALL})
+    instances_count: typing.ClassVar[int] = 0
+
+    def __init__(self) -> None:
+        SharedPrintCallCheck.instances_count += 1
+
+    def visit_Call(self, ast_node: ast.Call, check_context: engine.CheckContext) -> None:
+        if isinstance(ast_node.func, ast.Name) and ast_node.func.id == "print":
+            check_context.violations.append(
+                Violation(line_number=ast_node.lineno, column_number=ast_node.col_offset, violation_code=PRINT_CALL)
+            )
+
+
+@typing.final
+class MissingHandlerCheck:
+    required_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.Call})
+    handled_node_types: typing.ClassVar[frozenset[type[ast.AST]]] = required_node_types
+    violation_codes: typing.ClassVar[frozenset[ViolationCodeItem]] = frozenset({PRINT_CALL})
+
+
+@pytest.fixture
+def registered_rule_pack(monkeypatch: pytest.MonkeyPatch) -> typing.Iterator[None]:
+    rule_pack_entry_point: typing.Final = importlib.metadata.EntryPoint(
+        name="acme", value=f"{__name__}:PrintCallCheck", group=engine.CHECKS_ENTRY_POINT_GROUP
+    )
+    monkeypatch.setattr(
+        importlib.metadata,
+        "entry_points",
+        lambda **selection_parameters: (
+            [rule_pack_entry_point] if selection_parameters["group"] == engine.CHECKS_ENTRY_POINT_GROUP else []
+        ),
+    )
+    engine.collect_check_classes.cache_clear()
+    yield
+    engine.collect_check_classes.cache_clear()
+
+
+@pytest.mark.usefixtures("registered_rule_pack")
+def test_rule_pack_checks_share_the_traversal() -> None:
+    assert PrintCallCheck in engine.collect_check_classes()
+    assert sorted(
+        one_violation_item[2].split(" ")[0]
+        for one_violation_item in CommunityOfPythonFlake8Plugin(ast.parse("class Widget:\n    print(1)\n")).run()
+    ) == ["ACM001", "COP008", "COP012"]
+
+
+def test_check_classes_must_declare_handlers() -> None:
+    with pytest.raises(TypeError, match="handles Call without a handler"):
+        engine.validate_check_class(MissingHandlerCheck)
+
+
+def test_builtin_checks_declare_their_codes() -> None:
+    assert {
+        one_code.code
+        for one_check_class in engine.collect_check_classes()
+        for one_code in one_check_class.violation_codes
+    } >= {f"COP0{one_number:02}" for one_number in range(2, 16)}
+
+
+def test_shared_checks_are_instantiated_once() -> None:
+    found_lines: typing.Final = [
+        sorted(
+            one_violation.line_number
+            for one_violation in engine.run_checks(ast.parse(one_source), [SharedPrintCallCheck])
+        )
+        for one_source in ("print(1)\n", "len([])\nprint(2)\n", "print(3)\nprint(4)\n")
+    ]
+    assert found_lines == [[1], [2], [1, 2]]
+    assert SharedPrintCallCheck.instances_count == 1
+    assert engine.fetch_check_dispatch((SharedPrintCallCheck,)) is engine.fetch_check_dispatch((SharedPrintCallCheck,))
+
+
+def test_per_file_checks_join_the_shared_traversal() -> None:
+    assert [
+        (one_violation.line_number, one_violation.violation_code)
+        for one_violation in engine.run_checks(ast.parse("print(1)\n"), [SharedPrintCallCheck, PrintCallCheck])
+    ] == [(1, PRINT_CALL), (1, PRINT_CALL)]
+
+
+def test_builtin_checks_keep_no_state() -> None:
+    # Shared by every file and thread, so anything a check stored on itself would leak between them
+    assert all(
+        not vars(engine.fetch_shared_check(one_check_class))
+        for one_check_class in engine.collect_builtin_check_classes()
+        if not engine.check_is_per_file_check(one_check_class)
+    )
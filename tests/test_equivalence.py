@@ -0,0 +1,53 @@
+from __future__ import annotations
+import collections
+import subprocess
+import sys
+import typing
+
+from benchmarks import corpus, equivalence
+
+
+def test_check_results_add_up_to_plugin_results() -> None:
+    worker_results: typing.Final = equivalence.measure_worker_results(corpus.collect_test_snippets(), repeat_count=1)
+    assert collections.Counter(worker_results.pop(equivalence.PLUGIN_CHECK_NAME)["violations"]) == collections.Counter(
+        one_violation for one_result in worker_results.values() for one_violation in one_result["violations"]
+    )
+
+
+def test_violation_differences_are_multisets() -> None:
+    assert equivalence.calculate_violation_differences(
+        [("module.py", 1, 0, "COP012"), ("module.py", 1, 0, "COP012")],
+        [["module.py", 1, 0, "COP012"], ["module.py", 2, 0, "COP008"]],
+    ) == (
+        [("module.py", 1, 0, "COP012")],
+        [("module.py", 2, 0, "COP008")],
+    )
+
+
+def test_report_flags_different_checks() -> None:
+    report_lines, is_equivalent = equivalence.build_report(
+        {"FinalClassCheck": {"elapsed_seconds": 2.0, "violations": [("module.py", 1, 0, "COP012")]}},
+        {"FinalClassCheck": {"elapsed_seconds": 1.0, "violations": []}},
+    )
+    assert not is_equivalent
+    assert "2.00x  DIFFERENT" in report_lines[1]
+
+
+def test_generated_modules_are_deterministic() -> None:
+    assert corpus.generate_modules(2, 10) == corpus.generate_modules(2, 10)
+
+
+def test_worker_imports_nothing_from_the_package() -> None:
+    # The worker runs under a reference revision, which may lack any module added since
+    imported_modules: typing.Final = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, benchmarks.equivalence; print(*(name for name in sys.modules if 'flake8_plugin' in name))",
+        ],
+        capture_output=True,
+        check=True,
+        cwd=corpus.REPOSITORY_ROOT,
+        text=True,
+    ).stdout
+    assert not imported_modules.strip()
@@ -0,0 +1,170 @@
+from __future__ import annotations
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin.cli import main
+from community_of_python_flake8_plugin.fixes import fix_file, fix_source, run_fixes
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+FIXABLE_SOURCE: typing.Final = '''"""Settings."""
+
+from __future__ import annotations
+import dataclasses
+
+
+SETTINGS_VALUES = {"debug": True}
+TYPED_SETTINGS: typing.Final[dict[str, int]] = {"retries": 3}
+
+
+class ServiceBase:
+    def run_items(self, all_items: list[int]) -> list[int]:
+        for item in all_items:
+            print(item)
+        return [value * 2 for value in all_items if value]
+
+
+@dataclasses.dataclass(order=True, frozen=False,)
+class PointValue:
+    x_coordinate: int
+
+
+@dataclasses.dataclass
+class SizeValue:  # noqa: COP012
+    width_value: int
+'''
+FIXED_SOURCE: typing.Final = '''"""Settings."""
+
+from __future__ import annotations
+import dataclasses
+import types
+import typing
+
+
+SETTINGS_VALUES = types.MappingProxyType({"debug": True})
+TYPED_SETTINGS: typing.Final[types.MappingProxyType[str, int]] = types.MappingProxyType({"retries": 3})
+
+
+@typing.final
+class ServiceBase:
+    def run_items(self, all_items: list[int]) -> list[int]:
+        for one_item in all_items:
+            print(one_item)
+        return [one_value * 2 for one_value in all_items if one_value]
+
+
+@typing.final
+@dataclasses.dataclass(order=True, frozen=True, kw_only=True, slots=True,)
+class PointValue:
+    x_coordinate: int
+
+
+@dataclasses.dataclass(kw_only=True, slots=True, frozen=True)
+class SizeValue:  # noqa: COP012
+    width_value: int
+'''
+
+
+def test_fix_source_rewrites_every_fixable_violation() -> None:
+    fixed_source: typing.Final = fix_source(FIXABLE_SOURCE, "settings.py")
+    assert fixed_source.source_text == FIXED_SOURCE
+    assert fixed_source.fixed_count == 8  # noqa: PLR2004
+    assert fixed_source.violations == []
+    assert fix_source(FIXED_SOURCE, "settings.py").fixed_count == 0
+
+
+@pytest.mark.parametrize(
+    "module_source",
+    [
+        # Also bound by an assignment, an argument, a nested function or a global statement
+        "def run_items(all_items):\n    for item in all_items:\n        item = item.strip()\n",
+        "def run_items(item, all_items):\n    for item in all_items:\n        print(item)\n",
+        "def run_items(all_items):\n    for item in all_items:\n        def print_item(item): ...\n",
+        "def run_items(all_items):\n    global item\n    for item in all_items:\n        print(item)\n",
+        # The new name is taken
+        "one_item = 1\ndef run_items():\n    for item in [one_item]:\n        print(item)\n",
+        # Suppressed
+        "def run_items():\n    for item in []:  # noqa: COP015\n        print(item)\n",
+        # Module-level loop variables may be used by other modules
+        "for item in []:\n    print(item)\n",
+        # Self-documenting f-strings print the name
+        "def run_items(all_items):\n    for item in all_items:\n        print(f'{item=}', item)\n",
+        "def run_items(all_items):\n    for item in all_items:\n        print(f'{ item.name = !r}')\n",
+    ],
+)
+def test_fix_source_skips_unsafe_renames(module_source: str) -> None:
+    fixed_source: typing.Final = fix_source(module_source, "module.py")
+    assert fixed_source.source_text == module_source
+    assert fixed_source.fixed_count == 0
+
+
+def test_fix_source_renames_reads_in_nested_scopes() -> None:
+    assert fix_source(
+        "def run_items():\n    for item in []:\n"
+        "        print(lambda: item, [item for _ in range(3)], f'{item} {item == 1}')\n",
+        "module.py",
+    ).source_text == (
+        "def run_items():\n    for one_item in []:\n"
+        "        print(lambda: one_item, [one_item for _ in range(3)], f'{one_item} {one_item == 1}')\n"
+    )
+
+
+def test_fix_source_sorts_imports_added_at_one_point() -> None:
+    fixed_source: typing.Final = fix_source(
+        "import os\nclass ServiceBase:\n    pass\nSETTINGS_VALUES = {'debug': True}\n", "module.py"
+    )
+    assert fixed_source.fixed_count == 2  # noqa: PLR2004
+    assert fixed_source.source_text == (
+        "import os\nimport types\nimport typing\n@typing.final\nclass ServiceBase:\n    pass\n"
+        "SETTINGS_VALUES = types.MappingProxyType({'debug': True})\n"
+    )
+
+
+def test_fix_file_keeps_line_endings_and_encoding(tmp_path: pathlib.Path) -> None:
+    module_path: typing.Final = tmp_path / "module.py"
+    module_path.write_bytes("# -*- coding: latin-1 -*-\r\nGREETINGS = {'fr': 'caf\xe9'}\r\n".encode("latin-1"))
+    fix_outcome: typing.Final = fix_file(str(module_path))
+    assert fix_outcome.fixed_count == 1
+    assert fix_outcome.file_report.violations == ()
+    assert module_path.read_bytes() == (
+        "# -*- coding: latin-1 -*-\r\nimport types\r\nGREETINGS = types.MappingProxyType({'fr': 'caf\xe9'})\r\n"
+    ).encode("latin-1")
+
+
+def test_run_fixes_reports_unreadable_and_undecodable_files(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "undecodable.py").write_bytes(b"\xff\xfe = 1\n")
+    (tmp_path / "module.py").write_text("class ServiceBase:\n    pass\n")
+    fix_outcomes: typing.Final = list(
+        run_fixes([str(tmp_path / "missing.py"), str(tmp_path / "undecodable.py"), str(tmp_path / "module.py")])
+    )
+    assert [
+        [one_violation.violation_code.code for one_violation in one_outcome.file_report.violations]
+        for one_outcome in fix_outcomes
+    ] == [["E902"], ["E999"], []]
+    assert [one_outcome.fixed_count for one_outcome in fix_outcomes] == [0, 0, 1]
+
+
+def test_run_fixes_keeps_input_order(tmp_path: pathlib.Path) -> None:
+    module_filenames: typing.Final = []
+    for one_index in range(12):
+        module_path = tmp_path / f"module{one_index:02}.py"
+        module_path.write_text("class ServiceBase:\n    pass\n")
+        module_filenames.append(str(module_path))
+    fix_outcomes: typing.Final = list(run_fixes(module_filenames, jobs_count=3, pool_kind="thread"))
+    assert [one_outcome.file_report.filename for one_outcome in fix_outcomes] == module_filenames
+    assert {one_outcome.fixed_count for one_outcome in fix_outcomes} == {1}
+    assert (tmp_path / "module07.py").read_text() == "import typing\n@typing.final\nclass ServiceBase:\n    pass\n"
+
+
+def test_main_fixes_files(
+    tmp_path: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],  # noqa: COP006
+) -> None:
+    (tmp_path / "settings.py").write_text(FIXABLE_SOURCE)
+    assert main([str(tmp_path), "--fix", "--jobs", "1"]) == 0
+    assert capsys.readouterr().err == "Fixed 8 violations\n"
+    assert (tmp_path / "settings.py").read_text() == FIXED_SOURCE
@@ -0,0 +1,142 @@
+from __future__ import annotations
+import io
+import json
+import os
+import threading
+import typing
+
+from community_of_python_flake8_plugin.lsp import DocumentAnalyzer, LanguageServer, convert_position_to_offset
+from community_of_python_flake8_plugin.runner import check_source
+
+
+SOURCE_TEXT: typing.Final = (
+    "import typing\n"
+    "\n"
+    "\n"
+    "class Ab:\n"
+    "    pass\n"
+    "\n"
+    "\n"
+    "@typing.final\n"
+    "class Cdefghij(Ab):\n"
+    "    pass\n"
+    "\n"
+    "\n"
+    "def fetch_items(xs):\n"
+    "    return xs\n"
+)
+
+
+def test_document_analyzer_rechecks_changed_statements() -> None:
+    document_analyzer: typing.Final = DocumentAnalyzer()
+    assert document_analyzer.check_source_text(SOURCE_TEXT, "module.py") == check_source(SOURCE_TEXT, "module.py")
+    assert document_analyzer.checked_statements_count == 4  # noqa: PLR2004
+
+    shifted_text: typing.Final = "first_value = 1\n" + SOURCE_TEXT.replace("(xs)", "(ys)").replace(
+        "return xs", "return ys"
+    )
+    assert document_analyzer.check_source_text(shifted_text, "module.py") == check_source(shifted_text, "module.py")
+    assert document_analyzer.checked_statements_count == 2  # noqa: PLR2004
+
+    # Removing the subclass changes module-wide facts, so Ab now needs @typing.final
+    unrelated_text: typing.Final = SOURCE_TEXT.replace("class Cdefghij(Ab)", "class Cdefghij")
+    assert document_analyzer.check_source_text(unrelated_text, "module.py") == check_source(unrelated_text, "module.py")
+    assert document_analyzer.checked_statements_count == 4  # noqa: PLR2004
+
+
+def test_document_analyzer_tells_apart_statements_on_one_line() -> None:
+    document_analyzer: typing.Final = DocumentAnalyzer()
+    joined_text: typing.Final = "ab = 1; cd = 2\n"
+    assert document_analyzer.check_source_text(joined_text, "module.py") == check_source(joined_text, "module.py")
+    assert document_analyzer.check_source_text("ab = 1; cd = 2; ab = 3\n", "module.py") == check_source(
+        "ab = 1; cd = 2; ab = 3\n", "module.py"
+    )
+
+
+def test_convert_position_to_offset_counts_utf16_units() -> None:
+    text_content: typing.Final = "first\n😀ab\n"
+    assert convert_position_to_offset(text_content, 1, 0) == len("first\n")
+    assert convert_position_to_offset(text_content, 1, 2) == len("first\n😀")
+    assert convert_position_to_offset(text_content, 5, 0) == len(text_content)
+
+
+def send_message(input_file: typing.BinaryIO, message_payload: dict[str, object]) -> None:
+    encoded_payload: typing.Final = json.dumps(message_payload).encode()
+    input_file.write(b"Content-Length: %d\r\n\r\n" % len(encoded_payload) + encoded_payload)
+    input_file.flush()
+
+
+def read_message(output_file: typing.BinaryIO) -> dict[str, typing.Any]:
+    header_line: typing.Final = output_file.readline()
+    output_file.readline()
+    return typing.cast("dict[str, typing.Any]", json.loads(output_file.read(int(header_line.split(b":")[1]))))
+
+
+def create_pipe_files() -> tuple[typing.BinaryIO, typing.BinaryIO]:
+    read_descriptor, write_descriptor = os.pipe()
+    return (
+        typing.cast("typing.BinaryIO", os.fdopen(read_descriptor, "rb")),
+        typing.cast("typing.BinaryIO", os.fdopen(write_descriptor, "wb")),
+    )
+
+
+def test_language_server_publishes_diagnostics() -> None:
+    input_reader, input_writer = create_pipe_files()
+    output_reader, output_writer = create_pipe_files()
+    language_server: typing.Final = LanguageServer(input_reader, output_writer, debounce_seconds=0.01)
+    exit_codes: typing.Final[list[int]] = []
+    server_thread: typing.Final = threading.Thread(target=lambda: exit_codes.append(language_server.run_forever()))
+    server_thread.start()
+
+    send_message(input_writer, {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}})
+    assert read_message(output_reader)["result"]["capabilities"]["textDocumentSync"]["change"] == 2  # noqa: PLR2004
+    document_uri: typing.Final = "file:///project/module.py"
+    send_message(
+        input_writer,
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didOpen",
+            "params": {"textDocument": {"uri": document_uri, "version": 1, "text": "class Ab:\n    pass\n"}},
+        },
+    )
+    opened_diagnostics: typing.Final = read_message(output_reader)["params"]["diagnostics"]
+    assert sorted(one_diagnostic["code"] for one_diagnostic in opened_diagnostics) == ["COP008", "COP012"]
+    assert opened_diagnostics[0]["range"]["end"] == {"line": 0, "character": 5}
+
+    send_message(
+        input_writer,
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didChange",
+            "params": {
+                "textDocument": {"uri": document_uri, "version": 2},
+                "contentChanges": [
+                    {
+                        "range": {"start": {"line": 0, "character": 6}, "end": {"line": 0, "character": 8}},
+                        "text": "Abcdefgh",
+                    }
+                ],
+            },
+        },
+    )
+    assert [one_diagnostic["code"] for one_diagnostic in read_message(output_reader)["params"]["diagnostics"]] == [
+        "COP012"
+    ]
+
+    send_message(input_writer, {"jsonrpc": "2.0", "id": 2, "method": "shutdown"})
+    assert read_message(output_reader) == {"jsonrpc": "2.0", "id": 2, "result": None}
+    send_message(input_writer, {"jsonrpc": "2.0", "method": "exit"})
+    server_thread.join(timeout=5)
+    assert exit_codes == [0]
+    for one_file in (input_reader, input_writer, output_reader, output_writer):
+        one_file.close()
+
+
+def test_language_server_rejects_unknown_requests() -> None:
+    input_file: typing.Final = io.BytesIO()
+    send_message(input_file, {"jsonrpc": "2.0", "id": 7, "method": "textDocument/hover", "params": {}})
+    input_file.seek(0)
+    output_file: typing.Final = io.BytesIO()
+    assert LanguageServer(input_file, output_file).run_forever() == 1
+    output_file.seek(0)
+    assert read_message(output_file)["error"]["code"] == -32601  # noqa: PLR2004
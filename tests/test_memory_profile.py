@@ -0,0 +1,48 @@
+from __future__ import annotations
+import argparse
+import ast
+import json
+import os
+import tracemalloc
+import typing
+
+from community_of_python_flake8_plugin.memory_profile import fetch_memory_profiler
+from community_of_python_flake8_plugin.plugin import CommunityOfPythonFlake8Plugin
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+def build_parsed_options(memory_profile: str | None) -> argparse.Namespace:
+    return argparse.Namespace(
+        cop_memory_profile=memory_profile,
+        cop_min_name_length=8,
+        cop_short_names=[],
+        cop_extra_verbs=[],
+        cop_profiles="",
+        cop_skip_generated=False,
+    )
+
+
+def test_memory_profile_summary(tmp_path: pathlib.Path) -> None:
+    CommunityOfPythonFlake8Plugin.parse_options(build_parsed_options(str(tmp_path)))
+    try:
+        list(CommunityOfPythonFlake8Plugin(ast.parse("class Parent:\n    pass\n"), "parent.py").run())
+        list(CommunityOfPythonFlake8Plugin(ast.parse("import os\n"), "imports.py").run())
+        fetch_memory_profiler(tmp_path, os.getpid()).write_summary()
+    finally:
+        CommunityOfPythonFlake8Plugin.parse_options(build_parsed_options(None))
+        fetch_memory_profiler.cache_clear()
+        tracemalloc.stop()
+
+    memory_summary: typing.Final = json.loads((tmp_path / f"memory-profile-{os.getpid()}.json").read_text())
+    assert memory_summary["files_count"] == 2  # noqa: PLR2004
+    assert "FinalClassCheck" in memory_summary["checks"]
+    # The import-only module has no classes, so FinalClassCheck is skipped for it.
+    assert memory_summary["checks"]["FinalClassCheck"]["files_count"] == 1
+    assert {one_file["filename"] for one_file in memory_summary["largest_files"]} == {"parent.py", "imports.py"}
+
+
+def test_memory_profile_disabled_by_default() -> None:
+    assert CommunityOfPythonFlake8Plugin.memory_profile_directory is None
@@ -0,0 +1,121 @@
+from __future__ import annotations
+import ast
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin.cli import main
+from community_of_python_flake8_plugin.naming_policy import (
+    DEFAULT_NAMING_POLICY,
+    NameTrait,
+    NamingPolicy,
+    build_naming_matcher,
+    register_naming_policy,
+)
+from community_of_python_flake8_plugin.plugin import CommunityOfPythonFlake8Plugin
+from community_of_python_flake8_plugin.symbols import IdentifierKind
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+@pytest.mark.parametrize(
+    ("identifier", "identifier_kind", "expected_traits"),
+    [
+        ("count", IdentifierKind.VARIABLE, {NameTrait.SHORT_NAME}),
+        ("counter_total", IdentifierKind.VARIABLE, set()),
+        ("MAX", IdentifierKind.VARIABLE, {NameTrait.SHORT_NAME, NameTrait.LENGTH_EXEMPT}),
+        ("ÉTAT", IdentifierKind.VARIABLE, {NameTrait.SHORT_NAME, NameTrait.LENGTH_EXEMPT}),
+        ("Éta", IdentifierKind.VARIABLE, {NameTrait.SHORT_NAME}),
+        ("_", IdentifierKind.LOOP_TARGET, {NameTrait.SHORT_NAME, NameTrait.LENGTH_EXEMPT, NameTrait.LOOP_PREFIX}),
+        ("one_item", IdentifierKind.LOOP_TARGET, {NameTrait.LOOP_PREFIX}),
+        ("values", IdentifierKind.ATTRIBUTE, {NameTrait.SHORT_NAME, NameTrait.LENGTH_EXEMPT}),
+        ("cls", IdentifierKind.ARGUMENT, {NameTrait.SHORT_NAME, NameTrait.LENGTH_EXEMPT}),
+        # Exemptions of one kind do not leak into another
+        ("cls", IdentifierKind.VARIABLE, {NameTrait.SHORT_NAME}),
+        ("Test", IdentifierKind.CLASS, {NameTrait.SHORT_NAME, NameTrait.LENGTH_EXEMPT}),
+        ("Test", IdentifierKind.FUNCTION, {NameTrait.SHORT_NAME}),
+        ("main", IdentifierKind.FUNCTION, {NameTrait.SHORT_NAME, NameTrait.LENGTH_EXEMPT, NameTrait.VERB_EXEMPT}),
+        ("__fetch_user", IdentifierKind.FUNCTION, {NameTrait.LENGTH_EXEMPT, NameTrait.VERB_NAME}),
+        ("fetcher", IdentifierKind.FUNCTION, {NameTrait.SHORT_NAME}),
+        ("__init__", IdentifierKind.FUNCTION, {NameTrait.LENGTH_EXEMPT, NameTrait.VERB_EXEMPT}),
+        ("get_user", IdentifierKind.FUNCTION, {NameTrait.VERB_NAME, NameTrait.FORBIDDEN_ASYNC_PREFIX}),
+    ],
+)
+def test_default_policy_traits(
+    identifier: str, identifier_kind: IdentifierKind, expected_traits: set[NameTrait]
+) -> None:
+    assert (
+        build_naming_matcher(DEFAULT_NAMING_POLICY).classify_identifier(identifier, identifier_kind) == expected_traits
+    )
+
+
+def test_matcher_is_compiled_once_per_policy() -> None:
+    assert build_naming_matcher(NamingPolicy()) is build_naming_matcher(DEFAULT_NAMING_POLICY)
+    assert build_naming_matcher(NamingPolicy(min_name_length=4)) is not build_naming_matcher(DEFAULT_NAMING_POLICY)
+
+
+def test_registered_policy_reaches_checks() -> None:
+    checked_source: typing.Final = "def mail(): pass\nfor item in items: pass\n"
+    register_naming_policy(
+        NamingPolicy(
+            min_name_length=4,
+            verb_prefixes=DEFAULT_NAMING_POLICY.verb_prefixes | {"mail"},
+            loop_variable_prefix="item",
+        )
+    )
+    try:
+        reported_messages: typing.Final = [
+            one_message for _, _, one_message, _ in CommunityOfPythonFlake8Plugin(ast.parse(checked_source)).run()
+        ]
+    finally:
+        register_naming_policy(DEFAULT_NAMING_POLICY)
+    assert reported_messages == []
+    default_messages: typing.Final = sorted(
+        one_message.split()[0]
+        for _, _, one_message, _ in CommunityOfPythonFlake8Plugin(ast.parse(checked_source)).run()
+    )
+    assert default_messages == ["COP007", "COP009", "COP015"]
+
+
+def test_length_messages_follow_the_policy() -> None:
+    register_naming_policy(NamingPolicy(min_name_length=4))
+    try:
+        reported_messages: typing.Final = [
+            one_message for _, _, one_message, _ in CommunityOfPythonFlake8Plugin(ast.parse("abc = 1\n")).run()
+        ]
+    finally:
+        register_naming_policy(DEFAULT_NAMING_POLICY)
+    assert reported_messages == ["COP005 Variable name must be at least 4 characters"]
+
+
+@pytest.mark.parametrize("jobs_count", ["1", "2"])
+def test_main_applies_the_naming_policy(
+    tmp_path: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],  # noqa: COP006
+    jobs_count: str,
+) -> None:
+    (tmp_path / "module.py").write_text("def mail():\n    pass\n\n\nabc = 1\nab = 2\n")
+    try:
+        assert (
+            main(
+                [
+                    str(tmp_path),
+                    "--jobs",
+                    jobs_count,
+                    "--min-name-length",
+                    "4",
+                    "--short-names",
+                    "ab",
+                    "--extra-verbs",
+                    "mail",
+                ]
+            )
+            == 1
+        )
+    finally:
+        register_naming_policy(DEFAULT_NAMING_POLICY)
+    assert capsys.readouterr().out == (
+        f"{(tmp_path / 'module.py').as_posix()}:5:1: COP005 Variable name must be at least 4 characters\n"
+    )
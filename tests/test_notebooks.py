@@ -0,0 +1,97 @@
+from __future__ import annotations
+import json
+import typing
+
+from community_of_python_flake8_plugin import runner
+from community_of_python_flake8_plugin.cli import main
+from community_of_python_flake8_plugin.engine import run_checks
+from community_of_python_flake8_plugin.notebooks import assemble_notebook_module, parse_code_cells
+from community_of_python_flake8_plugin.runner import check_notebook, check_source, collect_python_files
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Mapping, Sequence
+
+    import pytest
+
+
+NOTEBOOK_CELLS: typing.Final[list[dict[str, object]]] = [
+    {"cell_type": "markdown", "source": ["# Report\n"]},
+    {"cell_type": "code", "source": ["%matplotlib inline\n", "import typing\n", "class BaseModel:\n", "    pass"]},
+    {"cell_type": "code", "source": "!pip install pandas\nclass Child(BaseModel):\n    pass\n"},
+    {"cell_type": "code", "source": ["def broken(:\n"]},
+    {"cell_type": "code", "source": ["%%bash\n", "echo $HOME\n"]},
+    {"cell_type": "code", "source": ["settings_values = {'debug': True}\n"]},
+]
+
+
+def build_notebook_bytes(notebook_cells: Sequence[Mapping[str, object]]) -> bytes:
+    return json.dumps({"cells": notebook_cells, "metadata": {}, "nbformat": 4, "nbformat_minor": 5}).encode()
+
+
+def test_cells_assemble_into_one_module() -> None:
+    notebook_module: typing.Final = assemble_notebook_module(parse_code_cells(build_notebook_bytes(NOTEBOOK_CELLS)))
+    assert notebook_module.source_lines[:4] == ["", "import typing", "class BaseModel:", "    pass"]
+    assert [type(one_statement).__name__ for one_statement in notebook_module.syntax_tree.body] == [
+        "Import",
+        "ClassDef",
+        "ClassDef",
+        "Assign",
+    ]
+    assert notebook_module.syntax_tree.body[2].lineno == 6  # noqa: PLR2004
+    assert notebook_module.find_cell_line(6) == (3, 2)
+    assert [one_error.cell_number for one_error in notebook_module.syntax_errors] == [4]
+
+
+def test_check_notebook_maps_violations_to_cells() -> None:
+    assert [
+        one_violation.render_line() for one_violation in check_notebook(build_notebook_bytes(NOTEBOOK_CELLS), "a.ipynb")
+    ] == [
+        # The subclass in the next cell exempts BaseModel from COP012, as in a module
+        "a.ipynb:cell_3:2:1: COP008 Class name must be at least 8 characters",
+        "a.ipynb:cell_3:2:1: COP012 Classes must be marked final with @typing.final",
+        "a.ipynb:cell_4:1:12: E999 SyntaxError: invalid syntax",
+        "a.ipynb:cell_6:1:1: COP013 Wrap module dictionaries with types.MappingProxyType",
+    ]
+
+
+def test_check_notebook_matches_the_concatenated_module() -> None:
+    code_cells: typing.Final = [
+        {"cell_type": "code", "source": f"class Ab{one_index}(Ab{one_index - 1}):\n    pass\n"}
+        for one_index in range(50)
+    ]
+    module_source: typing.Final = "".join(one_cell["source"] for one_cell in code_cells)
+    assert [
+        (one_violation.cell_number, one_violation.line_number, one_violation.violation_code.code)
+        for one_violation in check_notebook(build_notebook_bytes(code_cells), "a.ipynb")
+    ] == [
+        (one_violation.line_number // 2 + 1, 1, one_violation.violation_code.code)
+        for one_violation in check_source(module_source, "a.py")
+    ]
+
+
+def test_check_notebook_runs_the_checks_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    traversed_trees: typing.Final = []
+
+    def record_run_checks(*run_arguments: typing.Any) -> typing.Any:  # noqa: ANN401
+        traversed_trees.append(run_arguments[0])
+        return run_checks(*run_arguments)
+
+    monkeypatch.setattr(runner, "run_checks", record_run_checks)
+    check_notebook(build_notebook_bytes(NOTEBOOK_CELLS * 20), "a.ipynb")
+    assert len(traversed_trees) == 1
+
+
+def test_check_notebook_reports_invalid_json() -> None:
+    assert [one_violation.violation_code.code for one_violation in check_notebook(b"{", "a.ipynb")] == ["E999"]
+
+
+def test_main_lints_notebooks(
+    tmp_path: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],  # noqa: COP006
+) -> None:
+    (tmp_path / "analysis.ipynb").write_bytes(build_notebook_bytes(NOTEBOOK_CELLS))
+    assert collect_python_files([str(tmp_path)]) == [f"{tmp_path.as_posix()}/analysis.ipynb"]
+    assert main([str(tmp_path), "--jobs", "1"]) == 1
+    assert "analysis.ipynb:cell_6:1:1: COP013" in capsys.readouterr().out
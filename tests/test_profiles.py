@@ -0,0 +1,160 @@
+from __future__ import annotations
+import ast
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin.checks.final_class import FinalClassCheck
+from community_of_python_flake8_plugin.checks.name_length import COP004NameLengthCheck
+from community_of_python_flake8_plugin.cli import main
+from community_of_python_flake8_plugin.plugin import CommunityOfPythonFlake8Plugin
+from community_of_python_flake8_plugin.profiles import (
+    DEFAULT_RULE_PROFILES,
+    PathProfile,
+    RuleProfiles,
+    check_is_generated,
+    fetch_profile_matcher,
+    parse_rule_profiles,
+)
+from community_of_python_flake8_plugin.runner import check_source
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+CLASS_SOURCE: typing.Final = "class Ab:\n    pass\n"
+TESTS_PROFILES: typing.Final = RuleProfiles(
+    path_profiles=(
+        PathProfile(path_pattern="tests/*", disabled_codes=("COP012",)),
+        PathProfile(path_pattern="conftest.py", disabled_codes=("COP008",)),
+    )
+)
+
+
+def collect_codes(source_text: str, filename: str, rule_profiles: RuleProfiles = TESTS_PROFILES) -> list[str]:
+    return [one_violation.violation_code.code for one_violation in check_source(source_text, filename, rule_profiles)]
+
+
+def test_parse_rule_profiles() -> None:
+    assert parse_rule_profiles("tests/*:COP012,COP004 */migrations/*.py: COP") == (
+        PathProfile(path_pattern="tests/*", disabled_codes=("COP012", "COP004")),
+        PathProfile(path_pattern="*/migrations/*.py", disabled_codes=("COP",)),
+    )
+    with pytest.raises(ValueError, match="mapping from file"):
+        parse_rule_profiles("COP012")
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected_codes"),
+    [
+        ("tests/test_module.py", ("COP012",)),
+        ("./tests/test_module.py", ("COP012",)),
+        ("package/tests/test_module.py", ()),
+        ("conftest.py", ("COP008",)),
+        ("tests/conftest.py", ("COP008", "COP012")),
+        ("package/module.py", ()),
+    ],
+)
+def test_profiles_match_paths(filename: str, expected_codes: tuple[str, ...]) -> None:
+    assert fetch_profile_matcher(TESTS_PROFILES).resolve_file_rules(filename, []).disabled_codes == expected_codes
+
+
+def test_fully_disabled_checks_are_not_run() -> None:
+    check_classes: typing.Final = (
+        fetch_profile_matcher(TESTS_PROFILES).resolve_file_rules("tests/a.py", []).check_classes
+    )
+    assert FinalClassCheck not in check_classes
+    # The name check also reports other codes, so it still runs and only drops COP008
+    assert (
+        COP004NameLengthCheck
+        in fetch_profile_matcher(TESTS_PROFILES).resolve_file_rules("conftest.py", []).check_classes
+    )
+
+
+def test_file_rules_are_resolved_once_per_profile_set() -> None:
+    profile_matcher: typing.Final = fetch_profile_matcher(TESTS_PROFILES)
+    assert profile_matcher.resolve_file_rules("tests/a.py", []) is profile_matcher.resolve_file_rules("tests/b.py", [])
+
+
+def test_check_source_applies_profiles() -> None:
+    assert collect_codes(CLASS_SOURCE, "tests/test_module.py") == ["COP008"]
+    assert collect_codes(CLASS_SOURCE, "conftest.py") == ["COP012"]
+    assert collect_codes(CLASS_SOURCE, "package/module.py") == ["COP008", "COP012"]
+
+
+@pytest.mark.parametrize(
+    "header_line",
+    [
+        "# @generated",
+        "# This file is @generated by tool.py",
+        "# Code generated by protoc-gen-python. DO NOT EDIT.",
+    ],
+)
+def test_generated_files_are_skipped(header_line: str) -> None:
+    generated_source: typing.Final = f"#!/usr/bin/env python\n{header_line}\n{CLASS_SOURCE}"
+    assert check_is_generated(generated_source.splitlines())
+    assert collect_codes(generated_source, "module_pb2.py", DEFAULT_RULE_PROFILES) == []
+    # Generated files are skipped before parsing, so even broken ones report nothing
+    assert collect_codes(f"{header_line}\ndef broken(:\n", "module_pb2.py", DEFAULT_RULE_PROFILES) == []
+    assert collect_codes(generated_source, "module_pb2.py", RuleProfiles(is_generated_code_checked=True)) == [
+        "COP008",
+        "COP012",
+    ]
+
+
+@pytest.mark.parametrize(
+    "header_line",
+    [
+        "# Generated by the protocol buffer compiler.  DO NOT EDIT!",
+        "    # Generated by Django 5.0 on 2026-01-01 12:00",
+        "# DO NOT EDIT",
+        "    # Code generated by hand. DO NOT EDIT.",
+        "# Code generated by hand. DO NOT EDIT. Unless you must.",
+        "value = '@generated'",
+    ],
+)
+def test_loose_generated_markers_are_checked(header_line: str) -> None:
+    assert not check_is_generated([header_line])
+
+
+def test_generated_markers_below_the_header_are_ignored() -> None:
+    assert not check_is_generated(["value = 'Generated by'", "# Generated without markers"])
+    assert collect_codes("\n" * 10 + f"# @generated\n{CLASS_SOURCE}", "module.py", DEFAULT_RULE_PROFILES) == [
+        "COP008",
+        "COP012",
+    ]
+
+
+def test_plugin_applies_profiles(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(CommunityOfPythonFlake8Plugin, "rule_profiles", TESTS_PROFILES)
+    assert [
+        one_result[2].split()[0]
+        for one_result in CommunityOfPythonFlake8Plugin(
+            ast.parse(CLASS_SOURCE), "tests/test_module.py", CLASS_SOURCE.splitlines(keepends=True)
+        ).run()
+    ] == ["COP008"]
+    assert not list(CommunityOfPythonFlake8Plugin(ast.parse(CLASS_SOURCE), "module_pb2.py", ["# @generated\n"]).run())
+
+
+def test_plugin_checks_generated_files_by_default() -> None:
+    assert [
+        one_result[2].split()[0]
+        for one_result in CommunityOfPythonFlake8Plugin(
+            ast.parse(CLASS_SOURCE), "module_pb2.py", ["# @generated\n"]
+        ).run()
+    ] == ["COP008", "COP012"]
+
+
+def test_main_applies_profiles(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],  # noqa: COP006
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_module.py").write_text(CLASS_SOURCE)
+    (tmp_path / "module_pb2.py").write_text(f"# Code generated by protoc. DO NOT EDIT.\n{CLASS_SOURCE}")
+    assert main(["--jobs", "1", "--profiles", "tests/*:COP"]) == 0
+    assert main(["--jobs", "1", "--profiles", "tests/*:COP", "--check-generated"]) == 1
+    assert "module_pb2.py:2:1: COP012" in capsys.readouterr().out
@@ -0,0 +1,101 @@
+from __future__ import annotations
+import threading
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin import runner
+from community_of_python_flake8_plugin.cli import main
+from community_of_python_flake8_plugin.runner import check_buffer, check_source, collect_python_files, run_files
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+def test_check_source_honours_noqa() -> None:
+    reported_violations: typing.Final = check_source(
+        "class Ab:  # noqa: COP008\n    pass\nclass Cd:  # noqa\n    pass\n", "module.py"
+    )
+    assert [one_violation.render_line() for one_violation in reported_violations] == [
+        "module.py:1:1: COP012 Classes must be marked final with @typing.final"
+    ]
+
+
+def test_check_source_reports_syntax_errors() -> None:
+    assert [one_violation.violation_code.code for one_violation in check_source("def broken(:\n", "module.py")] == [
+        "E999"
+    ]
+
+
+@pytest.mark.parametrize("source_bytes", [b"\xff\xfe = 1\n", b"# coding: no-such-codec\nvalue = 1\n"])
+def test_check_buffer_reports_undecodable_sources(source_bytes: bytes) -> None:
+    assert [
+        one_violation.violation_code.code for one_violation in check_buffer(source_bytes, "module.py").violations
+    ] == ["E999"]
+
+
+def test_collect_python_files_skips_excluded(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "package").mkdir()
+    (tmp_path / "package" / "module.py").write_text("")
+    (tmp_path / "package" / "notes.txt").write_text("")
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / ".venv" / "vendored.py").write_text("")
+    assert collect_python_files([str(tmp_path)]) == [f"{tmp_path.as_posix()}/package/module.py"]
+
+
+def test_run_files_starts_large_files_first(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    filenames: typing.Final = []
+    for one_index, one_repeats in enumerate((1, 1, 300, 1, 1, 200, 1, 1)):
+        module_path = tmp_path / f"module_{one_index}.py"
+        module_path.write_text("class Ab:\n    pass\n" * one_repeats)
+        filenames.append(str(module_path))
+    started_files: typing.Final[list[str]] = []
+    started_lock: typing.Final = threading.Lock()
+    check_file: typing.Final = runner.check_file
+
+    def record_check_file(*check_arguments: typing.Any) -> typing.Any:  # noqa: ANN401
+        with started_lock:
+            started_files.append(check_arguments[0])
+        return check_file(*check_arguments)
+
+    monkeypatch.setattr(runner, "check_file", record_check_file)
+    threaded_reports: typing.Final = list(run_files(filenames, 2, "thread"))
+    assert set(started_files[:2]) == {filenames[2], filenames[5]}
+    # Reports still come in input order
+    assert [one_report.filename for one_report in threaded_reports] == filenames
+
+
+def test_main_shards_cover_every_file_once(
+    tmp_path: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],  # noqa: COP006
+) -> None:
+    for one_index in range(7):
+        (tmp_path / f"module_{one_index}.py").write_text("class Ab:\n    pass\n" * (one_index + 1))
+    cost_file: typing.Final = tmp_path / "costs.json"
+    assert main([str(tmp_path), "--jobs", "1", "--cost-file", str(cost_file), "--update-cost-file"]) == 1
+    capsys.readouterr()
+
+    # Every shard reads the same cost file, so the shards partition the files without overlap
+    reported_files: typing.Final[list[str]] = []
+    for one_shard in ("1/3", "2/3", "3/3"):
+        assert main([str(tmp_path), "--jobs", "1", "--shard", one_shard, "--cost-file", str(cost_file)]) == 1
+        reported_files.extend({one_line.split(":", 1)[0] for one_line in capsys.readouterr().out.splitlines()})
+
+    assert sorted(reported_files) == collect_python_files([str(tmp_path)])
+
+
+@pytest.mark.parametrize("jobs_count", ["1", "2"])
+def test_main_reports_unreadable_files_and_checks_the_others(
+    tmp_path: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],  # noqa: COP006
+    jobs_count: str,
+) -> None:
+    (tmp_path / "module.py").write_text("class Ab:\n    pass\n")
+    missing_path: typing.Final = tmp_path / "missing.py"
+    assert main([str(tmp_path / "module.py"), str(missing_path), "--jobs", jobs_count, "--pool", "thread"]) == 1
+    output_lines: typing.Final = capsys.readouterr().out.splitlines()
+    assert f"{missing_path}:1:1: E902 FileNotFoundError: [Errno 2] No such file or directory: '{missing_path}'" in (
+        output_lines
+    )
+    assert any(" COP012 " in one_line for one_line in output_lines)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+import ast
+import json
+import typing
+
+from benchmarks import corpus, shapes
+from community_of_python_flake8_plugin.engine import collect_check_classes, run_checks
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+PRIVATE_SOURCE: typing.Final = """
+import secret_billing
+
+
+@secret_billing.registered
+class SecretInvoiceLedger:
+    def reconcile_secret_totals(self, secret_argument):
+        secret_total = "secret literal"
+        for secret_item in secret_argument:
+            secret_total += secret_item
+        return secret_total
+"""
+
+
+def test_profile_keeps_no_names_or_literals() -> None:
+    assert "secret" not in json.dumps(shapes.collect_shape_profile([PRIVATE_SOURCE]).convert_to_dict()).lower()
+
+
+def test_profile_records_shapes() -> None:
+    shape_profile: typing.Final = shapes.collect_shape_profile([PRIVATE_SOURCE, "def broken(:\n"])
+    assert shape_profile.modules_count == 1
+    assert shape_profile.nesting_depths == {3: 1}
+    assert shape_profile.body_lengths["function"] == {3: 1}
+    assert shape_profile.class_decorators == {"other": 1}
+    assert shape_profile.identifier_lengths["function"] == {len("reconcile_secret_totals"): 1}
+    assert +shape_profile.naming_conventions == {"functions": 1, "loop_targets": 1}
+
+
+def test_profile_survives_json_round_trip() -> None:
+    shape_profile: typing.Final = shapes.collect_shape_profile(corpus.collect_repository_sources().values())
+    assert (
+        shapes.ShapeProfile.load_from_dict(json.loads(json.dumps(shape_profile.convert_to_dict()))).convert_to_dict()
+        == shape_profile.convert_to_dict()
+    )
+
+
+def test_shaped_modules_parse_and_resemble_the_profile() -> None:
+    shape_profile: typing.Final = shapes.collect_shape_profile(corpus.collect_repository_sources().values())
+    shaped_modules: typing.Final = shapes.generate_shaped_modules(shape_profile, 40)
+    assert shaped_modules == shapes.generate_shaped_modules(shape_profile, 40)
+    shaped_profile: typing.Final = shapes.collect_shape_profile(shaped_modules.values())
+    assert shaped_profile.modules_count == len(shaped_modules)
+    # The statements that dominate function bodies in the profiled code dominate the generated ones too
+    assert {one_type for one_type, _ in shaped_profile.body_statements["function"].most_common(3)} & {
+        one_type for one_type, _ in shape_profile.body_statements["function"].most_common(3)
+    }
+    assert max(shaped_profile.nesting_depths) <= max(shape_profile.nesting_depths)
+
+
+def test_shaped_modules_exercise_the_checks() -> None:
+    shape_profile: typing.Final = shapes.collect_shape_profile(corpus.collect_repository_sources().values())
+    found_codes: typing.Final = {
+        one_violation.violation_code.code
+        for one_source in shapes.generate_shaped_modules(shape_profile, 40).values()
+        for one_violation in run_checks(ast.parse(one_source), collect_check_classes())
+    }
+    assert {"COP002", "COP011", "COP012", "COP015"} <= found_codes
+
+
+def test_command_line_round_trip(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "private.py").write_text(PRIVATE_SOURCE, encoding="utf-8")
+    profile_path: typing.Final = tmp_path / "shapes.json"
+    assert shapes.main(["profile", str(tmp_path), "--output", str(profile_path)]) == 0
+    assert (
+        shapes.main(["generate", str(profile_path), "--modules", "3", "--output-directory", str(tmp_path / "out")]) == 0
+    )
+    assert sorted(one_path.name for one_path in (tmp_path / "out").iterdir()) == [
+        "shaped_0.py",
+        "shaped_1.py",
+        "shaped_2.py",
+    ]
@@ -0,0 +1,56 @@
+from __future__ import annotations
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin.sharding import (
+    ShardSelection,
+    build_cost_chunks,
+    build_shard_partition,
+    calculate_file_costs,
+    load_file_costs,
+)
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+def test_shard_selection_parsing() -> None:
+    assert ShardSelection.parse_from_text("2/8") == ShardSelection(shard_index=2, shards_count=8)
+    for one_shard_text in ("0/8", "9/8", "2", "a/b"):
+        with pytest.raises(ValueError, match="shard"):
+            ShardSelection.parse_from_text(one_shard_text)
+
+
+def test_build_shard_partition_balances_costs() -> None:
+    file_costs: typing.Final = {"huge.py": 10.0, "large.py": 6.0, "medium.py": 4.0, "small.py": 1.0, "tiny.py": 1.0}
+    shard_partition: typing.Final = build_shard_partition(file_costs, 2)
+    assert shard_partition == [["huge.py", "small.py"], ["large.py", "medium.py", "tiny.py"]]
+    assert build_shard_partition(dict(reversed(file_costs.items())), 2) == shard_partition
+
+
+def test_build_cost_chunks_starts_with_the_most_expensive_files() -> None:
+    file_costs: typing.Final = [1.0, 40.0, 1.0, 1.0, 25.0, 1.0, 1.0, 1.0, 1.0, 1.0]
+    # The limit per chunk is 73 / (2 workers * 4) seconds, so both large files are chunks of their own
+    assert build_cost_chunks(file_costs, workers_count=2, max_chunk_files=3) == [
+        [1],
+        [4],
+        [0, 2, 3],
+        [5, 6, 7],
+        [8, 9],
+    ]
+    assert build_cost_chunks([], workers_count=2, max_chunk_files=3) == []
+
+
+def test_calculate_file_costs_falls_back_to_scaled_size(tmp_path: pathlib.Path) -> None:
+    recorded_file: typing.Final = tmp_path / "recorded.py"
+    recorded_file.write_text("x" * 100)
+    new_file: typing.Final = tmp_path / "new.py"
+    new_file.write_text("x" * 300)
+    assert calculate_file_costs([str(recorded_file), str(new_file)], {str(recorded_file): 2.0}) == {
+        str(recorded_file): 2.0,
+        str(new_file): 6.0,
+    }
+    assert load_file_costs(tmp_path / "missing.json") == {}
+    assert calculate_file_costs([str(tmp_path / "removed.py")], {}) == {str(tmp_path / "removed.py"): 0.0}
@@ -0,0 +1,71 @@
+from __future__ import annotations
+import subprocess
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin.cli import main
+from community_of_python_flake8_plugin.staged import GitBlobReader, collect_staged_files, run_staged_files
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+@pytest.fixture
+def git_repository(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    subprocess.run(["git", "init", "--quiet", str(tmp_path)], check=True)  # noqa: S603, S607
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_staged_content_is_linted_instead_of_working_tree(git_repository: pathlib.Path) -> None:
+    (git_repository / "package").mkdir()
+    (git_repository / "package" / "staged.py").write_text("class Ab:\n    pass\n")
+    (git_repository / "package" / "clean.py").write_text("import os\n")
+    (git_repository / "untracked.py").write_text("class Ab:\n    pass\n")
+    (git_repository / "notes.txt").write_text("")
+    subprocess.run(["git", "add", "package", "notes.txt"], check=True)  # noqa: S607
+    # Fixing the working tree without staging the fix must not hide the staged violations
+    (git_repository / "package" / "staged.py").write_text("")
+
+    staged_files: typing.Final = collect_staged_files()
+    assert [one_file.filename for one_file in staged_files] == ["package/clean.py", "package/staged.py"]
+    reported_lines: typing.Final = [
+        one_violation.render_line()
+        for one_report in run_staged_files(staged_files, jobs_count=2)
+        for one_violation in one_report.violations
+    ]
+    assert reported_lines == [
+        "package/staged.py:1:1: COP008 Class name must be at least 8 characters",
+        "package/staged.py:1:1: COP012 Classes must be marked final with @typing.final",
+    ]
+
+
+def test_main_staged_limits_files_to_paths(
+    git_repository: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],  # noqa: COP006
+) -> None:
+    (git_repository / "first").mkdir()
+    (git_repository / "second").mkdir()
+    (git_repository / "first" / "module.py").write_text("class Ab:\n    pass\n")
+    (git_repository / "second" / "module.py").write_text("class Ab:\n    pass\n")
+    subprocess.run(["git", "add", "."], check=True)  # noqa: S607
+
+    assert main(["--staged", "first", "--jobs", "1"]) == 1
+    assert {one_line.split(":", 1)[0] for one_line in capsys.readouterr().out.splitlines()} == {"first/module.py"}
+
+
+def test_blob_reader_reports_missing_objects(git_repository: pathlib.Path) -> None:
+    (git_repository / "empty.py").write_text("")
+    (git_repository / "module.py").write_text("import os\n")
+    subprocess.run(["git", "add", "."], check=True)  # noqa: S607
+    object_names: typing.Final = [one_file.object_name for one_file in collect_staged_files()]
+
+    blob_reader: typing.Final = GitBlobReader()
+    try:
+        assert list(blob_reader.read_blobs(object_names)) == [b"", b"import os\n"]
+        with pytest.raises(LookupError):
+            list(blob_reader.read_blobs(["0" * 40]))
+    finally:
+        blob_reader.stop_reading()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+import concurrent.futures
+import queue
+import sys
+import threading
+import types
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin import subinterpreters
+from community_of_python_flake8_plugin.runner import check_file, run_files
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Callable
+
+
+@typing.final
+class ThreadInterpreter:
+    """Stands in for a subinterpreter on older Pythons, running the worker in a plain thread."""
+
+    def exec(self, _: str) -> None: ...  # noqa: COP007, COP009
+
+    def call_in_thread(self, worker_function: Callable[..., None], *worker_arguments: object) -> threading.Thread:
+        worker_thread: typing.Final = threading.Thread(target=worker_function, args=worker_arguments)
+        worker_thread.start()
+        return worker_thread
+
+    def close(self) -> None: ...  # noqa: COP007, COP009
+
+
+THREAD_INTERPRETERS_MODULE: typing.Final = types.SimpleNamespace(create_queue=queue.Queue, create=ThreadInterpreter)
+
+
+def write_modules(tmp_path: pathlib.Path) -> list[str]:
+    filenames: typing.Final = []
+    for one_index in range(6):
+        module_path = tmp_path / f"module_{one_index}.py"
+        module_path.write_text(f"class Ab{one_index}:\n    pass\n")
+        filenames.append(str(module_path))
+    return filenames
+
+
+def test_interpreter_pool_falls_back_to_processes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(subinterpreters, "INTERPRETERS_MODULE_NAME", "concurrent.missing_interpreters")
+    with subinterpreters.build_interpreter_pool(2) as worker_pool:
+        assert isinstance(worker_pool, concurrent.futures.ProcessPoolExecutor)
+
+
+def test_interpreter_runner_matches_single_job(tmp_path: pathlib.Path) -> None:
+    filenames: typing.Final = write_modules(tmp_path)
+    assert [one_report.violations for one_report in run_files(filenames, 2, "interpreter")] == [
+        one_report.violations for one_report in run_files(filenames)
+    ]
+
+
+def check_pool_reports(worker_pool: concurrent.futures.Executor, tmp_path: pathlib.Path) -> None:
+    filenames: typing.Final = write_modules(tmp_path)
+    pooled_reports: typing.Final = list(worker_pool.map(check_file, filenames))
+    assert [one_report.filename for one_report in pooled_reports] == filenames
+    assert [one_report.violations for one_report in pooled_reports] == [
+        one_report.violations for one_report in run_files(filenames)
+    ]
+    assert [
+        one_violation.violation_code.code
+        for one_violation in worker_pool.submit(check_file, str(tmp_path / "missing.py")).result().violations
+    ] == ["E902"]
+    with pytest.raises(ValueError, match="invalid literal"):
+        worker_pool.submit(int, "not a number").result()
+    with pytest.raises(SystemExit):
+        worker_pool.submit(sys.exit, 3).result()
+
+
+def test_subinterpreter_pool(tmp_path: pathlib.Path) -> None:
+    with subinterpreters.SubinterpreterPool(pytest.importorskip("concurrent.interpreters"), 2) as worker_pool:
+        check_pool_reports(worker_pool, tmp_path)
+
+
+def test_subinterpreter_pool_on_threads(tmp_path: pathlib.Path) -> None:
+    with subinterpreters.SubinterpreterPool(
+        typing.cast("types.ModuleType", THREAD_INTERPRETERS_MODULE), 2
+    ) as worker_pool:
+        check_pool_reports(worker_pool, tmp_path)
+
+
+def test_stopped_workers_fail_pending_tasks(monkeypatch: pytest.MonkeyPatch) -> None:
+    def collect_interrupted_classes() -> None:
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(subinterpreters, "collect_check_classes", collect_interrupted_classes)
+    with subinterpreters.SubinterpreterPool(
+        typing.cast("types.ModuleType", THREAD_INTERPRETERS_MODULE), 1
+    ) as worker_pool:
+        # Depending on timing, either the pending task fails or the pool refuses it
+        with pytest.raises(concurrent.futures.BrokenExecutor, match="KeyboardInterrupt"):
+            worker_pool.submit(int, "1").result(timeout=5)
+        with pytest.raises(concurrent.futures.BrokenExecutor):
+            worker_pool.submit(int, "1")
@@ -0,0 +1,39 @@
+from __future__ import annotations
+import ast
+import typing
+
+from community_of_python_flake8_plugin.symbols import IdentifierKind, fetch_symbol_table
+
+
+def test_symbol_table_scopes() -> None:
+    symbol_table: typing.Final = fetch_symbol_table(
+        ast.parse(
+            "class Settings(BaseModel):\n"
+            "    timeout = 1\n"
+            "    class Nested:\n"
+            "        def fetch_timeout(self): retries = 2\n"
+        )
+    )
+    timeout_symbol: typing.Final = symbol_table.symbols_by_identifier["timeout"][0]
+    assert timeout_symbol.identifier_kind is IdentifierKind.ATTRIBUTE
+    assert timeout_symbol.symbol_scope.is_in_excluded_class
+    retries_symbol: typing.Final = symbol_table.symbols_by_identifier["retries"][0]
+    assert retries_symbol.identifier_kind is IdentifierKind.VARIABLE
+    # The exemption follows the outermost class, so it reaches into the nested class
+    assert retries_symbol.symbol_scope.is_in_excluded_class
+    assert symbol_table.symbols_by_identifier["self"][0].identifier_kind is IdentifierKind.ARGUMENT
+
+
+def test_symbol_table_loop_targets() -> None:
+    symbol_table: typing.Final = fetch_symbol_table(
+        ast.parse("for first in items: pass\nfor index in range(3): pass\n[key for key, _ in pairs]\n")
+    )
+    assert symbol_table.symbols_by_identifier["first"][0].requires_loop_prefix
+    assert not symbol_table.symbols_by_identifier["index"][0].requires_loop_prefix
+    assert not symbol_table.symbols_by_identifier["key"][0].requires_loop_prefix
+
+
+def test_symbol_table_is_shared_per_tree() -> None:
+    syntax_tree: typing.Final = ast.parse("first_value = 1\n")
+    assert fetch_symbol_table(syntax_tree) is fetch_symbol_table(syntax_tree)
+    assert fetch_symbol_table(syntax_tree) is not fetch_symbol_table(ast.parse("first_value = 1\n"))
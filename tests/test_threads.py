@@ -0,0 +1,100 @@
+from __future__ import annotations
+import ast
+import concurrent.futures
+import sys
+import threading
+import typing
+
+import pytest
+
+from benchmarks import corpus
+from community_of_python_flake8_plugin import constants
+from community_of_python_flake8_plugin.engine import collect_check_classes, run_checks
+from community_of_python_flake8_plugin.runner import check_source, run_files
+from community_of_python_flake8_plugin.symbols import fetch_symbol_table
+
+
+if typing.TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Iterator
+
+
+THREADS_COUNT: typing.Final = 8
+STRESS_ROUNDS: typing.Final = 4
+IMMUTABLE_TYPES: typing.Final = (frozenset, tuple, str, int, float, bool, type(None))
+
+
+@pytest.fixture
+def frequent_thread_switches() -> Iterator[None]:
+    # With the GIL, switching threads every few bytecodes is what makes races show up
+    previous_interval: typing.Final = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous_interval)
+
+
+def render_report(source_text: str, filename: str) -> list[str]:
+    return [one_violation.render_line() for one_violation in check_source(source_text, filename)]
+
+
+@pytest.mark.usefixtures("frequent_thread_switches")
+def test_threads_report_like_a_single_thread() -> None:
+    corpus_sources: typing.Final = {**corpus.collect_test_snippets(), **corpus.generate_modules(4, 40)}
+    expected_reports: typing.Final = {
+        one_filename: render_report(one_source, one_filename) for one_filename, one_source in corpus_sources.items()
+    }
+    with concurrent.futures.ThreadPoolExecutor(max_workers=THREADS_COUNT) as thread_pool:
+        threaded_reports: typing.Final = list(
+            thread_pool.map(
+                render_report, STRESS_ROUNDS * list(corpus_sources.values()), STRESS_ROUNDS * list(corpus_sources)
+            )
+        )
+    assert threaded_reports == STRESS_ROUNDS * list(expected_reports.values())
+
+
+@pytest.mark.usefixtures("frequent_thread_switches")
+def test_threads_share_one_tree() -> None:
+    syntax_tree: typing.Final = ast.parse(corpus.generate_modules(1, 200).popitem()[1])
+    start_barrier: typing.Final = threading.Barrier(THREADS_COUNT)
+
+    def collect_violations() -> tuple[object, list[tuple[int, int, str]]]:
+        start_barrier.wait()
+        found_violations: typing.Final = run_checks(syntax_tree, collect_check_classes())
+        return fetch_symbol_table(syntax_tree), sorted(
+            (one_violation.line_number, one_violation.column_number, one_violation.violation_code.code)
+            for one_violation in found_violations
+        )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=THREADS_COUNT) as thread_pool:
+        thread_results: typing.Final = [
+            one_future.result() for one_future in [thread_pool.submit(collect_violations) for _ in range(THREADS_COUNT)]
+        ]
+    # Every thread sees the same cached symbol table and reports the same violations
+    assert len({id(one_table) for one_table, _ in thread_results}) == 1
+    assert len({tuple(one_violations) for _, one_violations in thread_results}) == 1
+
+
+def test_thread_pool_runner_keeps_input_order(tmp_path: pathlib.Path) -> None:
+    filenames: typing.Final = []
+    for one_index in range(20):
+        module_path = tmp_path / f"module_{one_index}.py"
+        module_path.write_text(f"class Ab{one_index}:\n    pass\n")
+        filenames.append(str(module_path))
+    threaded_reports: typing.Final = list(run_files(filenames, THREADS_COUNT, "thread"))
+    assert [one_report.filename for one_report in threaded_reports] == filenames
+    assert [one_report.violations for one_report in threaded_reports] == [
+        one_report.violations for one_report in run_files(filenames)
+    ]
+
+
+def test_shared_state_is_immutable() -> None:
+    # Threads share the constants and the check classes, so neither may hold anything mutable
+    for one_name, one_value in vars(constants).items():
+        if one_name.isupper():
+            assert isinstance(one_value, IMMUTABLE_TYPES), one_name
+    for one_check_class in collect_check_classes():
+        for one_name, one_value in vars(one_check_class).items():
+            if not (
+                one_name.startswith("__") or callable(one_value) or isinstance(one_value, (classmethod, staticmethod))
+            ):
+                assert isinstance(one_value, IMMUTABLE_TYPES), f"{one_check_class.__name__}.{one_name}"
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import ast
+import pathlib
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin.traversal import PrunedNodeVisitor, build_descent_plan, load_node_grammar
+
+
+SOURCE_PATHS: typing.Final = sorted(pathlib.Path(__file__).parent.parent.joinpath("src").rglob("*.py"))
+DATA_SOURCE: typing.Final = (
+    "SETTINGS_TABLE = [\n" + "".join(f"    ({one_index}, 'row'),\n" for one_index in range(500)) + "]\n"
+)
+
+
+def test_node_grammar_covers_every_node_class() -> None:
+    node_grammar: typing.Final = load_node_grammar()
+    assert all(one_fields is not None for one_fields in node_grammar.node_fields.values())
+    assert ast.FunctionDef in node_grammar.contained_node_types[ast.ClassDef]
+    assert not node_grammar.contained_node_types[ast.BinOp] & {ast.FunctionDef, ast.ClassDef, ast.Assign}
+
+
+@pytest.mark.parametrize(
+    "target_node_types",
+    [
+        frozenset({ast.ClassDef}),
+        frozenset({ast.Module, ast.FunctionDef, ast.AsyncFunctionDef}),
+        frozenset({ast.AnnAssign, ast.Dict, ast.ListComp}),
+        frozenset({ast.Name, ast.arg}),
+        frozenset({ast.Lambda, ast.keyword}),
+    ],
+    ids=lambda target_node_types: ",".join(sorted(one_type.__name__ for one_type in target_node_types)),
+)
+def test_pruned_walk_finds_every_target(target_node_types: frozenset[type[ast.AST]]) -> None:
+    descent_plan: typing.Final = build_descent_plan(target_node_types)
+    for one_path in SOURCE_PATHS:
+        syntax_tree = ast.parse(one_path.read_text(encoding="utf-8"))
+        assert [
+            one_node for one_node in descent_plan.iter_tree_nodes(syntax_tree) if type(one_node) in target_node_types
+        ] == [one_node for one_node in collect_preorder_nodes(syntax_tree) if type(one_node) in target_node_types]
+
+
+def collect_preorder_nodes(syntax_tree: ast.AST) -> list[ast.AST]:
+    visited_nodes: typing.Final = []
+    pending_nodes: typing.Final = [syntax_tree]
+    while pending_nodes:
+        current_node = pending_nodes.pop()
+        visited_nodes.append(current_node)
+        pending_nodes.extend(ast.iter_child_nodes(current_node))
+    return visited_nodes
+
+
+def test_statement_walk_skips_literal_data() -> None:
+    syntax_tree: typing.Final = ast.parse(f"{DATA_SOURCE}class Settings:\n    pass\n")
+    assert [
+        type(one_node) for one_node in build_descent_plan(frozenset({ast.ClassDef})).iter_tree_nodes(syntax_tree)
+    ] == [
+        ast.Module,
+        ast.ClassDef,
+    ]
+    # Name targets still need the expressions, but never the constants inside them
+    assert ast.Constant not in {
+        type(one_node) for one_node in build_descent_plan(frozenset({ast.Name})).iter_tree_nodes(syntax_tree)
+    }
+
+
+@typing.final
+class NameCollector(PrunedNodeVisitor):
+    def __init__(self) -> None:
+        super().__init__()
+        self.visited_names: typing.Final[list[str]] = []
+        self.visits_count = 0
+
+    def visit(self, node: ast.AST) -> None:  # noqa: COP006, COP007
+        self.visits_count += 1
+        super().visit(node)
+
+    def visit_Name(self, name_node: ast.Name) -> None:
+        self.visited_names.append(name_node.id)
+
+
+def test_pruned_node_visitor_visits_handled_nodes_only() -> None:
+    syntax_tree: typing.Final = ast.parse(f"{DATA_SOURCE}total_count = len(SETTINGS_TABLE) + 1\n")
+    name_collector: typing.Final = NameCollector()
+    name_collector.visit(syntax_tree)
+    assert NameCollector.visited_node_types == frozenset({ast.Name})
+    assert name_collector.visited_names == ["SETTINGS_TABLE", "total_count", "len", "SETTINGS_TABLE"]
+    # The 500 rows of the table are walked through as tuples, without visiting their 1000 constants
+    assert name_collector.visits_count < 600  # noqa: PLR2004
@@ -0,0 +1,97 @@
+from __future__ import annotations
+import pathlib
+import sys
+import typing
+
+import pytest
+
+from community_of_python_flake8_plugin.watch import InotifyWatcher, PollingWatcher, WatchSession
+
+
+def test_watch_session_rechecks_only_changed_content(tmp_path: pathlib.Path) -> None:
+    module_path: typing.Final = tmp_path / "module.py"
+    module_path.write_text("class Ab:\n    pass\n")
+    watch_session: typing.Final = WatchSession([str(tmp_path)], [])
+    assert [
+        len(one_report.violations)
+        for one_report in watch_session.check_changed_files([str(tmp_path)]).refreshed_reports
+    ] == [2]
+
+    assert not watch_session.check_changed_files([str(module_path)]).refreshed_reports
+    module_path.write_text("import typing\n\n\n@typing.final\nclass Abcdefgh:\n    pass\n")
+    assert [
+        len(one_report.violations)
+        for one_report in watch_session.check_changed_files([str(module_path)]).refreshed_reports
+    ] == [0]
+
+    module_path.unlink()
+    assert watch_session.check_changed_files([str(module_path)]).removed_filenames == [module_path.as_posix()]
+    assert watch_session.calculate_violations_count() == 0
+
+
+def test_watch_session_ignores_unwatched_files(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "notes.txt").write_text("")
+    assert not WatchSession([str(tmp_path)], []).check_changed_files([str(tmp_path / "notes.txt")]).refreshed_reports
+
+
+def test_watch_session_forgets_files_of_directories_moved_away(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "project" / "package").mkdir(parents=True)
+    (tmp_path / "project" / "package" / "module.py").write_text("class Ab:\n    pass\n")
+    watch_session: typing.Final = WatchSession([str(tmp_path / "project")], [])
+    watch_session.check_changed_files([str(tmp_path / "project")])
+    (tmp_path / "project" / "package").rename(tmp_path / "moved")
+    assert watch_session.check_changed_files([str(tmp_path / "project" / "package")]).removed_filenames == [
+        (tmp_path / "project" / "package" / "module.py").as_posix()
+    ]
+    assert watch_session.calculate_violations_count() == 0
+
+
+def test_watch_session_reports_undecodable_files(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "module.py").write_bytes(b"\xff\xfe = 1\n")
+    assert [
+        one_violation.violation_code.code
+        for one_report in WatchSession([str(tmp_path)], []).check_changed_files([str(tmp_path)]).refreshed_reports
+        for one_violation in one_report.violations
+    ] == ["E999"]
+
+
+def test_polling_watcher_reports_changes(tmp_path: pathlib.Path) -> None:
+    module_path: typing.Final = tmp_path / "module.py"
+    module_path.write_text("")
+    file_watcher: typing.Final = PollingWatcher([str(tmp_path)], [], polling_interval=0.01)
+    module_path.write_text("first_value = 1\n")
+    assert file_watcher.wait_for_changes(1) == {module_path.as_posix()}
+    assert file_watcher.wait_for_changes(0) == set()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_watcher_follows_new_directories(tmp_path: pathlib.Path) -> None:
+    file_watcher: typing.Final = InotifyWatcher([str(tmp_path)], [])
+    try:
+        (tmp_path / "package").mkdir()
+        assert file_watcher.wait_for_changes(1) == {str(tmp_path / "package")}
+        (tmp_path / "package" / "module.py").write_text("first_value = 1\n")
+        assert file_watcher.wait_for_changes(1) == {str(tmp_path / "package" / "module.py")}
+    finally:
+        file_watcher.stop_watching()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_watcher_reports_directories_moved_away(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "project" / "package").mkdir(parents=True)
+    file_watcher: typing.Final = InotifyWatcher([str(tmp_path / "project")], [])
+    try:
+        (tmp_path / "project" / "package").rename(tmp_path / "moved")
+        assert file_watcher.wait_for_changes(1) == {str(tmp_path / "project" / "package")}
+        (tmp_path / "moved" / "module.py").write_text("first_value = 1\n")
+        assert file_watcher.wait_for_changes(0.1) == set()
+    finally:
+        file_watcher.stop_watching()
+
+
+@pytest.mark.skipif(not pathlib.Path("/proc/self/fd").is_dir(), reason="needs /proc to count descriptors")
+def test_inotify_watcher_closes_its_descriptor_when_watching_fails(tmp_path: pathlib.Path) -> None:
+    descriptors_count: typing.Final = len(list(pathlib.Path("/proc/self/fd").iterdir()))
+    with pytest.raises(OSError, match="inotify_add_watch failed"):
+        InotifyWatcher([str(tmp_path / "missing" / "module.py")], [])
+    assert len(list(pathlib.Path("/proc/self/fd").iterdir())) == descriptors_count